@@ -0,0 +1,222 @@
+"""Resident ``serve`` mode: batch jobs after every TWSE close from one process.
+
+The process keeps what a cron invocation rebuilds on every start: imported
+modules, the HTTP session and response caches of the shared TWSE client and
+the trading calendar. Through ``keep_warm`` the service also keeps, per job,
+the stored daily rows of its window, one Low Entry v3 stream per stock and
+the price panel. Jobs run incrementally, so a warm run only fetches and
+parses the session that just closed, pushes that one bar into each stream
+and appends its row to the panel.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import datetime
+import logging
+import threading
+import time
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Sequence
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from application.stock_service import StockAnalysisRequest
+from config.settings import SERVE_MAX_RETRIES
+from config.settings import SERVE_RETRY_MINUTES
+from config.settings import SERVE_RUN_AT
+from config.settings import SERVE_TIMEZONE
+from config.settings import SERVE_WORKERS
+from twse.trading_calendar import trading_calendar
+
+# Long waits are split so a suspended or re-clocked host recomputes the delay.
+_MAX_WAIT_SECONDS = 15 * 60
+
+
+class MarketCloseScheduler:
+    """Run times at ``run_at`` local exchange time on every trading session."""
+
+    def __init__(
+        self,
+        holidays: Iterable[str] = (),
+        run_at: str = SERVE_RUN_AT,
+        timezone: str = SERVE_TIMEZONE,
+        clock: Callable[[], datetime.datetime] | None = None,
+    ) -> None:
+        self.calendar = trading_calendar(holidays)
+        hour, minute = (int(part) for part in run_at.split(":"))
+        self.run_at = datetime.time(hour, minute)
+        self.timezone = ZoneInfo(timezone)
+        self._clock = clock or (lambda: datetime.datetime.now(self.timezone))
+
+    def now(self) -> datetime.datetime:
+        return self._clock().astimezone(self.timezone)
+
+    def next_run(self, after: datetime.datetime | None = None) -> datetime.datetime:
+        """The first run time strictly after ``after`` (default: now)."""
+
+        after = (after or self.now()).astimezone(self.timezone)
+        sessions = self.calendar.sessions_between(after.date(), after.date() + datetime.timedelta(days=31))
+        for session in sessions:
+            run = datetime.datetime.combine(session, self.run_at, tzinfo=self.timezone)
+            if run > after:
+                return run
+        raise RuntimeError("No TWSE session within 31 days of {}.".format(after.date()))
+
+    def last_closed_session(self, now: datetime.datetime | None = None) -> datetime.date:
+        """The latest session whose run time has passed."""
+
+        now = (now or self.now()).astimezone(self.timezone)
+        day = now.date()
+        if now.time() < self.run_at:
+            day -= datetime.timedelta(days=1)
+        return self.calendar.last_sessions(day, 1)[0]
+
+
+def preload_analysis_modules() -> None:
+    """Import the crawler, strategy and report stack before the first run."""
+
+    import tabulate  # noqa: F401
+
+    import stockanalysis  # noqa: F401
+    from domain.strategies.low_entry_score_v3 import LOW_ENTRY_STRATEGY_NAME
+    from domain.strategy import get_strategy
+    from infrastructure.report.html_renderer import RendererFactory
+
+    RendererFactory.get_renderer(LOW_ENTRY_STRATEGY_NAME)
+    get_strategy(LOW_ENTRY_STRATEGY_NAME)
+
+
+class StockAnalysisDaemon:
+    """Runs the configured jobs through one warm service after each close."""
+
+    def __init__(
+        self,
+        service: Any,
+        requests: Sequence[StockAnalysisRequest],
+        scheduler: MarketCloseScheduler,
+        workers: int = SERVE_WORKERS,
+        retry_minutes: float = SERVE_RETRY_MINUTES,
+        max_retries: int = SERVE_MAX_RETRIES,
+    ) -> None:
+        self.service = service
+        self.requests = [self.resident_request(request) for request in requests]
+        self.scheduler = scheduler
+        self.workers = workers
+        self.retry_minutes = retry_minutes
+        self.max_retries = max_retries
+
+    @staticmethod
+    def resident_request(request: StockAnalysisRequest) -> StockAnalysisRequest:
+        # Runs happen after the close, so each window ends with today's session
+        # instead of yesterday's; stored days are reused instead of refetched.
+        return dataclasses.replace(request, incremental=True, beginbacktrack=request.beginbacktrack - 1)
+
+    def serve(self, stop: threading.Event, run_now: bool = False) -> None:
+        """Run after every close until ``stop`` is set.
+
+        With ``run_now`` the latest closed session is run immediately instead
+        of waiting for the next close.
+        """
+
+        preload_analysis_modules()
+        if run_now:
+            self.run_session(self.scheduler.last_closed_session(), stop)
+
+        while not stop.is_set():
+            due = self.scheduler.next_run()
+            logging.info("Next run for the %s session at %s.", due.date(), due.isoformat(timespec="minutes"))
+            if not self._wait_until(due, stop):
+                return
+            self.run_session(due.date(), stop)
+
+    def run_session(self, session: datetime.date, stop: threading.Event) -> bool:
+        """Run the jobs, retrying those that have not collected ``session`` yet."""
+
+        pending = self.requests
+        for attempt in range(1, self.max_retries + 2):
+            pending = self.run_once(session, pending)
+            if not pending:
+                return True
+            if attempt > self.max_retries:
+                logging.warning("Giving up on the %s session for %s jobs after %s runs.", session, len(pending), attempt)
+                return False
+            logging.info(
+                "%s jobs have not collected the %s session; retrying them in %s minutes.",
+                len(pending),
+                session,
+                self.retry_minutes,
+            )
+            if stop.wait(self.retry_minutes * 60):
+                return False
+        return False
+
+    def run_once(
+        self,
+        session: datetime.date,
+        requests: Sequence[StockAnalysisRequest] | None = None,
+    ) -> list[StockAnalysisRequest]:
+        """Run ``requests`` (default: every job) once; return those still lacking ``session``.
+
+        A job only mails on the run that collects the session, so retries never
+        resend a report. Jobs whose session TWSE has confirmed closed are done.
+        """
+
+        requests = list(self.requests if requests is None else requests)
+        started = time.perf_counter()
+        try:
+            crawlers = self.service.run_jobs(
+                requests,
+                workers=self.workers,
+                mail_if=lambda crawler: self._collected(crawler, session),
+            )
+        except Exception:
+            logging.exception("Run for the %s session failed.", session)
+            crawlers = [None] * len(requests)
+        finally:
+            # Storage only needs migrating once per process.
+            self.requests = [dataclasses.replace(request, migrate_storage=False) for request in self.requests]
+            requests = [dataclasses.replace(request, migrate_storage=False) for request in requests]
+            self.service.forget_rows_before(self._oldest_needed_date())
+
+        pending = []
+        for request, crawler in zip(requests, crawlers):
+            if self._collected(crawler, session):
+                continue
+            if self._confirmed_closed(crawler, request, session):
+                logging.info("TWSE has confirmed %s closed for %s; not retrying it.", session, request.output_file_names)
+                continue
+            pending.append(request)
+        logging.info(
+            "Ran %s jobs for the %s session in %.1fs; %s did not collect it.",
+            len(requests),
+            session,
+            time.perf_counter() - started,
+            len(pending),
+        )
+        return pending
+
+    @staticmethod
+    def _collected(crawler: Any, session: datetime.date) -> bool:
+        return crawler is not None and session.isoformat() in crawler.iso_scheduled_times
+
+    @staticmethod
+    def _confirmed_closed(crawler: Any, request: StockAnalysisRequest, session: datetime.date) -> bool:
+        known_closed_dates = getattr(crawler, "known_closed_dates", None)
+        if known_closed_dates is None:
+            return False
+        return session.strftime("%Y%m%d") in known_closed_dates(request.stocktype)
+
+    def _oldest_needed_date(self) -> str:
+        backtrack = max((request.endbacktrack for request in self.requests), default=0)
+        oldest = self.scheduler.now().date() - datetime.timedelta(days=backtrack + 1)
+        return oldest.strftime("%Y%m%d")
+
+    def _wait_until(self, due: datetime.datetime, stop: threading.Event) -> bool:
+        """Sleep until ``due``; False when ``stop`` was set first."""
+
+        while (remaining := (due - self.scheduler.now()).total_seconds()) > 0:
+            if stop.wait(min(remaining, _MAX_WAIT_SECONDS)):
+                return False
+        return not stop.is_set()
@@ -4,12 +4,17 @@ from __future__ import annotations
 
 import datetime
 import logging
-import time
 from collections.abc import Callable
+from collections.abc import Sequence
+from concurrent.futures import Future
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Any
 
-from config.settings import QUERY_WAIT_SECONDS
+from config.settings import BATCH_WORKERS
+from config.settings import PANEL_DIR
+from config.settings import STORAGE_BACKEND
+from config.settings import STRATEGY_STATE_DIR
 from domain.models import StockSelector
 
 
@@ -26,80 +31,402 @@ class StockAnalysisRequest:
     linechart: bool = False
     period: int = 7
     mail: bool = False
+    market_wide: bool = False
+    incremental: bool = False
+    holidays_output: str | None = None
+    storage: str = STORAGE_BACKEND
+    migrate_storage: bool = False
+    panel: bool = False
+    stocklist_file: str | None = None
+    rewrite_stocklist: bool = False
+
+
+@dataclass(frozen=True)
+class SectorReport:
+    """Output of one sector's analysis stages, sent back from a batch worker."""
+
+    stockprofittable: str = ""
+    entryanalysis: str = ""
+
+
+def analyze_sector(twsecrawler: Any, request: StockAnalysisRequest) -> SectorReport:
+    """Profit, strategy and report stages for one crawled sector.
+
+    Runs in a batch worker process, so it must stay a module-level function.
+    """
+
+    maxprofits = twsecrawler.cal_max_profit()
+    analysis_dataset = twsecrawler.build_analysis_dataset(maxprofits)
+    twsecrawler.record_analysis_dataset(request.output_file_names, maxprofits, analysis_dataset)
+    if not request.mail:
+        return SectorReport()
+    return SectorReport(*twsecrawler.build_email_content(analysis_dataset))
 
 
 class StockAnalysisService:
     """Coordinates crawler, analysis, storage, chart, and mail boundaries."""
 
-    def __init__(self, crawler_factory: Callable[[int], Any] | None = None) -> None:
-        if crawler_factory is None:
+    def __init__(
+        self,
+        crawler_factory: Callable[[int], Any] | None = None,
+        twse_client: Any | None = None,
+        keep_warm: bool = False,
+    ) -> None:
+        self.twse_client = twse_client
+        # A resident process keeps stored daily rows, strategy streams and
+        # price panels in memory between runs, per storage backend or job.
+        self.keep_warm = keep_warm
+        self._warm_repositories: dict[str, Any] = {}
+        self._warm_streams: dict[str, Any] = {}
+        self._warm_panels: dict[str, Any] = {}
+        self._market_wide_client: Any | None = None
+        self._smtp_connection: Any | None = None
+        self._default_crawler = crawler_factory is None
+        # The legacy crawler module is imported on the first run, not at construction.
+        self.crawler_factory = crawler_factory
+
+    def _create_crawler(self, request: StockAnalysisRequest) -> Any:
+        if not self._default_crawler:
+            return self.crawler_factory(len(request.stocklist))
+        if self.crawler_factory is None:
             from stockanalysis import TwseCrawker
 
             self.crawler_factory = TwseCrawker
+        return self.crawler_factory(
+            len(request.stocklist),
+            twse_client=self._get_twse_client(request),
+            csv_repository=self._get_repository(request),
+            selector_index=self._get_selector_index(request),
+        )
+
+    def _get_selector_index(self, request: StockAnalysisRequest) -> Any:
+        # Only stocklist files hold legacy row indexes worth remembering.
+        if request.stocklist_file is None:
+            return None
+
+        from infrastructure.storage.selector_index import SelectorIndex
+
+        return SelectorIndex(Path(request.stocklist_file).name)
+
+    def _get_repository(self, request: StockAnalysisRequest) -> Any:
+        repository = self._open_repository(request.storage)
+        if request.storage == "parquet" and request.migrate_storage:
+            from infrastructure.storage.parquet_repository import migrate_csv_to_parquet
+
+            parquet_repository = getattr(repository, "repository", repository)
+            migrated = migrate_csv_to_parquet(request.output_file_names, parquet_repository=parquet_repository)
+            logging.info("Migrated %s daily CSV files for %s into Parquet.", migrated, request.output_file_names)
+        return repository
+
+    def _open_repository(self, storage: str) -> Any:
+        if self.keep_warm and storage in self._warm_repositories:
+            return self._warm_repositories[storage]
+
+        if storage == "parquet":
+            from infrastructure.storage.parquet_repository import ParquetRepository
+
+            repository = ParquetRepository()
+        elif self.keep_warm:
+            from infrastructure.storage.csv_repository import CsvRepository
+
+            repository = CsvRepository()
         else:
-            self.crawler_factory = crawler_factory
+            return None
+
+        if self.keep_warm:
+            from infrastructure.storage.warm_repository import WarmRepository
+
+            repository = self._warm_repositories[storage] = WarmRepository(repository)
+        return repository
+
+    def forget_rows_before(self, scheduled_time: str) -> None:
+        """Drop warm daily rows older than ``scheduled_time`` (YYYYMMDD)."""
+
+        for repository in self._warm_repositories.values():
+            repository.forget_before(scheduled_time)
+
+    def _get_twse_client(self, request: StockAnalysisRequest) -> Any:
+        # Clients are shared across runs so sessions and in-memory lookups stay warm.
+        if self.twse_client is None:
+            from infrastructure.crawler.twse_client import TwseClient
+
+            self.twse_client = TwseClient()
+
+        if not request.market_wide:
+            return self.twse_client
+
+        if self._market_wide_client is None:
+            from infrastructure.crawler.market_client import MarketWideTwseClient
 
-    def run(self, request: StockAnalysisRequest) -> None:
+            self._market_wide_client = MarketWideTwseClient(self.twse_client)
+        return self._market_wide_client
+
+    def run(self, request: StockAnalysisRequest) -> Any:
+        """Run one request and return its crawler with the collected history."""
+
+        from infrastructure.instrumentation import record_run
+
+        try:
+            with record_run(
+                "run",
+                stocktype=request.stocktype,
+                output_file_names=request.output_file_names,
+                mode="linechart" if request.linechart else "analysis",
+                stocks=len(request.stocklist),
+            ) as recorder:
+                twsecrawler = self._run(request)
+        finally:
+            self._smtp_connection = None
+        self._write_run_report(request.output_file_names, recorder, twsecrawler)
+        return twsecrawler
+
+    def _run(self, request: StockAnalysisRequest, mail_if: Callable[[Any], bool] | None = None) -> Any:
         if request.linechart:
-            self._run_linechart(request)
+            twsecrawler = self._run_linechart(request, mail_if)
+        else:
+            twsecrawler = self._run_analysis(request)
+        self._finish(request, twsecrawler)
+        return twsecrawler
+
+    def _write_run_report(self, file_name: str, recorder: Any, twsecrawler: Any) -> None:
+        # The report goes next to the analysis dataset, through the crawler's repository.
+        record_run_report = getattr(twsecrawler, "record_run_report", None)
+        if record_run_report is None:
             return
+        report = recorder.to_dict()
+        output_path = record_run_report(file_name, report)
+        logging.info("Run took %.2fs; report written to %s.", report["elapsed_seconds"], output_path)
+
+    def _finish(self, request: StockAnalysisRequest, twsecrawler: Any) -> None:
+        if request.holidays_output and twsecrawler is not None:
+            self._write_holidays(request, twsecrawler)
+        if request.rewrite_stocklist and twsecrawler is not None:
+            self._rewrite_stocklist(request, twsecrawler)
 
-        twsecrawler = self.crawler_factory(len(request.stocklist))
+    def run_batch(self, requests: Sequence[StockAnalysisRequest], workers: int = BATCH_WORKERS) -> list[Any]:
+        """Run several sector jobs in this process.
+
+        Sectors are fetched one after another through the shared TWSE client,
+        so they reuse its HTTP session, response cache and market-wide payloads.
+        Each fetched sector is handed to a worker process for the analysis
+        stages while the next one is fetched. Emails are sent from here over
+        one SMTP connection. Line-chart jobs run inline because they share the
+        chart image file. Returns the crawlers of the jobs that finished.
+        """
+
+        results, failures = self._run_jobs(requests, workers)
+        if failures:
+            raise RuntimeError("Batch jobs failed for: {}".format(", ".join(failures)))
+        return results
+
+    def run_jobs(
+        self,
+        requests: Sequence[StockAnalysisRequest],
+        workers: int = BATCH_WORKERS,
+        mail_if: Callable[[Any], bool] | None = None,
+    ) -> list[Any | None]:
+        """Run the jobs like ``run_batch`` without raising on failures.
+
+        Returns one crawler per request, None where the job failed or was
+        skipped. With ``mail_if``, a job only mails when it returns True for
+        the job's crawler.
+        """
+
+        return self._run_jobs(requests, workers, mail_if)[0]
+
+    def _run_jobs(
+        self,
+        requests: Sequence[StockAnalysisRequest],
+        workers: int,
+        mail_if: Callable[[Any], bool] | None = None,
+    ) -> tuple[list[Any | None], list[str]]:
+        from infrastructure.instrumentation import record_run
+
+        try:
+            with record_run("batch", jobs=len(requests), workers=workers) as recorder:
+                results, failures = self._run_batch(requests, workers, mail_if)
+        finally:
+            self._smtp_connection = None
+
+        finished = [result for result in results if result is not None]
+        if finished:
+            self._write_run_report("batch", recorder, finished[0])
+        logging.info("Batch finished %s of %s jobs.", len(requests) - len(failures), len(requests))
+        return results, failures
+
+    def _run_batch(
+        self,
+        requests: Sequence[StockAnalysisRequest],
+        workers: int,
+        mail_if: Callable[[Any], bool] | None = None,
+    ) -> tuple[list[Any | None], list[str]]:
+        from infrastructure.instrumentation import span
+
+        results: list[Any | None] = [None] * len(requests)
+        failures: list[str] = []
+        pending: list[tuple[int, StockAnalysisRequest, Any, Future[SectorReport] | SectorReport]] = []
+        executor = None
+        if workers > 1 and len(requests) > 1:
+            from concurrent.futures import ProcessPoolExecutor
+
+            executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            for index, request in enumerate(requests):
+                try:
+                    with span("job", "{}:{}".format(request.stocktype, request.output_file_names)):
+                        if request.linechart:
+                            results[index] = self._run(request, mail_if)
+                            continue
+                        twsecrawler = self._crawl(request)
+                except Exception:
+                    logging.exception("Batch job %s %s failed.", request.stocktype, request.output_file_names)
+                    failures.append(str(request.stocktype))
+                    continue
+
+                if executor is not None:
+                    pending.append((index, request, twsecrawler, executor.submit(analyze_sector, twsecrawler, request)))
+                else:
+                    pending.append((index, request, twsecrawler, analyze_sector(twsecrawler, request)))
+
+            for index, request, twsecrawler, outcome in pending:
+                try:
+                    with span("analysis_wait", "{}:{}".format(request.stocktype, request.output_file_names)):
+                        report = outcome.result() if isinstance(outcome, Future) else outcome
+                    if request.mail and (mail_if is None or mail_if(twsecrawler)):
+                        self._smtp_connection = twsecrawler.send_email_content(
+                            subject=request.subject,
+                            ccreceiver=request.ccreceiver,
+                            stocktype=request.stocktype,
+                            stockprofittable=report.stockprofittable,
+                            entryanalysis=report.entryanalysis,
+                            connection=self._smtp_connection,
+                        )
+                    self._finish(request, twsecrawler)
+                    results[index] = twsecrawler
+                except Exception:
+                    logging.exception("Batch job %s %s failed.", request.stocktype, request.output_file_names)
+                    failures.append(str(request.stocktype))
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        return results, failures
+
+    def _crawl(self, request: StockAnalysisRequest) -> Any:
+        twsecrawler = self._create_crawler(request)
+        if request.incremental and hasattr(twsecrawler, "strategy_state_path"):
+            # Strategy indicators resume from the last run like the stored days do.
+            twsecrawler.strategy_state_path = STRATEGY_STATE_DIR / "{}.json".format(request.output_file_names)
+            if self.keep_warm:
+                # The same stream objects are fed every run, so states are read from disk once.
+                if request.output_file_names not in self._warm_streams:
+                    self._warm_streams[request.output_file_names] = twsecrawler.load_strategy_streams()
+                twsecrawler.strategy_streams = self._warm_streams[request.output_file_names]
         twsecrawler.get_date_times(
             start_date=request.beginbacktrack,
             backtrack_days=request.endbacktrack,
             holidays=request.holidays,
+            stocktype=request.stocktype,
         )
         twsecrawler.get_twse_daily_stocks(
             file_name=request.output_file_names,
             stocktype=request.stocktype,
             stocks=request.stocklist,
+            incremental=request.incremental,
         )
+        if request.panel and self.keep_warm:
+            # Advancing the warm panel writes only the new session; the headroom
+            # lets it slide for a window's length of runs before compacting.
+            self._warm_panels[request.output_file_names] = twsecrawler.build_price_panel(
+                PANEL_DIR / request.output_file_names,
+                previous=self._warm_panels.get(request.output_file_names),
+                capacity=2 * len(twsecrawler.iso_scheduled_times),
+            )
+        elif request.panel:
+            twsecrawler.build_price_panel(PANEL_DIR / request.output_file_names)
+        return twsecrawler
+
+    def _run_analysis(self, request: StockAnalysisRequest) -> Any:
+        twsecrawler = self._crawl(request)
         maxprofits = twsecrawler.cal_max_profit()
         twsecrawler.record_analysis_dataset(file_name=request.output_file_names, maxprofits=maxprofits)
 
         if request.mail:
-            twsecrawler.smtp_email(
+            self._smtp_connection = twsecrawler.smtp_email(
                 subject=request.subject,
                 ccreceiver=request.ccreceiver,
                 stocktype=request.stocktype,
                 maxprofits=maxprofits,
+                connection=self._smtp_connection,
             )
+        return twsecrawler
 
-    def _run_linechart(self, request: StockAnalysisRequest) -> None:
+    def _run_linechart(self, request: StockAnalysisRequest, mail_if: Callable[[Any], bool] | None = None) -> Any:
         startofbacktrack = request.endbacktrack - request.period
         now_date_time = datetime.datetime.now()
         backtrack = (now_date_time + datetime.timedelta(days=-request.endbacktrack)).strftime("%Y-%m-%d")
-        maxprofitratios: list[list[float]] = [[] for _ in range(len(request.stocklist))]
 
-        for back in range(startofbacktrack):
-            twsecrawler = self.crawler_factory(len(request.stocklist))
-            print("Back {}".format(back))
-            twsecrawler.get_date_times(
+        if startofbacktrack <= 0:
+            logging.warning(
+                "Skipping line chart because period %s leaves no backtrack steps within %s days.",
+                request.period,
+                request.endbacktrack,
+            )
+            return None
+
+        twsecrawler = self._create_crawler(request)
+        windows = [
+            twsecrawler.scheduled_dates(
                 start_date=startofbacktrack - back,
                 backtrack_days=request.endbacktrack - back,
                 holidays=request.holidays,
+                now_date_time=now_date_time,
+                stocktype=request.stocktype,
             )
-            twsecrawler.get_twse_daily_stocks(
-                file_name=request.output_file_names,
+            for back in range(startofbacktrack)
+        ]
+
+        # Crawl the union of all sliding windows once, then slice it per window.
+        twsecrawler.iso_scheduled_times = sorted({iso_date for window in windows for iso_date in window})
+        twsecrawler.get_twse_daily_stocks(
+            file_name=request.output_file_names,
+            stocktype=request.stocktype,
+            stocks=request.stocklist,
+            incremental=request.incremental,
+        )
+        maxprofitratios = twsecrawler.cal_max_profit_ratio_windows(windows)
+
+        twsecrawler.draw_linechart(duration=startofbacktrack, maxprofitratios=maxprofitratios)
+        if request.mail and (mail_if is None or mail_if(twsecrawler)):
+            self._smtp_connection = twsecrawler.smtp_img_email(
+                subject=request.subject,
+                ccreceiver=request.ccreceiver,
                 stocktype=request.stocktype,
-                stocks=request.stocklist,
+                backtrack=backtrack,
+                connection=self._smtp_connection,
             )
 
-            for item, maxprofitratiodata in zip(range(len(request.stocklist)), twsecrawler.cal_max_profit_ratio_data()):
-                maxprofitratios[item].append(maxprofitratiodata)
+        logging.info("The trend of performance indicators for TWSE stock market: %s", maxprofitratios)
+        return twsecrawler
+
+    def _write_holidays(self, request: StockAnalysisRequest, twsecrawler: Any) -> None:
+        from infrastructure.crawler.negative_cache import write_holidays
 
-            if back == startofbacktrack - 1:
-                twsecrawler.draw_linechart(duration=startofbacktrack, maxprofitratios=maxprofitratios)
-                if request.mail:
-                    twsecrawler.smtp_img_email(
-                        subject=request.subject,
-                        ccreceiver=request.ccreceiver,
-                        stocktype=request.stocktype,
-                        backtrack=backtrack,
-                    )
-                continue
+        # Only market-wide closures are holidays; a sector answering empty is not.
+        known_closed_dates = getattr(twsecrawler, "known_closed_dates", None)
+        closed_dates = known_closed_dates() if known_closed_dates is not None else set()
+        output_path = write_holidays(
+            request.holidays_output,
+            set(request.holidays) | closed_dates,
+            datetime.datetime.now().year,
+        )
+        logging.info("Wrote %s confirmed market-wide TWSE closures to %s.", len(closed_dates), output_path)
+
+    def _rewrite_stocklist(self, request: StockAnalysisRequest, twsecrawler: Any) -> None:
+        if request.stocklist_file is None:
+            logging.warning("Skipping --rewrite-stocklist because the stocks were not read from a stocklist file.")
+            return
 
-            time.sleep(QUERY_WAIT_SECONDS)
+        from infrastructure.storage.selector_index import rewrite_stocklist
 
-        logging.info("The trend of performance indicators for TWSE stock market: %s", maxprofitratios)
+        tracked_stock_numbers = getattr(twsecrawler, "tracked_stock_numbers", [None] * len(request.stocklist))
+        rewrite_stocklist(request.stocklist_file, request.stocklist, tracked_stock_numbers)
@@ -0,0 +1,75 @@
+"""Compare the scalar and panel max-profit kernels on a synthetic market.
+
+Run from the repository root:
+
+    python benchmarks/bench_max_profit.py --stocks 1000 --days 2500
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from twse.analyzer import max_profit  # noqa: E402
+from twse.analyzer import max_profit_k_transactions  # noqa: E402
+from twse.analyzer import max_profit_k_transactions_panel  # noqa: E402
+from twse.analyzer import max_profit_panel  # noqa: E402
+from twse.analyzer import max_profit_unlimited  # noqa: E402
+from twse.analyzer import max_profit_unlimited_panel  # noqa: E402
+from twse.analyzer import max_profit_with_fee  # noqa: E402
+from twse.analyzer import max_profit_with_fee_panel  # noqa: E402
+
+
+def random_walk_prices(days: int, stocks: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0, 0.02, size=(days, stocks))
+    return np.round(100 * np.exp(np.cumsum(returns, axis=0)), 2) * 1000
+
+
+def timed(function: Callable[[], object]) -> tuple[float, object]:
+    started = time.perf_counter()
+    result = function()
+    return time.perf_counter() - started, result
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stocks", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=2500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    prices = random_walk_prices(args.days, args.stocks, args.seed)
+    histories = [prices[:, column].tolist() for column in range(args.stocks)]
+
+    kernels = [
+        ("max_profit", lambda history: max_profit(history), lambda: max_profit_panel(prices)),
+        ("max_profit_unlimited", lambda history: max_profit_unlimited(history), lambda: max_profit_unlimited_panel(prices)),
+        ("max_profit_with_fee", lambda history: max_profit_with_fee(history, 300), lambda: max_profit_with_fee_panel(prices, 300)),
+        (
+            "max_profit_k_transactions(5)",
+            lambda history: max_profit_k_transactions(5, history),
+            lambda: max_profit_k_transactions_panel(5, prices),
+        ),
+    ]
+
+    print("{} stocks x {} days".format(args.stocks, args.days))
+    print("{:<30} {:>10} {:>10} {:>9}  {}".format("kernel", "scalar s", "panel s", "speedup", "exact"))
+    for name, scalar, panel in kernels:
+        scalar_seconds, scalar_results = timed(lambda: [scalar(history) for history in histories])
+        panel_seconds, panel_results = timed(panel)
+        exact = bool(np.array_equal(np.asarray(scalar_results, dtype=np.float64), panel_results))
+        print("{:<30} {:>10.3f} {:>10.3f} {:>8.1f}x  {}".format(
+            name, scalar_seconds, panel_seconds, scalar_seconds / panel_seconds, exact,
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+"""Time the crawl-to-report pipeline and its hot functions on a synthetic market.
+
+Payloads come from ``benchmarks/payloads.py`` in both MI_INDEX layouts and
+are served to the real ``TwStockCrawler`` decode path, so everything from
+JSON decoding to the HTML report runs as in production, minus the network.
+Results are written as JSON; pass an earlier result to ``--compare`` to see
+which timings moved between commits.
+
+Run from the repository root:
+
+    python benchmarks/bench_pipeline.py --stocks 1000 --sessions 250
+    python benchmarks/bench_pipeline.py --compare benchmarks/results/<commit>.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import io
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from application.stock_service import StockAnalysisRequest  # noqa: E402
+from application.stock_service import StockAnalysisService  # noqa: E402
+from benchmarks.payloads import LAYOUTS  # noqa: E402
+from benchmarks.payloads import SyntheticMarket  # noqa: E402
+from benchmarks.payloads import encode_payloads  # noqa: E402
+from benchmarks.payloads import synthetic_market  # noqa: E402
+from config.settings import FETCH_WORKERS  # noqa: E402
+from config.settings import MAX_TRANSACTIONS  # noqa: E402
+from domain.models import Stocktype  # noqa: E402
+from domain.strategy import available_strategies  # noqa: E402
+from domain.strategy import get_strategy  # noqa: E402
+from infrastructure.crawler.fetch_scheduler import FetchScheduler  # noqa: E402
+from infrastructure.crawler.negative_cache import NegativeCache  # noqa: E402
+from infrastructure.crawler.response_cache import ResponseCache  # noqa: E402
+from infrastructure.crawler.twse_client import TwseClient  # noqa: E402
+from infrastructure.report.html_renderer import RendererFactory  # noqa: E402
+from infrastructure.storage.csv_repository import CsvRepository  # noqa: E402
+from stockanalysis import TwseCrawker  # noqa: E402
+from twse.analyzer import max_profit_k_transactions_panel  # noqa: E402
+from twse.analyzer import max_profit_k_transactions_trades  # noqa: E402
+from twse.analyzer import max_profit_panel  # noqa: E402
+from twse.analyzer import max_profit_unlimited_panel  # noqa: E402
+from twse.analyzer import max_profit_with_fee_panel  # noqa: E402
+from twse.analyzer import stack_price_histories  # noqa: E402
+from twse.indicators import IndicatorStore  # noqa: E402
+from twstockcrawler import TwStockCrawler  # noqa: E402
+
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+
+
+class PayloadResponse:
+    """Just enough of ``requests.Response`` for ``TwStockCrawler.get_stocktype_data``."""
+
+    ok = True
+    status_code = 200
+
+    def __init__(self, body: bytes) -> None:
+        self.body = body
+
+    def json(self) -> object:
+        return json.loads(self.body)
+
+
+class PayloadTwStockCrawler(TwStockCrawler):
+    """The real decode path, answering requests from pre-encoded payloads."""
+
+    _closed = json.dumps({"stat": "很抱歉，沒有符合條件的資料!"}).encode("utf-8")
+
+    def __init__(self, payloads: dict[str, bytes]) -> None:
+        super().__init__()
+        self.payloads = payloads
+        self.max_attempts = 1
+
+    def _request_stocktype_data(self, query_params: dict[str, str | int], date_time: str) -> PayloadResponse:
+        return PayloadResponse(self.payloads.get(date_time, self._closed))
+
+
+def timed(function: Callable[[], object]) -> tuple[float, object]:
+    started = time.perf_counter()
+    result = function()
+    return time.perf_counter() - started, result
+
+
+def timed_runs(function: Callable[[], object], repeat: int) -> tuple[dict[str, object], object]:
+    runs = []
+    result = None
+    for _ in range(repeat):
+        seconds, result = timed(function)
+        runs.append(seconds)
+    return {
+        "best_seconds": round(min(runs), 6),
+        "median_seconds": round(statistics.median(runs), 6),
+        "runs": [round(seconds, 6) for seconds in runs],
+    }, result
+
+
+def tracked_stocks(market: SyntheticMarket, tracked: int) -> list[str]:
+    step = max(market.stocks // max(tracked, 1), 1)
+    return market.stock_nos[::step][:tracked]
+
+
+def payload_client(payloads: dict[str, bytes], workdir: Path) -> TwseClient:
+    return TwseClient(
+        crawler=PayloadTwStockCrawler(payloads),
+        cache=ResponseCache(workdir / "mi_index"),
+        scheduler=FetchScheduler(rate_per_second=1e6, burst=FETCH_WORKERS),
+        negative_cache=NegativeCache(workdir / "closed_days.json"),
+    )
+
+
+def run_pipeline(market: SyntheticMarket, payloads: dict[str, bytes], stocks: list[str]) -> dict[str, object]:
+    """One cold service run (empty caches and output dir); returns its run report."""
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        client = payload_client(payloads, workdir)
+        repository = CsvRepository(workdir)
+        service = StockAnalysisService(
+            crawler_factory=lambda size: TwseCrawker(size, twse_client=client, csv_repository=repository)
+        )
+        first_session = datetime.datetime.strptime(market.dates[0], "%Y%m%d").date()
+        request = StockAnalysisRequest(
+            stocklist=list(stocks),
+            holidays=[],
+            stocktype=Stocktype.ELEC,
+            output_file_names="bench",
+            endbacktrack=(datetime.date.today() - first_session).days,
+        )
+        # The legacy crawler prints every date it fetches.
+        with redirect_stdout(io.StringIO()):
+            service.run(request)
+        return json.loads((workdir / "bench_run_report.json").read_text())
+
+
+def parse_stock_days(crawler: TwseCrawker, rows: list[list[str]], date: str) -> tuple[list[object], list[list[str]]]:
+    """Index one session and build the stock day and CSV row of every listed stock."""
+
+    parsed, stock_index = crawler.index_stock_rows(rows, date)
+    row_indices = list(stock_index.values())
+    return [crawler.build_twse_stock(parsed, row_index, date) for row_index in row_indices], parsed.text_rows(row_indices)
+
+
+def strategy_histories(market: SyntheticMarket, stocks: list[str]) -> pd.DataFrame:
+    """Long-format OHLCV frame of the tracked stocks, halted sessions dropped."""
+
+    histories = []
+    for slot, stock_no in enumerate(stocks):
+        column = market.stock_nos.index(stock_no)
+        traded = ~np.isnan(market.close[:, column])
+        histories.append(pd.DataFrame({
+            "Open": market.open[traded, column] * 1000,
+            "High": market.high[traded, column] * 1000,
+            "Low": market.low[traded, column] * 1000,
+            "Close": market.close[traded, column] * 1000,
+            "Volume": market.volume[traded, column].astype(np.float64),
+            "PE": market.pe[traded, column],
+            "slot": slot,
+        }))
+    return pd.concat(histories, ignore_index=True)
+
+
+def run_benchmarks(args: argparse.Namespace) -> dict[str, object]:
+    timings: dict[str, dict[str, object]] = {}
+    reports: dict[str, object] = {}
+
+    def bench(name: str, function: Callable[[], object]) -> object:
+        timings[name], result = timed_runs(function, args.repeat)
+        print("{:<45} {:>10.4f} s".format(name, timings[name]["best_seconds"]))
+        return result
+
+    seconds, market = timed(lambda: synthetic_market(args.stocks, args.sessions, seed=args.seed))
+    print("{} stocks x {} sessions ({} - {}), generated in {:.1f} s".format(
+        market.stocks, market.sessions, market.dates[0], market.dates[-1], seconds,
+    ))
+    payloads = {layout: encode_payloads(market, layout) for layout in args.layouts}
+    stocks = tracked_stocks(market, args.tracked)
+
+    # Decoding: JSON body to rows block, for each response layout.
+    decoder = TwStockCrawler()
+    for layout, bodies in payloads.items():
+        rows_by_date = bench(
+            "decode[{}]".format(layout),
+            lambda bodies=bodies: {date: decoder._extract_stock_rows(json.loads(body), date) for date, body in bodies.items()},
+        )
+
+    # Row parsing, over every row of every session.
+    with tempfile.TemporaryDirectory() as tmp:
+        crawler = TwseCrawker(len(stocks), twse_client=payload_client({}, Path(tmp)), csv_repository=CsvRepository(tmp))
+        bench("index_stock_rows", lambda: [crawler.index_stock_rows(rows, date) for date, rows in rows_by_date.items()])
+        bench(
+            "parse_stock_days",
+            lambda: [parse_stock_days(crawler, rows, date) for date, rows in rows_by_date.items()],
+        )
+
+    # Max-profit kernels, over the whole market.
+    histories = [market.open[~np.isnan(market.open[:, column]), column] * 1000 for column in range(market.stocks)]
+    prices = bench("stack_price_histories", lambda: stack_price_histories([history.tolist() for history in histories]))
+    bench("max_profit_panel", lambda: max_profit_panel(prices))
+    bench("max_profit_unlimited_panel", lambda: max_profit_unlimited_panel(prices))
+    bench("max_profit_k_transactions_panel", lambda: max_profit_k_transactions_panel(MAX_TRANSACTIONS, prices))
+    bench("max_profit_with_fee_panel", lambda: max_profit_with_fee_panel(prices, 300))
+    bench(
+        "max_profit_k_transactions_trades",
+        lambda: [max_profit_k_transactions_trades(MAX_TRANSACTIONS, history.tolist()) for history in histories[:len(stocks)]],
+    )
+
+    # Strategies with a cold indicator store each run, then their HTML renderers.
+    frame = strategy_histories(market, stocks)
+    for name in available_strategies():
+        strategy_type = type(get_strategy(name))
+        result = bench(
+            "strategy[{}]".format(name),
+            lambda strategy_type=strategy_type: strategy_type(indicators=IndicatorStore()).run_panel(frame, key="slot"),
+        )
+        result = result.assign(證券代號=[stocks[slot] for slot in result.index], 證券名稱="合成", 收盤=result["Close"])
+        renderer = RendererFactory.get_renderer(name)
+        bench("render[{}]".format(name), lambda renderer=renderer, result=result: renderer.render(result))
+
+    # The full service run, cold, per layout.
+    for layout, bodies in payloads.items():
+        reports[layout] = bench("pipeline[{}]".format(layout), lambda bodies=bodies: run_pipeline(market, bodies, stocks))
+
+    return {
+        "commit": git_revision(),
+        "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "parameters": {
+            "stocks": args.stocks,
+            "sessions": args.sessions,
+            "tracked": len(stocks),
+            "repeat": args.repeat,
+            "seed": args.seed,
+            "layouts": list(args.layouts),
+        },
+        "timings": timings,
+        "pipeline_reports": reports,
+    }
+
+
+def git_revision() -> str:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return commit + ("-dirty" if dirty else "")
+
+
+def compare(baseline: dict[str, object], current: dict[str, object], tolerance: float) -> list[str]:
+    """Print best-of timings side by side; return the names that slowed down past ``tolerance``."""
+
+    if baseline.get("parameters") != current.get("parameters"):
+        print("Warning: parameters differ from the baseline: {}".format(baseline.get("parameters")))
+
+    regressions = []
+    print("\n{:<45} {:>10} {:>10} {:>8}".format("vs " + str(baseline.get("commit")), "before s", "after s", "ratio"))
+    for name, timing in current["timings"].items():
+        before = baseline["timings"].get(name)
+        if before is None:
+            continue
+        ratio = timing["best_seconds"] / max(before["best_seconds"], 1e-9)
+        slower = ratio > 1 + tolerance
+        if slower:
+            regressions.append(name)
+        print("{:<45} {:>10.4f} {:>10.4f} {:>7.2f}x{}".format(
+            name, before["best_seconds"], timing["best_seconds"], ratio, "  SLOWER" if slower else "",
+        ))
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stocks", type=int, default=1000, help="Stocks per MI_INDEX payload.")
+    parser.add_argument("--sessions", type=int, default=250, help="Trading sessions to generate.")
+    parser.add_argument("--tracked", type=int, default=50, help="Stocks the pipeline and strategies analyse.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per benchmark; the best one is compared.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--layouts", nargs="+", choices=LAYOUTS, default=list(LAYOUTS))
+    parser.add_argument("--output", type=Path, help="Result file (default: benchmarks/results/<commit>.json).")
+    parser.add_argument("--compare", type=Path, help="Earlier result file to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Slowdown ratio reported as a regression.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.ERROR)
+    results = run_benchmarks(args)
+
+    output = args.output or RESULTS_DIR / "{}.json".format(results["commit"])
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    print("Results written to {}".format(output))
+
+    if args.compare is None:
+        return 0
+    regressions = compare(json.loads(args.compare.read_text(encoding="utf-8")), results, args.tolerance)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""Compare column-wise reason strings with the former per-row DataFrame.apply.
+
+Run from the repository root:
+
+    python benchmarks/bench_reasons.py --rows 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from domain.strategies.low_entry_score import LowEntryScoreStrategy  # noqa: E402
+from domain.strategies.low_entry_score_v2 import LowEntryScoreV2Strategy  # noqa: E402
+from domain.strategies.low_entry_score_v3 import LowEntryScoreV3Strategy  # noqa: E402
+
+V1_TEMPLATE = (
+    "價格位置+{價格位置:.0f}；趨勢+{趨勢:.0f}；RSI+{RSI:.0f}；"
+    "布林+{布林:.0f}；成交量+{成交量:.0f}；K線+{K線:.0f}；"
+    "MACD+{MACD:.0f}；PE+{PE:.0f}；決策={決策}"
+)
+V2_TEMPLATE = V1_TEMPLATE.replace("價格位置+{價格位置:.0f}", "價格位置{價格位置:+.0f}")
+V3_TEMPLATE = "趨勢+{趨勢:.0f}；動能+{動能:.0f}；波動+{波動:.0f}；量能+{量能:.0f}；結構+{結構:.0f}；決策={決策}"
+
+V1_LABELS = {
+    "price_score": "價格位置",
+    "trend_score": "趨勢",
+    "rsi_score": "RSI",
+    "bollinger_score": "布林",
+    "volume_score": "成交量",
+    "candle_score": "K線",
+    "macd_score": "MACD",
+    "pe_score": "PE",
+}
+V3_LABELS = {
+    "trend_score": "趨勢",
+    "momentum_score": "動能",
+    "volatility_score": "波動",
+    "volume_score": "量能",
+    "structure_score": "結構",
+}
+
+# (version, strategy factory, row-apply template, score labels)
+REASON_CASES = (
+    ("v1", LowEntryScoreStrategy, V1_TEMPLATE, V1_LABELS),
+    ("v2", LowEntryScoreV2Strategy, V2_TEMPLATE, V1_LABELS),
+    ("v3", LowEntryScoreV3Strategy, V3_TEMPLATE, V3_LABELS),
+)
+
+
+def row_apply_reasons(template: str, labels: dict[str, str], scores: dict[str, pd.Series]) -> pd.Series:
+    """The per-row ``DataFrame.apply`` formatting the strategies used before."""
+
+    score_frame = pd.DataFrame({label: scores[name] for name, label in labels.items()} | {"決策": scores["decision"]})
+    return score_frame.apply(lambda row: template.format(**row.to_dict()), axis=1)
+
+
+def make_scores(names: list[str], rows: int, seed: int = 3) -> dict[str, pd.Series]:
+    rng = np.random.default_rng(seed)
+    scores = {name: pd.Series(rng.choice([-20, 0, 5, 10, 15, 20], rows)) for name in names}
+    scores["pe_score"] = scores.get("pe_score", pd.Series(0, index=range(rows))).astype("float64")
+    scores["decision"] = pd.Series(rng.choice(["BUY", "WATCH", "WAIT"], rows))
+    return scores
+
+
+def reason_arguments(labels: dict[str, str], scores: dict[str, pd.Series]) -> dict[str, pd.Series]:
+    return {name: scores[name] for name in labels} | {"decision": scores["decision"]}
+
+
+def best_of(runs: int, function: Callable[[], object]) -> tuple[float, object]:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print("{:<4} {:>14} {:>14} {:>9}  {}".format("", "row apply ms", "column ms", "speedup", "exact"))
+    for version, strategy_cls, template, labels in REASON_CASES:
+        scores = make_scores(list(labels), args.rows)
+        strategy = strategy_cls()
+        before, expected = best_of(1, lambda: row_apply_reasons(template, labels, scores))
+        after, actual = best_of(args.runs, lambda: strategy._reasons(**reason_arguments(labels, scores)))
+        print("{:<4} {:>14.1f} {:>14.1f} {:>8.0f}x  {}".format(
+            version, before * 1000, after * 1000, before / after, actual.tolist() == expected.tolist(),
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""Synthetic MI_INDEX payloads for benchmarks.
+
+A ``SyntheticMarket`` holds random-walk OHLCV arrays for a set of stocks
+over real trading sessions. ``mi_index_payload`` renders one session in
+either response layout TWSE has served: the older top-level ``data1`` block
+or the current ``tables`` list with ``fields``/``data`` per table. Cells are
+strings formatted the way TWSE sends them: thousands separators, ``--`` for
+halted stocks and loss-making PE ratios, and the coloured ``漲跌(+/-)`` tag.
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+from dataclasses import dataclass
+
+import numpy as np
+
+from twse.trading_calendar import trading_calendar
+
+LAYOUTS = ("data1", "tables")
+
+MI_INDEX_FIELDS = [
+    "證券代號",
+    "證券名稱",
+    "成交股數",
+    "成交筆數",
+    "成交金額",
+    "開盤價",
+    "最高價",
+    "最低價",
+    "收盤價",
+    "漲跌(+/-)",
+    "漲跌價差",
+    "最後揭示買價",
+    "最後揭示買量",
+    "最後揭示賣價",
+    "最後揭示賣量",
+    "本益比",
+]
+
+# Index summary tables TWSE sends ahead of the stock table in the "tables" layout.
+_SUMMARY_TABLES = [
+    {"title": "價格指數(臺灣證券交易所)", "fields": ["指數", "收盤指數", "漲跌(+/-)", "漲跌點數", "漲跌百分比(%)", "特殊處理註記"]},
+    {"title": "大盤統計資訊", "fields": ["成交統計", "成交金額(元)", "成交股數(股)", "成交筆數"]},
+]
+
+_SIGNS = {1: "<p style= color:red>+</p>", -1: "<p style= color:green>-</p>", 0: "<p> </p>"}
+
+
+@dataclass
+class SyntheticMarket:
+    """Random-walk sessions x stocks prices; NaN prices mark halted stocks."""
+
+    dates: list[str]
+    stock_nos: list[str]
+    stock_names: list[str]
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    pe: np.ndarray
+
+    @property
+    def sessions(self) -> int:
+        return len(self.dates)
+
+    @property
+    def stocks(self) -> int:
+        return len(self.stock_nos)
+
+
+def synthetic_market(
+    stocks: int,
+    sessions: int,
+    seed: int = 0,
+    end: datetime.date | None = None,
+    halted_ratio: float = 0.01,
+    loss_ratio: float = 0.2,
+) -> SyntheticMarket:
+    """Build ``sessions`` trading days of ``stocks`` stocks ending on or before ``end``.
+
+    ``end`` defaults to yesterday so a crawl scheduled from today covers
+    every generated session.
+    """
+
+    end = end or datetime.date.today() - datetime.timedelta(days=1)
+    dates = [session.strftime("%Y%m%d") for session in trading_calendar().last_sessions(end, sessions)]
+    rng = np.random.default_rng(seed)
+    days = len(dates)
+
+    # Start prices span penny stocks to four-digit prices that need a comma.
+    start = np.exp(rng.uniform(np.log(8), np.log(1500), size=stocks))
+    close = start * np.exp(np.cumsum(rng.normal(0.0, 0.02, size=(days, stocks)), axis=0))
+    previous = np.vstack([start, close[:-1]])
+    open_price = previous * np.exp(rng.normal(0.0, 0.005, size=(days, stocks)))
+    spread = np.abs(rng.normal(0.0, 0.01, size=(days, stocks)))
+    high = np.maximum(open_price, close) * (1 + spread)
+    low = np.minimum(open_price, close) * (1 - spread)
+    volume = rng.lognormal(13, 1.5, size=(days, stocks)).astype(np.int64)
+
+    halted = rng.random((days, stocks)) < halted_ratio
+    prices = [np.where(halted, np.nan, np.round(values, 2)) for values in (open_price, high, low, close)]
+    pe = np.round(rng.uniform(5, 60, size=stocks), 2)
+    pe[rng.random(stocks) < loss_ratio] = np.nan
+
+    stock_nos = sorted(str(number) for number in rng.choice(np.arange(1101, 10000), size=stocks, replace=False))
+    return SyntheticMarket(
+        dates=dates,
+        stock_nos=stock_nos,
+        stock_names=["合成{}".format(stock_no) for stock_no in stock_nos],
+        open=prices[0],
+        high=prices[1],
+        low=prices[2],
+        close=prices[3],
+        volume=np.where(halted, 0, volume),
+        pe=np.tile(pe, (days, 1)),
+    )
+
+
+def _price(value: float) -> str:
+    return "--" if np.isnan(value) else "{:,.2f}".format(value)
+
+
+def market_rows(market: SyntheticMarket, day: int) -> list[list[str]]:
+    """One session's stock rows, in MI_INDEX column order."""
+
+    rows = []
+    previous_close = market.close[day - 1] if day else market.close[day]
+    for stock in range(market.stocks):
+        close = market.close[day, stock]
+        volume = int(market.volume[day, stock])
+        change = close - previous_close[stock]
+        sign = 0 if np.isnan(change) or change == 0 else int(np.sign(change))
+        rows.append([
+            market.stock_nos[stock],
+            market.stock_names[stock],
+            "{:,}".format(volume),
+            "{:,}".format(volume // 1000),
+            "{:,}".format(int(volume * (0 if np.isnan(close) else close))),
+            _price(market.open[day, stock]),
+            _price(market.high[day, stock]),
+            _price(market.low[day, stock]),
+            _price(close),
+            _SIGNS[sign],
+            "0.00" if sign == 0 else "{:,.2f}".format(abs(change)),
+            _price(close),
+            "{:,}".format(volume // 200),
+            _price(close),
+            "{:,}".format(volume // 300),
+            "--" if np.isnan(market.pe[day, stock]) else "{:.2f}".format(market.pe[day, stock]),
+        ])
+    return rows
+
+
+def mi_index_payload(market: SyntheticMarket, day: int, layout: str = "tables") -> dict[str, object]:
+    """The decoded MI_INDEX response for session ``day``."""
+
+    date = market.dates[day]
+    rows = market_rows(market, day)
+    if layout == "data1":
+        return {"stat": "OK", "date": date, "fields1": MI_INDEX_FIELDS, "data1": rows}
+    if layout != "tables":
+        raise ValueError("Unknown MI_INDEX layout '{}'. Available: {}".format(layout, list(LAYOUTS)))
+
+    tables: list[dict[str, object]] = [dict(table, data=[["--"] * len(table["fields"])]) for table in _SUMMARY_TABLES]
+    tables.append({"title": "{} 每日收盤行情".format(date), "fields": MI_INDEX_FIELDS, "data": rows})
+    return {"stat": "OK", "date": date, "tables": tables}
+
+
+def encode_payloads(market: SyntheticMarket, layout: str = "tables") -> dict[str, bytes]:
+    """JSON response bodies by ``YYYYMMDD``, as they would arrive over HTTP."""
+
+    return {
+        date: json.dumps(mi_index_payload(market, day, layout), ensure_ascii=False).encode("utf-8")
+        for day, date in enumerate(market.dates)
+    }
@@ -6,4 +6,80 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DATA_DIR = PROJECT_ROOT / "data"
 CHART_PATH = PROJECT_ROOT / "max_profit_analysis_chart.png"
 ENV_FILES = (PROJECT_ROOT / ".env", PROJECT_ROOT / ".env.example")
-QUERY_WAIT_SECONDS = 12
+
+# TWSE throttles bursts from one client, so concurrent fetches share a
+# token bucket instead of sleeping a fixed amount between requests.
+FETCH_RATE_PER_SECOND = 1.0
+FETCH_BURST = 2
+FETCH_WORKERS = 2
+FETCH_MAX_RETRIES = 2
+FETCH_RETRY_BACKOFF_SECONDS = 2.0
+HTTP_POOL_SIZE = 4
+
+CACHE_DIR = DATA_DIR / "cache"
+RESPONSE_CACHE_DIR = CACHE_DIR / "mi_index"
+RESPONSE_CACHE_ENABLED = True
+RESPONSE_CACHE_MAX_BYTES = 256 * 1024 * 1024
+RESPONSE_CACHE_TODAY_TTL_SECONDS = 15 * 60
+
+# MI_INDEX type covering every listed stock except warrants and CBBCs.
+MARKET_WIDE_STOCKTYPE = "ALLBUT0999"
+SECTOR_MEMBERSHIP_PATH = CACHE_DIR / "sector_membership.json"
+SECTOR_MEMBERSHIP_MAX_AGE_DAYS = 7
+
+# Legacy row-index selectors from stocklist files, resolved to stock numbers
+# once per sector listing and reused until that listing changes.
+SELECTOR_INDEX_PATH = CACHE_DIR / "selector_index.json"
+
+# A date is treated as a market closure once TWSE has returned no rows for it
+# on this many different days; a single empty reply may just be a glitch.
+NEGATIVE_CACHE_ENABLED = True
+NEGATIVE_CACHE_PATH = CACHE_DIR / "closed_days.json"
+NEGATIVE_CACHE_CONFIRMATIONS = 2
+
+# Sessions precomputed by the trading calendar before the current year; older
+# queries extend it on demand.
+TRADING_CALENDAR_YEARS_BACK = 10
+
+# Trading calendars kept per process, one per holiday set. Confirmed closures
+# change the set, so a resident process only keeps the most recent ones.
+TRADING_CALENDAR_CACHE_SIZE = 8
+
+# Daily rows are written either as one CSV per day or into monthly Parquet
+# files under COLUMNAR_DIR (requires pyarrow).
+STORAGE_BACKENDS = ("csv", "parquet")
+STORAGE_BACKEND = "csv"
+COLUMNAR_DIR = DATA_DIR / "columnar"
+
+# Memory-mapped dates x stocks OHLCV panels shared between processes.
+PANEL_DIR = DATA_DIR / "panel"
+
+# Transaction limit for the "至多五次交易" column and the emailed trade list.
+MAX_TRANSACTIONS = 5
+
+# Worker processes running per-sector analysis stages in batch mode; fetching
+# stays in the parent so sectors share one HTTP session and cache.
+BATCH_WORKERS = 4
+
+# Memory budget of the in-process indicator store shared by the strategies.
+INDICATOR_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Incremental runs keep the Low Entry v3 indicator state of every stock in
+# {prefix}.json here and only append the sessions crawled since the last run.
+STRATEGY_STATE_DIR = DATA_DIR / "streams"
+
+# --profile output: cProfile .pstats dumps plus text summaries listing the top
+# PROFILE_TOP_N functions by cumulative time or allocation sites by size.
+PROFILE_MODES = ("cpu", "mem", "both")
+PROFILE_DIR = DATA_DIR / "profiles"
+PROFILE_TOP_N = 30
+
+# `main.py serve` runs the batch jobs on every trading session once TWSE has
+# published the day's closing quotes (the market closes at 13:30 Taipei time).
+# A run that does not collect the session yet is retried a few times. One
+# worker keeps every stage in the resident process, where caches stay warm.
+SERVE_RUN_AT = "14:30"
+SERVE_TIMEZONE = "Asia/Taipei"
+SERVE_RETRY_MINUTES = 30
+SERVE_MAX_RETRIES = 3
+SERVE_WORKERS = 1
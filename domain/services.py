@@ -1,22 +1,81 @@
 """Pure domain services for profit and indicator calculations."""
 
+from importlib import import_module
+
 from twse.analyzer import LowEntryDecision
 from twse.analyzer import SignalFeatures
+from twse.analyzer import Trade
 from twse.analyzer import compute_signal_features
 from twse.analyzer import evaluate_low_entry
 from twse.analyzer import max_profit
 from twse.analyzer import max_profit_k_transactions
+from twse.analyzer import max_profit_k_transactions_panel
+from twse.analyzer import max_profit_k_transactions_trades
+from twse.analyzer import max_profit_panel
 from twse.analyzer import max_profit_unlimited
+from twse.analyzer import max_profit_unlimited_panel
 from twse.analyzer import max_profit_with_fee
+from twse.analyzer import max_profit_with_fee_panel
+from twse.analyzer import stack_price_histories
+from twse.streaming import RollingWindow
+from twse.streaming import StreamingAtr
+from twse.streaming import StreamingEma
+from twse.streaming import StreamingLag
+from twse.streaming import StreamingMacd
+from twse.streaming import StreamingObv
+from twse.streaming import StreamingRsi
+from twse.streaming import indicator_from_dict
+from twse.trading_calendar import TradingCalendar
+from twse.trading_calendar import days_between
+from twse.trading_calendar import trading_calendar
+
+# The indicator store imports pandas, so it is resolved on first use; the
+# profit kernels and the calendar stay cheap to import for the crawl stage.
+_LAZY_EXPORTS = {
+    "IndicatorStats": "twse.indicators",
+    "IndicatorStore": "twse.indicators",
+    "default_indicator_store": "twse.indicators",
+}
+
+
+def __getattr__(name: str) -> object:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
+    "IndicatorStats",
+    "IndicatorStore",
     "LowEntryDecision",
+    "RollingWindow",
     "SignalFeatures",
+    "StreamingAtr",
+    "StreamingEma",
+    "StreamingLag",
+    "StreamingMacd",
+    "StreamingObv",
+    "StreamingRsi",
+    "Trade",
+    "TradingCalendar",
     "compute_signal_features",
+    "days_between",
+    "default_indicator_store",
     "evaluate_low_entry",
+    "indicator_from_dict",
     "max_profit",
     "max_profit_k_transactions",
+    "max_profit_k_transactions_panel",
+    "max_profit_k_transactions_trades",
+    "max_profit_panel",
     "max_profit_unlimited",
+    "max_profit_unlimited_panel",
     "max_profit_with_fee",
+    "max_profit_with_fee_panel",
+    "stack_price_histories",
+    "trading_calendar",
 ]
 
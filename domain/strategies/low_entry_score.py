@@ -11,6 +11,9 @@ from dataclasses import dataclass
 import numpy as np
 import pandas as pd
 
+from domain.services import IndicatorStore
+from domain.services import default_indicator_store
+from domain.strategies.reasons import format_reasons
 from domain.strategy import Strategy
 
 LOW_ENTRY_STRATEGY_NAME = "low_entry_score"
@@ -57,29 +60,75 @@ class LowEntryScoreStrategy(Strategy):
 
     name = LOW_ENTRY_STRATEGY_NAME
 
-    def __init__(self, config: LowEntryScoreConfig | None = None) -> None:
+    def __init__(self, config: LowEntryScoreConfig | None = None, indicators: IndicatorStore | None = None) -> None:
         self.config = config or LowEntryScoreConfig()
+        self.indicators = indicators if indicators is not None else default_indicator_store()
 
     def run(self, data: pd.DataFrame) -> pd.DataFrame:
         if data.empty:
             return pd.DataFrame([self._empty_result()])
 
         df = data.copy()
+        return pd.concat([df, self._score(df)], axis=1)
+
+    def evaluate_latest(self, data: pd.DataFrame) -> dict[str, object]:
+        """Score only the last row, reading just the bars its windows reach.
+
+        MACD recurses over the whole history, so it still comes from the full
+        close series; every other indicator runs on a short tail.
+        """
+
+        if data.empty:
+            return self._empty_result()
+
+        close = self._numeric_column(data, ("Close", "收盤"))
+        full_macd = self.indicators.bind(str(data.attrs.get("stock", "")), close=close).macd()
+        tail = data.iloc[-self._lookback():]
+        result = self._score(tail, full_macd=full_macd, latest_only=True)
+        return {**tail.iloc[-1].to_dict(), **result.iloc[-1].to_dict()}
+
+    def _lookback(self) -> int:
+        """Rows the last row's rolling windows, diffs and shifts depend on."""
+
+        return max(
+            self.config.position_window,
+            self.config.ma_long_window,
+            self.config.ma_short_window + 1,
+            self.config.bollinger_window,
+            self.config.volume_window,
+            self.config.rsi_window + 2,
+            self.config.atr_window + 1,
+        )
+
+    def _score(
+        self,
+        df: pd.DataFrame,
+        full_macd: tuple[pd.Series, pd.Series] | None = None,
+        latest_only: bool = False,
+    ) -> pd.DataFrame:
         open_price = self._numeric_column(df, ("Open", "開盤"))
         high = self._numeric_column(df, ("High", "最高"))
         low = self._numeric_column(df, ("Low", "最低"))
         close = self._numeric_column(df, ("Close", "收盤"))
         volume = self._numeric_column(df, ("Volume", "成交量")).fillna(0)
         pe = self._numeric_column(df, ("PE", "本益比"))
+        features = self.indicators.bind(
+            str(df.attrs.get("stock", "")),
+            high=high,
+            low=low,
+            close=close,
+            volume=volume,
+            pe=pe,
+        )
 
-        high60 = high.rolling(self.config.position_window, min_periods=1).max()
-        low60 = low.rolling(self.config.position_window, min_periods=1).min()
+        high60 = features.rolling_max("high", self.config.position_window)
+        low60 = features.rolling_min("low", self.config.position_window)
         position_range = high60 - low60
         position60 = ((close - low60) / position_range).where(position_range.abs() > self.config.epsilon)
         price_score = pd.Series(np.where(position60 < 0.2, 20, 0), index=df.index)
 
-        ma20 = close.rolling(self.config.ma_short_window, min_periods=1).mean()
-        ma60 = close.rolling(self.config.ma_long_window, min_periods=1).mean()
+        ma20 = features.sma("close", self.config.ma_short_window)
+        ma60 = features.sma("close", self.config.ma_long_window)
         strong_trend = (close > ma20) & (ma20 > ma60)
         repaired_trend = (close > ma20) & ~strong_trend
         trend_score = pd.Series(
@@ -87,28 +136,21 @@ class LowEntryScoreStrategy(Strategy):
             index=df.index,
         )
 
-        delta = close.diff()
-        gain = delta.clip(lower=0)
-        loss = (-delta).clip(lower=0)
-        avg_gain = gain.rolling(self.config.rsi_window, min_periods=1).mean()
-        avg_loss = loss.rolling(self.config.rsi_window, min_periods=1).mean()
-        rs = avg_gain / avg_loss.replace(0, np.nan)
-        rsi = 100 - (100 / (1 + rs))
-        rsi = rsi.where(avg_loss != 0, np.where(avg_gain > 0, 100, 50)).fillna(50)
+        rsi = features.rsi(self.config.rsi_window)
         rsi_score = pd.Series(
             np.select([rsi < 30, (rsi >= 30) & (rsi < 35)], [15, 10], default=0),
             index=df.index,
         ) + pd.Series(np.where(rsi > rsi.shift(1), 5, 0), index=df.index)
 
-        std20 = close.rolling(self.config.bollinger_window, min_periods=2).std(ddof=0)
+        std20 = features.std("close", self.config.bollinger_window)
         lower_band = ma20 - (2 * std20)
         bollinger_score = pd.Series(
             np.where(lower_band.notna() & (close < lower_band), 15, 0),
             index=df.index,
         )
 
-        volume_ma20 = volume.rolling(self.config.volume_window, min_periods=1).mean()
-        volume_std20 = volume.rolling(self.config.volume_window, min_periods=2).std(ddof=0)
+        volume_ma20 = features.sma("volume", self.config.volume_window)
+        volume_std20 = features.std("volume", self.config.volume_window)
         volume_z = ((volume - volume_ma20) / volume_std20).replace([np.inf, -np.inf], np.nan).fillna(0)
         volume_score = pd.Series(
             np.select([volume_z > 2, (volume_z > 1.5) & (volume_z <= 2)], [15, 10], default=0),
@@ -120,29 +162,20 @@ class LowEntryScoreStrategy(Strategy):
         hammer = lower_shadow > (2 * body)
         candle_score = pd.Series(np.where(hammer, 10, 0), index=df.index)
 
-        ema12 = close.ewm(span=12, adjust=False, min_periods=1).mean()
-        ema26 = close.ewm(span=26, adjust=False, min_periods=1).mean()
-        macd = ema12 - ema26
-        macd_signal = macd.ewm(span=9, adjust=False, min_periods=1).mean()
+        if full_macd is None:
+            macd, macd_signal = features.macd()
+        else:
+            macd, macd_signal = (values.iloc[-len(df):] for values in full_macd)
         macd_score = pd.Series(np.where(macd > macd_signal, 10, 0), index=df.index)
 
-        pe_avg = pe.rolling(self.config.position_window, min_periods=1).mean()
+        pe_avg = features.sma("pe", self.config.position_window)
         pe_ratio = (pe / pe_avg).where(pe_avg.abs() > self.config.epsilon)
         pe_score = pd.Series(
             np.select([pe_ratio < 0.8, (pe_ratio >= 0.8) & (pe_ratio <= 1.2)], [10, 5], default=0),
             index=df.index,
         ).where(pe_ratio.notna(), 0)
 
-        previous_close = close.shift(1)
-        true_range = pd.concat(
-            [
-                high - low,
-                (high - previous_close).abs(),
-                (low - previous_close).abs(),
-            ],
-            axis=1,
-        ).max(axis=1)
-        atr14 = true_range.rolling(self.config.atr_window, min_periods=1).mean()
+        atr14 = features.atr(self.config.atr_window)
         strategy_stop_loss = close - (2 * atr14)
         strategy_take_profit = close + (3 * atr14)
 
@@ -161,7 +194,8 @@ class LowEntryScoreStrategy(Strategy):
             index=df.index,
         )
 
-        result = pd.DataFrame(
+        rows = slice(-1, None) if latest_only else slice(None)
+        return pd.DataFrame(
             {
                 "低點分數": total_score.round(2),
                 "低點決策": decision,
@@ -179,22 +213,20 @@ class LowEntryScoreStrategy(Strategy):
                 "策略停利": strategy_take_profit.round(2),
                 "PE Ratio": pe_ratio.round(4),
                 "低點理由": self._reasons(
-                    price_score=price_score,
-                    trend_score=trend_score,
-                    rsi_score=rsi_score,
-                    bollinger_score=bollinger_score,
-                    volume_score=volume_score,
-                    candle_score=candle_score,
-                    macd_score=macd_score,
-                    pe_score=pe_score,
-                    decision=decision,
+                    price_score=price_score.iloc[rows],
+                    trend_score=trend_score.iloc[rows],
+                    rsi_score=rsi_score.iloc[rows],
+                    bollinger_score=bollinger_score.iloc[rows],
+                    volume_score=volume_score.iloc[rows],
+                    candle_score=candle_score.iloc[rows],
+                    macd_score=macd_score.iloc[rows],
+                    pe_score=pe_score.iloc[rows],
+                    decision=decision.iloc[rows],
                 ),
             },
-            index=df.index,
+            index=df.index[rows],
         )
 
-        return pd.concat([df, result], axis=1)
-
     def _numeric_column(self, data: pd.DataFrame, names: tuple[str, ...]) -> pd.Series:
         for name in names:
             if name in data.columns:
@@ -213,7 +245,7 @@ class LowEntryScoreStrategy(Strategy):
         pe_score: pd.Series,
         decision: pd.Series,
     ) -> pd.Series:
-        score_frame = pd.DataFrame(
+        return format_reasons(
             {
                 "價格位置": price_score,
                 "趨勢": trend_score,
@@ -223,16 +255,8 @@ class LowEntryScoreStrategy(Strategy):
                 "K線": candle_score,
                 "MACD": macd_score,
                 "PE": pe_score,
-                "決策": decision,
-            }
-        )
-        return score_frame.apply(
-            lambda row: (
-                "價格位置+{價格位置:.0f}；趨勢+{趨勢:.0f}；RSI+{RSI:.0f}；"
-                "布林+{布林:.0f}；成交量+{成交量:.0f}；K線+{K線:.0f}；"
-                "MACD+{MACD:.0f}；PE+{PE:.0f}；決策={決策}"
-            ).format(**row.to_dict()),
-            axis=1,
+            },
+            decision,
         )
 
     def _empty_result(self) -> dict[str, object]:
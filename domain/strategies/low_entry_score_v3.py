@@ -2,13 +2,32 @@
 
 from __future__ import annotations
 
+import math
+from collections.abc import Mapping
+from dataclasses import asdict
 from dataclasses import dataclass
+from typing import Any
+from typing import TypeAlias
 
 import numpy as np
 import pandas as pd
 
+from domain.services import IndicatorStore
+from domain.services import RollingWindow
+from domain.services import StreamingAtr
+from domain.services import StreamingEma
+from domain.services import StreamingLag
+from domain.services import StreamingMacd
+from domain.services import StreamingObv
+from domain.services import StreamingRsi
+from domain.services import default_indicator_store
+from domain.services import indicator_from_dict
+from domain.strategies.reasons import format_reasons
 from domain.strategy import Strategy
 
+# Indicators run on one stock's Series or on a (days x stocks) DataFrame.
+PriceFrame: TypeAlias = "pd.Series | pd.DataFrame"
+
 LOW_ENTRY_STRATEGY_NAME = "low_entry_score_v3"
 
 LOW_ENTRY_OUTPUT_COLUMNS = [
@@ -61,8 +80,9 @@ class LowEntryScoreV3Strategy(Strategy):
 
     name = LOW_ENTRY_STRATEGY_NAME
 
-    def __init__(self, config: LowEntryScoreV3Config | None = None) -> None:
+    def __init__(self, config: LowEntryScoreV3Config | None = None, indicators: IndicatorStore | None = None) -> None:
         self.config = config or LowEntryScoreV3Config()
+        self.indicators = indicators if indicators is not None else default_indicator_store()
 
     def run(self, data: pd.DataFrame) -> pd.DataFrame:
         if data.empty:
@@ -70,117 +90,241 @@ class LowEntryScoreV3Strategy(Strategy):
 
         df = data.copy()
         #open_price = self._numeric_column(df, ("Open", "開盤"))
-        high = self._numeric_column(df, ("High", "最高"))
-        low = self._numeric_column(df, ("Low", "最低"))
-        close = self._numeric_column(df, ("Close", "收盤"))
-        volume = self._numeric_column(df, ("Volume", "成交量")).fillna(0)
-
-        ema20 = close.ewm(span=self.config.ema_short_window, adjust=False, min_periods=1).mean()
-        ema50 = close.ewm(span=self.config.ema_medium_window, adjust=False, min_periods=1).mean()
-        ema200 = close.ewm(span=self.config.ema_long_window, adjust=False, min_periods=1).mean()
-        ema_alignment = (ema20 > ema50) & (ema50 > ema200)
-        price_above_ema20 = close > ema20
-        trend_score = pd.Series(
-            np.where(ema_alignment, 15, 0) + np.where(price_above_ema20, 10, 0),
-            index=df.index,
+        indicators = self._indicators(
+            stock=str(df.attrs.get("stock", "")),
+            high=self._numeric_column(df, ("High", "最高")),
+            low=self._numeric_column(df, ("Low", "最低")),
+            close=self._numeric_column(df, ("Close", "收盤")),
+            volume=self._numeric_column(df, ("Volume", "成交量")).fillna(0),
+        )
+        result = pd.DataFrame(self._result_columns(indicators), index=df.index)
+
+        return pd.concat([df, result], axis=1)
+
+    def run_panel(self, data: pd.DataFrame, key: str = "stock") -> pd.DataFrame:
+        """Score the latest day of every stock in one set of wide-frame passes.
+
+        Each field is pivoted into a (days x stocks) frame with every history
+        right-aligned on the last row. The leading padding is NaN, which the
+        EWM, rolling and shift operations skip exactly as if the shorter
+        history had been run on its own.
+        """
+
+        if data.empty:
+            return pd.DataFrame(columns=list(data.columns.drop(key, errors="ignore")) + LOW_ENTRY_OUTPUT_COLUMNS)
+
+        stocks = pd.unique(data[key])
+        row = data.groupby(key, sort=False).cumcount(ascending=False)
+        row = row.max() - row
+        wide = data.assign(_row=row.to_numpy())
+
+        def field(names: tuple[str, ...]) -> pd.DataFrame:
+            for name in names:
+                if name in wide.columns:
+                    values = wide.assign(**{name: pd.to_numeric(wide[name], errors="coerce")})
+                    return values.pivot(index="_row", columns=key, values=name).reindex(columns=stocks)
+            return pd.DataFrame(np.nan, index=pd.RangeIndex(row.max() + 1), columns=stocks)
+
+        close = field(("Close", "收盤"))
+        # Volume gaps inside a history count as zero; the padding stays NaN.
+        in_history = wide.assign(_present=1.0).pivot(index="_row", columns=key, values="_present").reindex(columns=stocks).notna()
+        volume = field(("Volume", "成交量")).fillna(0).where(in_history)
+        indicators = self._indicators(
+            stock="",
+            high=field(("High", "最高")),
+            low=field(("Low", "最低")),
+            close=close,
+            volume=volume,
+        )
+        latest = {name: values.iloc[-1] for name, values in indicators.items()}
+        result = pd.DataFrame(self._result_columns(latest), index=stocks)
+
+        inputs = data.groupby(key, sort=False).tail(1).set_index(key).reindex(stocks)
+        return pd.concat([inputs, result], axis=1)
+
+    def evaluate_latest(self, data: pd.DataFrame) -> dict[str, object]:
+        """Score only the last row, running windowed indicators on a short tail."""
+
+        if data.empty:
+            return self._empty_result()
+
+        indicators = self._indicators(
+            stock=str(data.attrs.get("stock", "")),
+            high=self._numeric_column(data, ("High", "最高")),
+            low=self._numeric_column(data, ("Low", "最低")),
+            close=self._numeric_column(data, ("Close", "收盤")),
+            volume=self._numeric_column(data, ("Volume", "成交量")).fillna(0),
+            lookback=self._lookback(),
         )
+        result = pd.DataFrame(self._result_columns({name: values.iloc[-1:] for name, values in indicators.items()}))
+        return {**data.iloc[-1].to_dict(), **result.iloc[0].to_dict()}
+
+    def _lookback(self) -> int:
+        """Rows the last row's rolling windows, diffs and shifts depend on."""
 
-        rsi = self._rsi(close)
-        rsi_score = pd.Series(
-            np.select([(rsi > 40) & (rsi < 60), rsi < 40], [10, 5], default=0),
-            index=df.index,
+        return max(
+            self.config.bollinger_window,
+            self.config.atr_window + self.config.atr_ma_window,
+            self.config.volume_window,
+            self.config.rsi_window + 1,
+            self.config.support_window + 1,
+            self.config.higher_low_window * 2,
         )
-        ema12 = close.ewm(span=12, adjust=False, min_periods=1).mean()
-        ema26 = close.ewm(span=26, adjust=False, min_periods=1).mean()
-        macd = ema12 - ema26
-        macd_signal = macd.ewm(span=9, adjust=False, min_periods=1).mean()
+
+    def stream(self, history: pd.DataFrame | None = None) -> LowEntryScoreV3Stream:
+        """Return incremental indicator state, seeded with ``history`` if given."""
+
+        stream = LowEntryScoreV3Stream(self.config, strategy=self)
+        if history is not None and not history.empty:
+            stream.push_history(history)
+        return stream
+
+    def _indicators(
+        self,
+        stock: str,
+        high: PriceFrame,
+        low: PriceFrame,
+        close: PriceFrame,
+        volume: PriceFrame,
+        lookback: int | None = None,
+    ) -> dict[str, PriceFrame]:
+        """Compute every indicator column-wise for a Series or a wide frame.
+
+        With ``lookback`` only the last ``lookback`` rows are returned. The
+        recursive EMAs, MACD and OBV still run over the full history; the
+        windowed indicators only see the tail.
+        """
+
+        features = self.indicators.bind(stock, high=high, low=low, close=close, volume=volume)
+        ema20 = features.ema("close", self.config.ema_short_window)
+        ema50 = features.ema("close", self.config.ema_medium_window)
+        ema200 = features.ema("close", self.config.ema_long_window)
+        macd, macd_signal = features.macd()
+        obv = features.obv()
+        if lookback is not None:
+            high, low, close, volume, ema20, ema50, ema200, macd, macd_signal, obv = (
+                values.iloc[-lookback:]
+                for values in (high, low, close, volume, ema20, ema50, ema200, macd, macd_signal, obv)
+            )
+            features = self.indicators.bind(stock, high=high, low=low, close=close, volume=volume)
+
+        ema_alignment = (ema20 > ema50) & (ema50 > ema200)
+        price_above_ema20 = close > ema20
+        trend_score = ema_alignment.astype(int) * 15 + price_above_ema20.astype(int) * 10
+
+        rsi = features.rsi(self.config.rsi_window)
+        rsi_score = ((rsi > 40) & (rsi < 60)).astype(int) * 10 + (rsi < 40).astype(int) * 5
         macd_histogram = macd - macd_signal
         macd_bullish = macd > macd_signal
-        momentum_score = rsi_score + pd.Series(np.where(macd_bullish, 10, 0), index=df.index)
+        momentum_score = rsi_score + macd_bullish.astype(int) * 10
 
-        ma20 = close.rolling(self.config.bollinger_window, min_periods=1).mean()
-        std20 = close.rolling(self.config.bollinger_window, min_periods=2).std(ddof=0)
+        ma20 = features.sma("close", self.config.bollinger_window)
+        std20 = features.std("close", self.config.bollinger_window)
         upper_band = ma20 + (2 * std20)
         lower_band = ma20 - (2 * std20)
         band_width = upper_band - lower_band
         lower_band_position = ((close - lower_band) / band_width).where(band_width.abs() > self.config.epsilon)
         near_lower_band = lower_band.notna() & (lower_band_position <= 0.2)
 
-        atr14 = self._atr(high=high, low=low, close=close)
+        atr14 = features.atr(self.config.atr_window)
         atr20ma = atr14.rolling(self.config.atr_ma_window, min_periods=1).mean()
         atr_contraction = atr14 < atr20ma
-        volatility_score = pd.Series(
-            np.where(near_lower_band, 10, 0) + np.where(atr_contraction, 10, 0),
-            index=df.index,
-        )
+        volatility_score = near_lower_band.astype(int) * 10 + atr_contraction.astype(int) * 10
 
-        volume_ma20 = volume.rolling(self.config.volume_window, min_periods=1).mean()
+        volume_ma20 = features.sma("volume", self.config.volume_window)
         volume_above_ma20 = volume > volume_ma20
-        obv = self._obv(close=close, volume=volume)
         obv_rising = obv > obv.shift(1)
-        volume_score = pd.Series(
-            np.where(volume_above_ma20, 10, 0) + np.where(obv_rising, 10, 0),
-            index=df.index,
-        )
+        volume_score = volume_above_ma20.astype(int) * 10 + obv_rising.astype(int) * 10
 
         previous_swing_low = low.shift(1).rolling(self.config.support_window, min_periods=1).min()
         support_holding = low >= previous_swing_low
         current_low_window = low.rolling(self.config.higher_low_window, min_periods=1).min()
         previous_low_window = current_low_window.shift(self.config.higher_low_window)
         higher_low = current_low_window > previous_low_window
-        structure_score = pd.Series(
-            np.where(support_holding, 10, 0) + np.where(higher_low, 5, 0),
-            index=df.index,
-        )
+        structure_score = support_holding.astype(int) * 10 + higher_low.astype(int) * 5
 
-        total_score = (trend_score + momentum_score + volatility_score + volume_score + structure_score).clip(lower=0, upper=100)
+        return {
+            "close": close,
+            "ema20": ema20,
+            "ema50": ema50,
+            "ema200": ema200,
+            "ema_alignment": ema_alignment,
+            "price_above_ema20": price_above_ema20,
+            "rsi": rsi,
+            "macd": macd,
+            "macd_signal": macd_signal,
+            "macd_histogram": macd_histogram,
+            "macd_bullish": macd_bullish,
+            "lower_band": lower_band,
+            "near_lower_band": near_lower_band,
+            "atr14": atr14,
+            "atr20ma": atr20ma,
+            "atr_contraction": atr_contraction,
+            "volume_ma20": volume_ma20,
+            "volume_above_ma20": volume_above_ma20,
+            "obv": obv,
+            "obv_rising": obv_rising,
+            "support_holding": support_holding,
+            "higher_low": higher_low,
+            "trend_score": trend_score,
+            "momentum_score": momentum_score,
+            "volatility_score": volatility_score,
+            "volume_score": volume_score,
+            "structure_score": structure_score,
+        }
+
+    def _result_columns(self, indicators: dict[str, pd.Series]) -> dict[str, pd.Series]:
+        close = indicators["close"]
+        atr14 = indicators["atr14"]
+        total_score = (
+            indicators["trend_score"]
+            + indicators["momentum_score"]
+            + indicators["volatility_score"]
+            + indicators["volume_score"]
+            + indicators["structure_score"]
+        ).clip(lower=0, upper=100)
         decision = pd.Series(
             np.select([total_score >= 75, total_score >= 60], ["BUY", "WATCH"], default="WAIT"),
-            index=df.index,
+            index=total_score.index,
         )
         strategy_stop_loss = close - (2 * atr14)
         strategy_take_profit = close + (3 * atr14)
 
-        result = pd.DataFrame(
-            {
-                "低點分數": total_score.round(2),
-                "低點決策": decision,
-                "EMA20": ema20.round(2),
-                "EMA50": ema50.round(2),
-                "EMA200": ema200.round(2),
-                "EMA Alignment": ema_alignment.astype(int),
-                "Price Above EMA20": price_above_ema20.astype(int),
-                "RSI14": rsi.round(2),
-                "MACD": macd.round(2),
-                "MACD Signal": macd_signal.round(2),
-                "MACD Histogram": macd_histogram.round(2),
-                "MACD Bullish": macd_bullish.astype(int),
-                "布林下緣": lower_band.round(2),
-                "Near Lower Band": near_lower_band.astype(int),
-                "ATR14": atr14.round(2),
-                "ATR20MA": atr20ma.round(2),
-                "ATR Contraction": atr_contraction.astype(int),
-                "成交量MA20": volume_ma20.round(2),
-                "Volume Above MA20": volume_above_ma20.astype(int),
-                "OBV": obv.round(2),
-                "OBV Rising": obv_rising.astype(int),
-                "Support Holding": support_holding.astype(int),
-                "Higher Low": higher_low.astype(int),
-                "策略停損": strategy_stop_loss.round(2),
-                "策略停利": strategy_take_profit.round(2),
-                "低點理由": self._reasons(
-                    trend_score=trend_score,
-                    momentum_score=momentum_score,
-                    volatility_score=volatility_score,
-                    volume_score=volume_score,
-                    structure_score=structure_score,
-                    decision=decision,
-                ),
-            },
-            index=df.index,
-        )
-
-        return pd.concat([df, result], axis=1)
+        return {
+            "低點分數": total_score.round(2),
+            "低點決策": decision,
+            "EMA20": indicators["ema20"].round(2),
+            "EMA50": indicators["ema50"].round(2),
+            "EMA200": indicators["ema200"].round(2),
+            "EMA Alignment": indicators["ema_alignment"].astype(int),
+            "Price Above EMA20": indicators["price_above_ema20"].astype(int),
+            "RSI14": indicators["rsi"].round(2),
+            "MACD": indicators["macd"].round(2),
+            "MACD Signal": indicators["macd_signal"].round(2),
+            "MACD Histogram": indicators["macd_histogram"].round(2),
+            "MACD Bullish": indicators["macd_bullish"].astype(int),
+            "布林下緣": indicators["lower_band"].round(2),
+            "Near Lower Band": indicators["near_lower_band"].astype(int),
+            "ATR14": atr14.round(2),
+            "ATR20MA": indicators["atr20ma"].round(2),
+            "ATR Contraction": indicators["atr_contraction"].astype(int),
+            "成交量MA20": indicators["volume_ma20"].round(2),
+            "Volume Above MA20": indicators["volume_above_ma20"].astype(int),
+            "OBV": indicators["obv"].round(2),
+            "OBV Rising": indicators["obv_rising"].astype(int),
+            "Support Holding": indicators["support_holding"].astype(int),
+            "Higher Low": indicators["higher_low"].astype(int),
+            "策略停損": strategy_stop_loss.round(2),
+            "策略停利": strategy_take_profit.round(2),
+            "低點理由": self._reasons(
+                trend_score=indicators["trend_score"],
+                momentum_score=indicators["momentum_score"],
+                volatility_score=indicators["volatility_score"],
+                volume_score=indicators["volume_score"],
+                structure_score=indicators["structure_score"],
+                decision=decision,
+            ),
+        }
 
     def _numeric_column(self, data: pd.DataFrame, names: tuple[str, ...]) -> pd.Series:
         for name in names:
@@ -188,32 +332,6 @@ class LowEntryScoreV3Strategy(Strategy):
                 return pd.to_numeric(data[name], errors="coerce")
         return pd.Series(np.nan, index=data.index, dtype="float64")
 
-    def _rsi(self, close: pd.Series) -> pd.Series:
-        delta = close.diff()
-        gain = delta.clip(lower=0)
-        loss = (-delta).clip(lower=0)
-        avg_gain = gain.rolling(self.config.rsi_window, min_periods=1).mean()
-        avg_loss = loss.rolling(self.config.rsi_window, min_periods=1).mean()
-        rs = avg_gain / avg_loss.replace(0, np.nan)
-        rsi = 100 - (100 / (1 + rs))
-        return rsi.where(avg_loss != 0, np.where(avg_gain > 0, 100, 50)).fillna(50)
-
-    def _atr(self, high: pd.Series, low: pd.Series, close: pd.Series) -> pd.Series:
-        previous_close = close.shift(1)
-        true_range = pd.concat(
-            [
-                high - low,
-                (high - previous_close).abs(),
-                (low - previous_close).abs(),
-            ],
-            axis=1,
-        ).max(axis=1)
-        return true_range.rolling(self.config.atr_window, min_periods=1).mean()
-
-    def _obv(self, close: pd.Series, volume: pd.Series) -> pd.Series:
-        direction = np.select([close > close.shift(1), close < close.shift(1)], [1, -1], default=0)
-        return pd.Series(direction * volume, index=close.index).cumsum()
-
     def _reasons(
         self,
         trend_score: pd.Series,
@@ -223,22 +341,15 @@ class LowEntryScoreV3Strategy(Strategy):
         structure_score: pd.Series,
         decision: pd.Series,
     ) -> pd.Series:
-        score_frame = pd.DataFrame(
+        return format_reasons(
             {
                 "趨勢": trend_score,
                 "動能": momentum_score,
                 "波動": volatility_score,
                 "量能": volume_score,
                 "結構": structure_score,
-                "決策": decision,
-            }
-        )
-        return score_frame.apply(
-            lambda row: (
-                "趨勢+{趨勢:.0f}；動能+{動能:.0f}；波動+{波動:.0f}；"
-                "量能+{量能:.0f}；結構+{結構:.0f}；決策={決策}"
-            ).format(**row.to_dict()),
-            axis=1,
+            },
+            decision,
         )
 
     def _empty_result(self) -> dict[str, object]:
@@ -270,3 +381,150 @@ class LowEntryScoreV3Strategy(Strategy):
             "策略停利": np.nan,
             "低點理由": "資料不足；決策=WAIT",
         }
+
+
+class LowEntryScoreV3Stream:
+    """v3 indicator state that takes one daily bar at a time.
+
+    Every indicator keeps only its window (EMAs keep a single value), so a
+    daily job can ``to_dict()`` the state, store it, and resume tomorrow with
+    one ``push()`` instead of replaying the whole history. ``result()``
+    scores the latest bar exactly like the last row of ``run()``.
+    """
+
+    def __init__(
+        self,
+        config: LowEntryScoreV3Config | None = None,
+        indicators: Mapping[str, Mapping[str, Any]] | None = None,
+        strategy: LowEntryScoreV3Strategy | None = None,
+    ) -> None:
+        self.config = config or LowEntryScoreV3Config()
+        self.strategy = strategy or LowEntryScoreV3Strategy(self.config)
+        self.latest: dict[str, object] | None = None
+
+        config = self.config
+        defaults = {
+            "ema20": lambda: StreamingEma(config.ema_short_window),
+            "ema50": lambda: StreamingEma(config.ema_medium_window),
+            "ema200": lambda: StreamingEma(config.ema_long_window),
+            "rsi": lambda: StreamingRsi(config.rsi_window),
+            "macd": StreamingMacd,
+            "bollinger": lambda: RollingWindow(config.bollinger_window),
+            "atr": lambda: StreamingAtr(config.atr_window),
+            "atr_ma": lambda: RollingWindow(config.atr_ma_window),
+            "volume": lambda: RollingWindow(config.volume_window),
+            "obv": StreamingObv,
+            "obv_lag": lambda: StreamingLag(1),
+            "support": lambda: RollingWindow(config.support_window),
+            "low_window": lambda: RollingWindow(config.higher_low_window),
+            "low_window_lag": lambda: StreamingLag(config.higher_low_window),
+        }
+        saved = indicators or {}
+        self.indicators = {
+            name: indicator_from_dict(saved[name]) if name in saved else default()
+            for name, default in defaults.items()
+        }
+
+    def push(self, high: float, low: float, close: float, volume: float) -> dict[str, object]:
+        """Append one bar and return the latest value of every v3 indicator."""
+
+        state = self.indicators
+        volume = 0.0 if math.isnan(volume) else volume
+
+        ema20 = state["ema20"].update(close)
+        ema50 = state["ema50"].update(close)
+        ema200 = state["ema200"].update(close)
+        ema_alignment = ema20 > ema50 and ema50 > ema200
+        price_above_ema20 = close > ema20
+
+        rsi = state["rsi"].update(close)
+        macd, macd_signal = state["macd"].update(close)
+        macd_bullish = macd > macd_signal
+
+        bollinger = state["bollinger"]
+        bollinger.push(close)
+        ma20 = bollinger.mean()
+        std20 = bollinger.std()
+        lower_band = ma20 - (2 * std20)
+        band_width = 4 * std20
+        lower_band_position = (close - lower_band) / band_width if abs(band_width) > self.config.epsilon else math.nan
+        near_lower_band = not math.isnan(lower_band) and lower_band_position <= 0.2
+
+        atr14 = state["atr"].update(high, low, close)
+        state["atr_ma"].push(atr14)
+        atr20ma = state["atr_ma"].mean()
+
+        state["volume"].push(volume)
+        volume_ma20 = state["volume"].mean()
+        obv = state["obv"].update(close, volume)
+        obv_rising = obv > state["obv_lag"].update(obv)
+
+        previous_swing_low = state["support"].min()
+        state["support"].push(low)
+        state["low_window"].push(low)
+        current_low_window = state["low_window"].min()
+        higher_low = current_low_window > state["low_window_lag"].update(current_low_window)
+
+        support_holding = low >= previous_swing_low
+        self.latest = {
+            "close": close,
+            "ema20": ema20,
+            "ema50": ema50,
+            "ema200": ema200,
+            "ema_alignment": ema_alignment,
+            "price_above_ema20": price_above_ema20,
+            "rsi": rsi,
+            "macd": macd,
+            "macd_signal": macd_signal,
+            "macd_histogram": macd - macd_signal,
+            "macd_bullish": macd_bullish,
+            "lower_band": lower_band,
+            "near_lower_band": near_lower_band,
+            "atr14": atr14,
+            "atr20ma": atr20ma,
+            "atr_contraction": atr14 < atr20ma,
+            "volume_ma20": volume_ma20,
+            "volume_above_ma20": volume > volume_ma20,
+            "obv": obv,
+            "obv_rising": obv_rising,
+            "support_holding": support_holding,
+            "higher_low": higher_low,
+            "trend_score": int(ema_alignment) * 15 + int(price_above_ema20) * 10,
+            "momentum_score": int(40 < rsi < 60) * 10 + int(rsi < 40) * 5 + int(macd_bullish) * 10,
+            "volatility_score": int(near_lower_band) * 10 + int(atr14 < atr20ma) * 10,
+            "volume_score": int(volume > volume_ma20) * 10 + int(obv_rising) * 10,
+            "structure_score": int(support_holding) * 10 + int(higher_low) * 5,
+        }
+        return self.latest
+
+    def push_history(self, history: pd.DataFrame) -> None:
+        numeric_column = self.strategy._numeric_column
+        columns = (
+            numeric_column(history, ("High", "最高")),
+            numeric_column(history, ("Low", "最低")),
+            numeric_column(history, ("Close", "收盤")),
+            numeric_column(history, ("Volume", "成交量")),
+        )
+        for high, low, close, volume in zip(*(column.to_numpy(dtype="float64") for column in columns)):
+            self.push(float(high), float(low), float(close), float(volume))
+
+    def result(self) -> pd.DataFrame:
+        """Score the latest pushed bar as a one-row frame of output columns."""
+
+        if self.latest is None:
+            return pd.DataFrame([self.strategy._empty_result()])
+        indicators = {name: pd.Series([value]) for name, value in self.latest.items()}
+        return pd.DataFrame(self.strategy._result_columns(indicators))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "config": asdict(self.config),
+            "indicators": {name: indicator.to_dict() for name, indicator in self.indicators.items()},
+            "latest": self.latest,
+        }
+
+    @classmethod
+    def from_dict(cls, state: Mapping[str, Any]) -> LowEntryScoreV3Stream:
+        stream = cls(LowEntryScoreV3Config(**state["config"]), state["indicators"])
+        stream.latest = state.get("latest")
+        return stream
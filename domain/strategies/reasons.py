@@ -0,0 +1,35 @@
+"""Column-wise reason text shared by the Low Entry Score strategies."""
+
+from __future__ import annotations
+
+from collections.abc import Collection
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+
+def format_reasons(
+    scores: Mapping[str, pd.Series],
+    decision: pd.Series,
+    signed: Collection[str] = (),
+) -> pd.Series:
+    """Build ``"label+score；...；決策=decision"`` for every row at once.
+
+    Scores are printed with ``"+{:.0f}"``, or ``"{:+.0f}"`` for labels in
+    ``signed``. Each column only has a handful of distinct scores, so every
+    distinct value is formatted once and the pieces are joined as object
+    arrays instead of formatting row by row.
+    """
+
+    text = np.full(len(decision), "", dtype=object)
+    for label, values in scores.items():
+        template = label + ("{:+.0f}" if label in signed else "+{:.0f}") + "；"
+        text = text + _format_distinct(values, template)
+    text = text + _format_distinct(decision, "決策={}")
+    return pd.Series(text, index=decision.index).astype(str)
+
+
+def _format_distinct(values: pd.Series, template: str) -> np.ndarray:
+    codes, distinct = pd.factorize(values, use_na_sentinel=False)
+    return np.array([template.format(value) for value in distinct], dtype=object)[codes]
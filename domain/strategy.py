@@ -18,6 +18,32 @@ class Strategy(ABC):
     def run(self, data: pd.DataFrame) -> pd.DataFrame:
         """Return a copy of data with strategy output columns appended."""
 
+    def evaluate_latest(self, data: pd.DataFrame) -> dict[str, object]:
+        """Return the last run() row as a record.
+
+        Strategies override this to skip computing rows nobody reads.
+        """
+
+        result = self.run(data)
+        return result.iloc[-1].to_dict() if not result.empty else {}
+
+    def run_panel(self, data: pd.DataFrame, key: str = "stock") -> pd.DataFrame:
+        """Return the latest evaluated row for every stock in a long-format frame.
+
+        ``data`` holds one row per (stock, day) with the stock in column
+        ``key`` and each stock's rows in date order. The result is indexed by
+        stock in order of first appearance. Strategies that can evaluate many
+        stocks at once should override this per-stock fallback.
+        """
+
+        import pandas as pd
+
+        latest = {
+            stock: self.evaluate_latest(history.drop(columns=key).reset_index(drop=True))
+            for stock, history in data.groupby(key, sort=False)
+        }
+        return pd.DataFrame.from_dict(latest, orient="index")
+
 
 class StrategyRegistry:
     """Small plugin registry for built-in and externally registered strategies."""
@@ -44,7 +70,7 @@ class StrategyRegistry:
 
 
 strategy_registry = StrategyRegistry()
-_BUILTINS_LOADED = False
+_LOADED_BUILTINS: set[str] = set()
 
 _BUILTIN_STRATEGIES = {
     "low_entry_score": "domain.strategies.low_entry_score.LowEntryScoreStrategy",
@@ -52,31 +78,36 @@ _BUILTIN_STRATEGIES = {
     "low_entry_score_v3": "domain.strategies.low_entry_score_v3.LowEntryScoreV3Strategy",
 }
 
-def load_builtin_strategies(name: str) -> None:
+def load_builtin_strategies(name: str | None = None) -> None:
     """Register bundled strategies once.
 
     External plugins can call register_strategy() without importing application
-    code. Built-ins are lazily loaded to keep CLI help/imports lightweight.
+    code. Built-ins are lazily loaded to keep CLI help/imports lightweight:
+    only ``name`` is imported when given, otherwise every built-in is.
     """
 
-    global _BUILTINS_LOADED
-    if _BUILTINS_LOADED:
+    if name is None:
+        names = list(_BUILTIN_STRATEGIES)
+    elif name in _BUILTIN_STRATEGIES:
+        names = [name]
+    elif name in strategy_registry.names():
         return
-
-    strategy_path = _BUILTIN_STRATEGIES.get(name)
-    if strategy_path is None:
+    else:
         raise ValueError(f"Unknown builtin strategy: {name}")
-    
-    module_name, class_name = strategy_path.rsplit(".", 1)
-    module = __import__(
-        module_name,
-        fromlist=[class_name],
-    )
 
-    strategy_cls = getattr(module, class_name)
-    strategy_registry.register(strategy_cls(), replace=True)
+    for builtin_name in names:
+        if builtin_name in _LOADED_BUILTINS:
+            continue
+
+        module_name, class_name = _BUILTIN_STRATEGIES[builtin_name].rsplit(".", 1)
+        module = __import__(
+            module_name,
+            fromlist=[class_name],
+        )
 
-    _BUILTINS_LOADED = True
+        strategy_cls = getattr(module, class_name)
+        strategy_registry.register(strategy_cls(), replace=True)
+        _LOADED_BUILTINS.add(builtin_name)
 
 
 def register_strategy(strategy: Strategy, replace: bool = False) -> Strategy:
@@ -0,0 +1,171 @@
+"""Rate-limited concurrent fetch scheduling for TWSE requests."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from collections.abc import Generator
+from collections.abc import Iterable
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Generic
+from typing import TypeVar
+
+from config.settings import FETCH_BURST
+from config.settings import FETCH_MAX_RETRIES
+from config.settings import FETCH_RATE_PER_SECOND
+from config.settings import FETCH_RETRY_BACKOFF_SECONDS
+from config.settings import FETCH_WORKERS
+
+T = TypeVar("T")
+
+
+@dataclass
+class ThroughputReport:
+    requests: int = 0
+    retries: int = 0
+    failures: int = 0
+    elapsed_seconds: float = 0.0
+    queue_wait_seconds: float = 0.0
+
+    @property
+    def requests_per_second(self) -> float:
+        return self.requests / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    @property
+    def average_queue_wait_seconds(self) -> float:
+        return self.queue_wait_seconds / self.requests if self.requests else 0.0
+
+    def __str__(self) -> str:
+        return "requests={} retries={} failures={} elapsed={:.2f}s rate={:.2f}/s avg_queue_wait={:.2f}s".format(
+            self.requests,
+            self.retries,
+            self.failures,
+            self.elapsed_seconds,
+            self.requests_per_second,
+            self.average_queue_wait_seconds,
+        )
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing ``capacity`` requests in a burst."""
+
+    def __init__(
+        self,
+        rate_per_second: float,
+        capacity: float = 1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if rate_per_second <= 0:
+            raise ValueError("Token bucket rate must be positive.")
+        if capacity < 1:
+            raise ValueError("Token bucket capacity must be at least 1.")
+        self.rate_per_second = rate_per_second
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Block until a token is available and return the seconds waited."""
+
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate_per_second)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate_per_second
+            self._sleep(delay)
+            waited += delay
+
+
+class FetchScheduler(Generic[T]):
+    """Run fetches on a bounded worker pool behind a shared rate limit.
+
+    Results are yielded in the order the keys were given, even when later
+    keys finish first. A fetch raising ``RuntimeError`` is retried with a
+    linear backoff before the error is propagated to the caller.
+    """
+
+    def __init__(
+        self,
+        rate_per_second: float = FETCH_RATE_PER_SECOND,
+        burst: int = FETCH_BURST,
+        max_workers: int = FETCH_WORKERS,
+        max_retries: int = FETCH_MAX_RETRIES,
+        retry_backoff_seconds: float = FETCH_RETRY_BACKOFF_SECONDS,
+        bucket: TokenBucket | None = None,
+    ) -> None:
+        if max_workers < 1:
+            raise ValueError("Fetch scheduler needs at least one worker.")
+        self.bucket = bucket or TokenBucket(rate_per_second, burst)
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.last_report = ThroughputReport()
+        self._report_lock = threading.Lock()
+
+    def map_ordered(self, fetch: Callable[[str], T], keys: Iterable[str]) -> Generator[tuple[str, T], None, None]:
+        """Start fetching every key now and return an iterator of ordered results."""
+
+        keys = list(keys)
+        report = ThroughputReport()
+        self.last_report = report
+        executor = ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(keys))), thread_name_prefix="twse-fetch")
+        started = time.monotonic()
+        futures = [executor.submit(self._fetch_with_retry, fetch, key, started, report) for key in keys]
+        return self._deliver(executor, keys, futures, started, report)
+
+    def _deliver(
+        self,
+        executor: ThreadPoolExecutor,
+        keys: list[str],
+        futures: list[Future[T]],
+        started: float,
+        report: ThroughputReport,
+    ) -> Generator[tuple[str, T], None, None]:
+        try:
+            for key, future in zip(keys, futures):
+                yield key, future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            report.elapsed_seconds = time.monotonic() - started
+            logging.info("TWSE fetch throughput: %s", report)
+
+    def _fetch_with_retry(self, fetch: Callable[[str], T], key: str, submitted: float, report: ThroughputReport) -> T:
+        attempt = 0
+        while True:
+            self.bucket.acquire()
+            with self._report_lock:
+                report.requests += 1
+                if attempt == 0:
+                    report.queue_wait_seconds += time.monotonic() - submitted
+                else:
+                    report.retries += 1
+
+            try:
+                return fetch(key)
+            except RuntimeError as error:
+                if attempt >= self.max_retries:
+                    with self._report_lock:
+                        report.failures += 1
+                    raise
+                attempt += 1
+                logging.warning(
+                    "TWSE fetch for %s failed on attempt %s/%s: %s",
+                    key,
+                    attempt,
+                    self.max_retries + 1,
+                    error,
+                )
+                time.sleep(self.retry_backoff_seconds * attempt)
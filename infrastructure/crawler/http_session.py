@@ -0,0 +1,102 @@
+"""Pooled keep-alive HTTP sessions with per-request timings for TWSE calls."""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Any
+
+import requests
+from requests import Response
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.connection import HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool
+from urllib3.connectionpool import HTTPSConnectionPool
+
+
+@dataclass(frozen=True)
+class RequestTiming:
+    connect_seconds: float
+    ttfb_seconds: float
+    transfer_seconds: float
+    reused_connection: bool
+
+    @property
+    def total_seconds(self) -> float:
+        return self.connect_seconds + self.ttfb_seconds + self.transfer_seconds
+
+
+class _TimedConnectionMixin:
+    """Remember how long the last TCP/TLS connect took until it is reported."""
+
+    connect_seconds: float = 0.0
+
+    def connect(self) -> None:
+        started = time.perf_counter()
+        super().connect()  # type: ignore[misc]
+        self.connect_seconds = time.perf_counter() - started
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """Requests adapter whose pooled connections record their connect time."""
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
+
+
+def build_session(pool_size: int, verify: bool = True) -> requests.Session:
+    """Create a keep-alive session holding up to ``pool_size`` connections per host."""
+
+    session = requests.Session()
+    session.verify = verify
+    adapter = TimedHTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def timed_get(session: requests.Session, url: str, **kwargs: Any) -> tuple[Response, RequestTiming]:
+    """GET ``url`` and split its latency into connect, TTFB and body transfer."""
+
+    started = time.perf_counter()
+    response = session.get(url, stream=True, **kwargs)
+    headers_received = time.perf_counter()
+
+    connection = getattr(response.raw, "connection", None)
+    connect_seconds = getattr(connection, "connect_seconds", 0.0)
+    if connection is not None:
+        # The connection goes back to the pool; later requests reuse it for free.
+        connection.connect_seconds = 0.0
+
+    # Reading the body here is what splits transfer time from TTFB.
+    _ = response.content
+    finished = time.perf_counter()
+
+    return response, RequestTiming(
+        connect_seconds=connect_seconds,
+        ttfb_seconds=max(0.0, headers_received - started - connect_seconds),
+        transfer_seconds=finished - headers_received,
+        # Without a pooled connection there is nothing to tell a reuse from.
+        reused_connection=connection is not None and connect_seconds == 0.0,
+    )
@@ -0,0 +1,167 @@
+"""Serve every sector from a single market-wide MI_INDEX payload per date."""
+
+from __future__ import annotations
+
+import datetime
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Iterator
+from pathlib import Path
+
+from config.settings import MARKET_WIDE_STOCKTYPE
+from config.settings import SECTOR_MEMBERSHIP_MAX_AGE_DAYS
+from config.settings import SECTOR_MEMBERSHIP_PATH
+from domain.models import StockRow
+from domain.models import StockRows
+from domain.models import TwseColumns
+from infrastructure.crawler.fetch_scheduler import ThroughputReport
+from infrastructure.crawler.response_cache import CacheStats
+from infrastructure.crawler.twse_client import TwseClient
+from twse.parser import clean_cell
+
+
+class SectorMembership:
+    """Persisted, ordered list of stock numbers belonging to each sector.
+
+    Order follows the sector's own MI_INDEX listing, so legacy row-index
+    selectors keep pointing at the same stocks after partitioning.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = SECTOR_MEMBERSHIP_PATH,
+        max_age_days: int = SECTOR_MEMBERSHIP_MAX_AGE_DAYS,
+        today: Callable[[], datetime.date] = datetime.date.today,
+    ) -> None:
+        self.path = Path(path)
+        self.max_age_days = max_age_days
+        self.today = today
+        self._sectors: dict[str, dict[str, object]] | None = None
+        self._lock = threading.Lock()
+
+    def members(self, stocktype: int | str) -> list[str] | None:
+        """Return the sector's stock numbers, or None when unknown or stale."""
+
+        sector = self._load().get(str(stocktype))
+        if not sector:
+            return None
+
+        refreshed = datetime.date.fromisoformat(str(sector["refreshed"]))
+        if (self.today() - refreshed).days > self.max_age_days:
+            return None
+        return list(sector["stock_nos"])
+
+    def update(self, stocktype: int | str, stock_nos: list[str]) -> None:
+        with self._lock:
+            sectors = self._load()
+            sectors[str(stocktype)] = {"refreshed": self.today().isoformat(), "stock_nos": stock_nos}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_name("{}.{}.tmp".format(self.path.name, os.getpid()))
+            temp_path.write_text(json.dumps(sectors, ensure_ascii=False, indent=2))
+            os.replace(temp_path, self.path)
+
+    def _load(self) -> dict[str, dict[str, object]]:
+        if self._sectors is None:
+            try:
+                self._sectors = json.loads(self.path.read_text())
+            except (OSError, ValueError):
+                self._sectors = {}
+        return self._sectors
+
+
+class MarketWideTwseClient:
+    """TwseClient-compatible boundary that fetches the whole market once per date.
+
+    Each sector request is answered by looking its member stock numbers up in
+    the market-wide rows for that date. Membership is learned from one
+    sector-typed fetch and refreshed after ``SECTOR_MEMBERSHIP_MAX_AGE_DAYS``.
+    """
+
+    def __init__(
+        self,
+        twse_client: TwseClient | None = None,
+        membership: SectorMembership | None = None,
+        market_stocktype: str = MARKET_WIDE_STOCKTYPE,
+        max_cached_dates: int = 32,
+    ) -> None:
+        self._client = twse_client or TwseClient()
+        self._membership = membership or SectorMembership()
+        self.market_stocktype = market_stocktype
+        self.max_cached_dates = max_cached_dates
+        self._market_lookups: OrderedDict[str, dict[str, StockRow]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def cache_stats(self) -> CacheStats | None:
+        return self._client.cache_stats
+
+    @property
+    def throughput_report(self) -> ThroughputReport:
+        return self._client.throughput_report
+
+    def known_closed_dates(self, stocktype: int | str = MARKET_WIDE_STOCKTYPE) -> set[str]:
+        # Every sector is cut from the market-wide payload, so only its closures apply.
+        return self._client.known_closed_dates(self.market_stocktype)
+
+    def get_daily_stock_rows(self, date_time: str, stocktype: int | str) -> StockRows:
+        lookup = self._market_lookups.get(date_time)
+        if lookup is None:
+            lookup = self._remember(date_time, self._client.get_daily_stock_rows(date_time, self.market_stocktype))
+        return self._partition(date_time, stocktype, lookup)
+
+    def iter_daily_stock_rows(self, date_times: Iterable[str], stocktype: int | str) -> Iterator[tuple[str, StockRows]]:
+        date_times = list(date_times)
+        known = {date_time: self._market_lookups[date_time] for date_time in date_times if date_time in self._market_lookups}
+        missing = [date_time for date_time in date_times if date_time not in known]
+        fetched = self._client.iter_daily_stock_rows(missing, self.market_stocktype)
+
+        try:
+            for date_time in date_times:
+                lookup = known.get(date_time)
+                if lookup is None:
+                    _, rows = next(fetched)
+                    lookup = self._remember(date_time, rows)
+                yield date_time, self._partition(date_time, stocktype, lookup)
+        finally:
+            fetched.close()
+
+    def _remember(self, date_time: str, rows: StockRows) -> dict[str, StockRow]:
+        lookup: dict[str, StockRow] = {}
+        for row in rows:
+            if not isinstance(row, list) or len(row) <= TwseColumns.STOCK_NO:
+                continue
+            lookup.setdefault(clean_cell(row[TwseColumns.STOCK_NO]), row)
+
+        with self._lock:
+            self._market_lookups[date_time] = lookup
+            while len(self._market_lookups) > self.max_cached_dates:
+                self._market_lookups.popitem(last=False)
+        return lookup
+
+    def _partition(self, date_time: str, stocktype: int | str, lookup: dict[str, StockRow]) -> StockRows:
+        if not lookup:
+            return []
+
+        members = self._sector_members(date_time, stocktype)
+        return [lookup[stock_no] for stock_no in members if stock_no in lookup]
+
+    def _sector_members(self, date_time: str, stocktype: int | str) -> list[str]:
+        members = self._membership.members(stocktype)
+        if members is not None:
+            return members
+
+        sector_rows = self._client.get_daily_stock_rows(date_time, stocktype)
+        members = [
+            clean_cell(row[TwseColumns.STOCK_NO])
+            for row in sector_rows
+            if isinstance(row, list) and len(row) > TwseColumns.STOCK_NO
+        ]
+        if members:
+            logging.info("Learned %s member stocks for sector %s from %s.", len(members), stocktype, date_time)
+            self._membership.update(stocktype, members)
+        return members
@@ -0,0 +1,117 @@
+"""Persistent record of TWSE dates that returned no stock rows."""
+
+from __future__ import annotations
+
+import datetime
+import json
+import logging
+import os
+import threading
+from collections.abc import Callable
+from collections.abc import Iterable
+from pathlib import Path
+
+from config.settings import MARKET_WIDE_STOCKTYPE
+from config.settings import NEGATIVE_CACHE_CONFIRMATIONS
+from config.settings import NEGATIVE_CACHE_PATH
+
+
+class NegativeCache:
+    """Remember (date, stocktype) pairs that TWSE answered without data.
+
+    Each empty reply is recorded with the day it was observed on. A pair is
+    confirmed once it has been observed empty on ``confirm_after`` different
+    days after its own session, so unlisted holidays and typhoon closures stop
+    costing a request while one-off glitches are retried. Any later reply with
+    rows clears the pair again.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = NEGATIVE_CACHE_PATH,
+        confirm_after: int = NEGATIVE_CACHE_CONFIRMATIONS,
+        today: Callable[[], datetime.date] = datetime.date.today,
+    ) -> None:
+        self.path = Path(path)
+        self.confirm_after = max(1, confirm_after)
+        self.today = today
+        self._entries: dict[str, list[str]] | None = None
+        self._lock = threading.Lock()
+
+    def is_confirmed(self, date_time: str, stocktype: int | str) -> bool:
+        observed_on = self._load().get(self._key(date_time, stocktype), [])
+        return len(observed_on) >= self.confirm_after
+
+    def record_empty(self, date_time: str, stocktype: int | str) -> None:
+        # Today's session may simply not be published yet.
+        today = self.today()
+        if self._session_date(date_time) >= today:
+            return
+
+        with self._lock:
+            entries = self._load()
+            observed_on = entries.setdefault(self._key(date_time, stocktype), [])
+            if today.isoformat() in observed_on:
+                return
+            observed_on.append(today.isoformat())
+            if len(observed_on) == self.confirm_after:
+                logging.info("Confirmed %s as a TWSE closure for type %s.", date_time, stocktype)
+            self._save(entries)
+
+    def record_data(self, date_time: str, stocktype: int | str) -> None:
+        key = self._key(date_time, stocktype)
+        if key not in self._load():
+            return
+
+        with self._lock:
+            entries = self._load()
+            entries.pop(key, None)
+            self._save(entries)
+
+    def closed_dates(self, stocktype: int | str = MARKET_WIDE_STOCKTYPE) -> set[str]:
+        """Return YYYYMMDD dates confirmed empty for ``stocktype`` or the whole market.
+
+        One sector answering empty says nothing about the others, so only the
+        market-wide type's closures apply to every stocktype.
+        """
+
+        stocktypes = {str(stocktype), MARKET_WIDE_STOCKTYPE}
+        closed = set()
+        with self._lock:
+            for key, observed_on in self._load().items():
+                date_time, _, key_stocktype = key.partition("_")
+                if key_stocktype in stocktypes and len(observed_on) >= self.confirm_after:
+                    closed.add(date_time)
+        return closed
+
+    def _key(self, date_time: str, stocktype: int | str) -> str:
+        return "{}_{}".format(date_time, stocktype)
+
+    def _session_date(self, date_time: str) -> datetime.date:
+        return datetime.datetime.strptime(date_time, "%Y%m%d").date()
+
+    def _load(self) -> dict[str, list[str]]:
+        if self._entries is None:
+            try:
+                self._entries = json.loads(self.path.read_text())
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def _save(self, entries: dict[str, list[str]]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name("{}.{}.tmp".format(self.path.name, os.getpid()))
+        temp_path.write_text(json.dumps(entries, indent=2, sort_keys=True))
+        os.replace(temp_path, self.path)
+
+
+def write_holidays(path: str | Path, dates: Iterable[str], year: int) -> Path:
+    """Write the YYYYMMDD ``dates`` in ``year`` comma separated, like ``holidays_2026``."""
+
+    prefix = str(year)
+    year_dates = sorted({date_time.strip() for date_time in dates if date_time.strip().startswith(prefix)})
+
+    output_path = Path(path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(",".join(year_dates) + "\n")
+    return output_path
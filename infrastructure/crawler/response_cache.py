@@ -0,0 +1,261 @@
+"""Persistent on-disk cache for decoded TWSE MI_INDEX rows."""
+
+from __future__ import annotations
+
+import datetime
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import Counter
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from config.settings import RESPONSE_CACHE_DIR
+from config.settings import RESPONSE_CACHE_MAX_BYTES
+from config.settings import RESPONSE_CACHE_TODAY_TTL_SECONDS
+from domain.models import StockRows
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    expired: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ResponseCache:
+    """Content-addressed store of MI_INDEX rows keyed by (date, stocktype).
+
+    Payloads live under ``objects/`` named by the SHA-256 of their bytes, so a
+    corrupted file is detected on read. Small ``refs/`` files map each request
+    to a payload digest and remember when it was stored.
+
+    Closed sessions never change once TWSE publishes them and are served
+    forever. Today's session may still be revised, so it expires after
+    ``today_ttl_seconds``. When the payloads outgrow ``max_bytes`` the least
+    recently used entries are evicted.
+
+    Sizes, reference counts and recency are tracked in memory. The index is
+    built from disk once, on the first write, and unreferenced payloads
+    found then are deleted.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path = RESPONSE_CACHE_DIR,
+        max_bytes: int = RESPONSE_CACHE_MAX_BYTES,
+        today_ttl_seconds: float = RESPONSE_CACHE_TODAY_TTL_SECONDS,
+        clock: Callable[[], datetime.datetime] = datetime.datetime.now,
+    ) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.today_ttl_seconds = today_ttl_seconds
+        self.clock = clock
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        # Ref file name -> digest, least recently used first; None until loaded.
+        self._refs: OrderedDict[str, str] | None = None
+        self._object_sizes: dict[str, int] = {}
+        self._object_refs: Counter[str] = Counter()
+        self._total_bytes = 0
+
+    @property
+    def refs_dir(self) -> Path:
+        return self.cache_dir / "refs"
+
+    @property
+    def objects_dir(self) -> Path:
+        return self.cache_dir / "objects"
+
+    def get(self, date_time: str, stocktype: int | str) -> StockRows | None:
+        ref_path = self._ref_path(date_time, stocktype)
+        ref = self._read_ref(ref_path)
+        if ref is None:
+            self._count("misses")
+            return None
+
+        if not self._is_fresh(date_time, ref["stored_at"]):
+            self._count("expired")
+            self._count("misses")
+            return None
+
+        object_path = self._object_path(ref["digest"])
+        try:
+            payload = object_path.read_bytes()
+        except OSError:
+            self._count("misses")
+            return None
+
+        if hashlib.sha256(payload).hexdigest() != ref["digest"]:
+            logging.warning("Discarding corrupted TWSE cache entry for %s type %s.", date_time, stocktype)
+            with self._lock:
+                self._remove(ref_path)
+                if self._refs is not None and ref_path.name in self._refs:
+                    self._release(self._refs.pop(ref_path.name))
+            self._count("misses")
+            return None
+
+        # Touch the ref so the next process still sees it as recently used.
+        try:
+            os.utime(ref_path)
+        except FileNotFoundError:
+            pass
+        with self._lock:
+            if self._refs is not None and ref_path.name in self._refs:
+                self._refs.move_to_end(ref_path.name)
+            self.stats.hits += 1
+        return json.loads(payload)
+
+    def put(self, date_time: str, stocktype: int | str, rows: StockRows) -> None:
+        if not rows or not self._is_cacheable(date_time):
+            return
+
+        payload = json.dumps(rows, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        digest = hashlib.sha256(payload).hexdigest()
+        ref_path = self._ref_path(date_time, stocktype)
+
+        with self._lock:
+            refs = self._load_index()
+            if digest not in self._object_sizes:
+                object_path = self._object_path(digest)
+                if not object_path.exists():
+                    self._atomic_write(object_path, payload)
+                self._object_sizes[digest] = len(payload)
+                self._total_bytes += len(payload)
+            ref = {"date": date_time, "stocktype": str(stocktype), "digest": digest, "stored_at": self.clock().timestamp()}
+            self._atomic_write(ref_path, json.dumps(ref).encode("utf-8"))
+
+            # Take the new reference before dropping the old one, which may
+            # point at the same payload.
+            previous = refs.pop(ref_path.name, None)
+            refs[ref_path.name] = digest
+            self._object_refs[digest] += 1
+            if previous is not None:
+                self._release(previous)
+            self.stats.stores += 1
+            self._evict_if_needed()
+
+    def clear(self) -> None:
+        with self._lock:
+            for directory in (self.refs_dir, self.objects_dir):
+                if not directory.exists():
+                    continue
+                for path in directory.rglob("*.json"):
+                    self._remove(path)
+            self._refs = OrderedDict()
+            self._object_sizes.clear()
+            self._object_refs.clear()
+            self._total_bytes = 0
+
+    def size_bytes(self) -> int:
+        with self._lock:
+            self._load_index()
+            return self._total_bytes
+
+    def _is_cacheable(self, date_time: str) -> bool:
+        return self._session_date(date_time) <= self.clock().date()
+
+    def _is_fresh(self, date_time: str, stored_at: float) -> bool:
+        # Rows stored after the session day are final; rows stored on the
+        # session day itself may still be revised by TWSE.
+        if datetime.datetime.fromtimestamp(stored_at).date() > self._session_date(date_time):
+            return True
+        return self.clock().timestamp() - stored_at <= self.today_ttl_seconds
+
+    def _session_date(self, date_time: str) -> datetime.date:
+        return datetime.datetime.strptime(date_time, "%Y%m%d").date()
+
+    def _ref_path(self, date_time: str, stocktype: int | str) -> Path:
+        return self.refs_dir / "{}_{}.json".format(date_time, stocktype)
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / "{}.json".format(digest)
+
+    def _read_ref(self, ref_path: Path) -> dict[str, object] | None:
+        try:
+            return json.loads(ref_path.read_text())
+        except (OSError, ValueError):
+            return None
+
+    def _atomic_write(self, path: Path, payload: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name("{}.{}.{}.tmp".format(path.name, os.getpid(), threading.get_ident()))
+        temp_path.write_bytes(payload)
+        os.replace(temp_path, path)
+
+    def _remove(self, path: Path) -> None:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self.stats, counter, getattr(self.stats, counter) + 1)
+
+    def _load_index(self) -> OrderedDict[str, str]:
+        if self._refs is not None:
+            return self._refs
+
+        entries = []
+        if self.refs_dir.exists():
+            for ref_path in self.refs_dir.glob("*.json"):
+                try:
+                    entries.append((ref_path.stat().st_mtime, ref_path))
+                except FileNotFoundError:
+                    continue
+        entries.sort(key=lambda entry: entry[0])
+
+        refs: OrderedDict[str, str] = OrderedDict()
+        for _, ref_path in entries:
+            ref = self._read_ref(ref_path)
+            if ref is not None:
+                refs[ref_path.name] = ref["digest"]
+                self._object_refs[ref["digest"]] += 1
+
+        if self.objects_dir.exists():
+            for object_path in self.objects_dir.rglob("*.json"):
+                digest = object_path.stem
+                if digest not in self._object_refs:
+                    self._remove(object_path)
+                    continue
+                try:
+                    size = object_path.stat().st_size
+                except FileNotFoundError:
+                    continue
+                self._object_sizes[digest] = size
+                self._total_bytes += size
+
+        self._refs = refs
+        return refs
+
+    def _release(self, digest: str) -> None:
+        """Drop one reference to ``digest``; the payload goes with the last one."""
+
+        self._object_refs[digest] -= 1
+        if self._object_refs[digest] > 0:
+            return
+        del self._object_refs[digest]
+        size = self._object_sizes.pop(digest, None)
+        if size is not None:
+            self._remove(self._object_path(digest))
+            self._total_bytes -= size
+
+    def _evict_if_needed(self) -> None:
+        refs = self._load_index()
+        while self._total_bytes > self.max_bytes and refs:
+            ref_name, digest = refs.popitem(last=False)
+            self._remove(self.refs_dir / ref_name)
+            self.stats.evictions += 1
+            self._release(digest)
@@ -2,16 +2,108 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable
+from collections.abc import Iterator
+
+from config.settings import MARKET_WIDE_STOCKTYPE
+from config.settings import NEGATIVE_CACHE_ENABLED
+from config.settings import RESPONSE_CACHE_ENABLED
 from domain.models import StockRows
+from infrastructure.crawler.fetch_scheduler import FetchScheduler
+from infrastructure.crawler.fetch_scheduler import ThroughputReport
+from infrastructure.crawler.negative_cache import NegativeCache
+from infrastructure.crawler.response_cache import CacheStats
+from infrastructure.crawler.response_cache import ResponseCache
+from infrastructure.instrumentation import count
+from infrastructure.instrumentation import span
 from twstockcrawler import TwStockCrawler
 
 
 class TwseClient:
-    """Fetch TWSE rows without exposing the legacy crawler implementation."""
+    """Fetch TWSE rows without exposing the legacy crawler implementation.
+
+    Decoded rows are served from the on-disk response cache when possible so
+    closed sessions are only ever downloaded once. Cache misses for a date
+    range are fetched concurrently through a rate-limited scheduler. Dates
+    the negative cache has confirmed as closures are answered with no rows.
+    """
 
-    def __init__(self, crawler: TwStockCrawler | None = None) -> None:
+    def __init__(
+        self,
+        crawler: TwStockCrawler | None = None,
+        cache: ResponseCache | None = None,
+        scheduler: FetchScheduler[StockRows] | None = None,
+        negative_cache: NegativeCache | None = None,
+    ) -> None:
         self._crawler = crawler or TwStockCrawler()
+        if cache is None and RESPONSE_CACHE_ENABLED:
+            cache = ResponseCache()
+        self._cache = cache
+        self._scheduler = scheduler or FetchScheduler()
+        if negative_cache is None and NEGATIVE_CACHE_ENABLED:
+            negative_cache = NegativeCache()
+        self._negative_cache = negative_cache
+
+    @property
+    def cache_stats(self) -> CacheStats | None:
+        return self._cache.stats if self._cache is not None else None
+
+    @property
+    def throughput_report(self) -> ThroughputReport:
+        return self._scheduler.last_report
+
+    def known_closed_dates(self, stocktype: int | str = MARKET_WIDE_STOCKTYPE) -> set[str]:
+        return self._negative_cache.closed_dates(stocktype) if self._negative_cache is not None else set()
+
+    def get_daily_stock_rows(self, date_time: str, stocktype: int | str) -> StockRows:
+        rows = self._get_cached_rows(date_time, stocktype)
+        if rows is not None:
+            return rows
+        return self._fetch_daily_stock_rows(date_time, stocktype)
+
+    def iter_daily_stock_rows(self, date_times: Iterable[str], stocktype: int | str) -> Iterator[tuple[str, StockRows]]:
+        """Yield ``(date_time, rows)`` in the given order, fetching misses concurrently."""
+
+        date_times = list(date_times)
+        cached_rows: dict[str, StockRows] = {}
+        for date_time in date_times:
+            rows = self._get_cached_rows(date_time, stocktype)
+            if rows is not None:
+                cached_rows[date_time] = rows
+
+        fetched_rows = self._scheduler.map_ordered(
+            lambda date_time: self._fetch_daily_stock_rows(date_time, stocktype),
+            [date_time for date_time in date_times if date_time not in cached_rows],
+        )
+        try:
+            for date_time in date_times:
+                if date_time in cached_rows:
+                    yield date_time, cached_rows[date_time]
+                else:
+                    yield next(fetched_rows)
+        finally:
+            fetched_rows.close()
 
-    def get_daily_stock_rows(self, date_time: str, stocktype: int) -> StockRows:
-        return self._crawler.get_stocktype_data(date_time, stocktype)
+    def _get_cached_rows(self, date_time: str, stocktype: int | str) -> StockRows | None:
+        if self._negative_cache is not None and self._negative_cache.is_confirmed(date_time, stocktype):
+            count("negative_cache_hits")
+            return []
+        if self._cache is None:
+            return None
+        rows = self._cache.get(date_time, stocktype)
+        count("response_cache_hits" if rows is not None else "response_cache_misses")
+        return rows
 
+    def _fetch_daily_stock_rows(self, date_time: str, stocktype: int | str) -> StockRows:
+        # Runs on scheduler threads, so these spans attach to the run's root.
+        with span("twse_request", date_time):
+            rows = self._crawler.get_stocktype_data(date_time, stocktype)
+        count("twse_requests")
+        if self._cache is not None:
+            self._cache.put(date_time, stocktype, rows)
+        if self._negative_cache is not None:
+            if rows:
+                self._negative_cache.record_data(date_time, stocktype)
+            else:
+                self._negative_cache.record_empty(date_time, stocktype)
+        return rows
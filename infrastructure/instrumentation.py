@@ -0,0 +1,212 @@
+"""Nested timed spans and counters collected into a JSON run report.
+
+``record_run`` activates a recorder for the duration of one service run.
+While it is active, ``span``/``timed`` time pipeline stages and ``count``
+adds to named counters; without an active recorder both are no-ops, so
+instrumented code costs nothing outside a run.
+
+Spans with the same name and key under the same parent are merged, so a
+stage called once per stock reports its call count, total and slowest call
+instead of one entry per call. Spans opened on worker threads, where the
+current span is not inherited, attach to the run's root.
+"""
+
+from __future__ import annotations
+
+import datetime
+import functools
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import TypeVar
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+T = TypeVar("T")
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass
+class Span:
+    name: str
+    key: str | None = None
+    calls: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    children: dict[tuple[str, str | None], Span] = field(default_factory=dict)
+
+    def child(self, name: str, key: str | None) -> Span:
+        span = self.children.get((name, key))
+        if span is None:
+            span = self.children[(name, key)] = Span(name, key)
+        return span
+
+    def add(self, seconds: float) -> None:
+        self.calls += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    def to_dict(self) -> dict[str, Any]:
+        span: dict[str, Any] = {"name": self.name}
+        if self.key is not None:
+            span["key"] = self.key
+        span.update({
+            "calls": self.calls,
+            "total_seconds": round(self.total_seconds, 6),
+            "max_seconds": round(self.max_seconds, 6),
+        })
+        if self.children:
+            span["children"] = [child.to_dict() for child in self.children.values()]
+        return span
+
+
+class RunRecorder:
+    """Spans, counters and memory figures of one run."""
+
+    def __init__(self, name: str, **attributes: object) -> None:
+        self.root = Span(name)
+        self.attributes = {key: str(value) for key, value in attributes.items()}
+        self.counters: Counter[str] = Counter()
+        self.started_at = datetime.datetime.now().isoformat(timespec="seconds")
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def count(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += value
+
+    def finish(self) -> None:
+        self.root.add(time.perf_counter() - self._started)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.root.name,
+            "started_at": self.started_at,
+            "elapsed_seconds": round(self.root.total_seconds, 6),
+            "attributes": self.attributes,
+            "counters": dict(sorted(self.counters.items())),
+            "memory": memory_usage(),
+            "spans": [child.to_dict() for child in self.root.children.values()],
+        }
+
+
+_recorder: RunRecorder | None = None
+_recorder_lock = threading.Lock()
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+def current_recorder() -> RunRecorder | None:
+    return _recorder
+
+
+@contextmanager
+def record_run(name: str, **attributes: object) -> Iterator[RunRecorder]:
+    """Activate a recorder; a run nested in another one records into the outer one."""
+
+    global _recorder
+    with _recorder_lock:
+        outer = _recorder
+        recorder = outer or RunRecorder(name, **attributes)
+        _recorder = recorder
+    try:
+        yield recorder
+    finally:
+        if outer is None:
+            recorder.finish()
+            with _recorder_lock:
+                _recorder = None
+
+
+@contextmanager
+def span(name: str, key: object = None) -> Iterator[None]:
+    recorder = _recorder
+    if recorder is None:
+        yield
+        return
+
+    with recorder._lock:
+        node = (_current_span.get() or recorder.root).child(name, None if key is None else str(key))
+    token = _current_span.set(node)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        _current_span.reset(token)
+        with recorder._lock:
+            node.add(elapsed)
+
+
+def timed(name: str) -> Callable[[F], F]:
+    """Decorator form of ``span``."""
+
+    def decorate(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _recorder is None:
+                return func(*args, **kwargs)
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def timed_iter(items: Iterable[T], name: str, key: Callable[[T], object] | None = None) -> Iterator[T]:
+    """Yield ``items``, timing how long each one took to produce.
+
+    Useful for lazy fetch generators, where the wait happens inside ``next()``.
+    """
+
+    iterator = iter(items)
+    try:
+        while True:
+            started = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            recorder = _recorder
+            if recorder is not None:
+                elapsed = time.perf_counter() - started
+                with recorder._lock:
+                    parent = _current_span.get() or recorder.root
+                    parent.child(name, None if key is None else str(key(item))).add(elapsed)
+            yield item
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
+
+
+def count(name: str, value: int = 1) -> None:
+    recorder = _recorder
+    if recorder is not None:
+        recorder.count(name, value)
+
+
+def memory_usage() -> dict[str, int]:
+    """Peak resident set size of the process, plus the tracemalloc peak when tracing."""
+
+    usage: dict[str, int] = {}
+    if resource is not None:
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS bytes.
+        usage["peak_rss_bytes"] = max_rss if sys.platform == "darwin" else max_rss * 1024
+    if tracemalloc.is_tracing():
+        usage["traced_peak_bytes"] = tracemalloc.get_traced_memory()[1]
+    return usage
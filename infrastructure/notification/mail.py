@@ -1,6 +1,6 @@
 """Mail notification boundary."""
 
+from textmewhenitsdone import TextMeWhenItsDone
 from twstockcrawler import SMTPEmail
 
-__all__ = ["SMTPEmail"]
-
+__all__ = ["SMTPEmail", "TextMeWhenItsDone"]
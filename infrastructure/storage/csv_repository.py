@@ -3,13 +3,16 @@
 from __future__ import annotations
 
 import csv
+import json
 from pathlib import Path
-
-import pandas as pd
+from typing import TYPE_CHECKING
 
 from config.settings import DATA_DIR
 from domain.models import StockRows
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 class CsvRepository:
     """Owns CSV filesystem writes so application code stays storage-agnostic."""
@@ -27,9 +30,32 @@ class CsvRepository:
 
         return output_path
 
+    def stored_dates(self, file_name: str) -> set[str]:
+        """Return the YYYYMMDD dates that already have a daily CSV for file_name."""
+
+        prefix = f"{file_name}_"
+        stored: set[str] = set()
+        for path in self.output_dir.glob(f"{prefix}*.csv"):
+            scheduled_time = path.stem[len(prefix):]
+            if len(scheduled_time) == 8 and scheduled_time.isdigit():
+                stored.add(scheduled_time)
+        return stored
+
+    def read_daily_rows(self, file_name: str, scheduled_time: str) -> StockRows:
+        output_path = self.output_dir / f"{file_name}_{scheduled_time}.csv"
+
+        with output_path.open(newline="") as file:
+            return [row for row in csv.reader(file) if row]
+
     def write_analysis_dataset(self, file_name: str, dataset: pd.DataFrame) -> Path:
         self.output_dir.mkdir(parents=True, exist_ok=True)
         output_path = self.output_dir / f"{file_name}_analysis_dataset.csv"
         dataset.to_csv(output_path, index=False)
         return output_path
 
+    def write_run_report(self, file_name: str, report: dict[str, object]) -> Path:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        output_path = self.output_dir / f"{file_name}_run_report.json"
+        output_path.write_text(json.dumps(report, ensure_ascii=False, indent=2))
+        return output_path
+
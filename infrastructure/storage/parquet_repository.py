@@ -0,0 +1,229 @@
+"""Columnar Parquet storage for TWSE daily rows."""
+
+from __future__ import annotations
+
+import datetime
+import os
+from collections.abc import Iterable
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+
+from config.settings import COLUMNAR_DIR
+from config.settings import DATA_DIR
+from domain.models import StockRows
+from domain.models import TwseColumns
+from infrastructure.storage.csv_repository import CsvRepository
+from twse.parser import clean_cell
+from twse.parser import parse_price
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# (column, arrow type name) in TwseColumns order; "position" keeps each day's row order.
+DAILY_COLUMNS: tuple[tuple[str, str], ...] = (
+    ("stock_no", "string"),
+    ("stock_name", "string"),
+    ("volume", "int64"),
+    ("trade_count", "int64"),
+    ("trade_value", "int64"),
+    ("open", "float64"),
+    ("high", "float64"),
+    ("low", "float64"),
+    ("close", "float64"),
+    ("change_sign", "string"),
+    ("price_change", "float64"),
+    ("bid_price", "float64"),
+    ("bid_volume", "int64"),
+    ("ask_price", "float64"),
+    ("ask_volume", "int64"),
+    ("pe", "float64"),
+)
+
+
+def _require_pyarrow() -> tuple[Any, Any, Any, Any]:
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+    except ImportError as error:
+        raise RuntimeError("The parquet storage backend requires pyarrow; install it with 'pip install pyarrow'.") from error
+    return pa, pc, ds, pq
+
+
+class ParquetRepository:
+    """Drop-in replacement for CsvRepository backed by monthly Parquet files.
+
+    Rows for ``file_name`` live in ``{columnar_dir}/{file_name}/{YYYYMM}.parquet``
+    with typed OHLCV/PE columns. Writing a day rewrites only its month file, and
+    ``scan`` prunes months by date before pushing the stock-number and date
+    filters down into the Parquet reader.
+    """
+
+    def __init__(self, output_dir: str | Path = DATA_DIR, columnar_dir: str | Path | None = None) -> None:
+        self.output_dir = Path(output_dir)
+        self.columnar_dir = Path(columnar_dir) if columnar_dir is not None else (
+            COLUMNAR_DIR if self.output_dir == DATA_DIR else self.output_dir / "columnar"
+        )
+        self._analysis = CsvRepository(self.output_dir)
+
+    @property
+    def schema(self) -> Any:
+        pa, _, _, _ = _require_pyarrow()
+        return pa.schema(
+            [("date", pa.date32()), ("position", pa.int32())]
+            + [(name, pa.type_for_alias(type_name)) for name, type_name in DAILY_COLUMNS]
+        )
+
+    def write_daily_rows(self, file_name: str, scheduled_time: str, rows: StockRows) -> Path:
+        return self.write_many(file_name, {scheduled_time: rows})[0]
+
+    def write_many(self, file_name: str, rows_by_date: dict[str, StockRows]) -> list[Path]:
+        """Store several days at once, rewriting each touched month file once."""
+
+        by_month: dict[str, dict[str, StockRows]] = {}
+        for scheduled_time, rows in rows_by_date.items():
+            by_month.setdefault(scheduled_time[:6], {})[scheduled_time] = rows
+
+        return [self._write_month(file_name, month, days) for month, days in sorted(by_month.items())]
+
+    def stored_dates(self, file_name: str) -> set[str]:
+        _, _, _, pq = _require_pyarrow()
+
+        stored: set[str] = set()
+        for path in self._month_paths(file_name):
+            dates = pq.read_table(path, columns=["date"]).column("date").unique().to_pylist()
+            stored.update(date.strftime("%Y%m%d") for date in dates)
+        return stored
+
+    def read_daily_rows(self, file_name: str, scheduled_time: str) -> StockRows:
+        table = self._scan_table(file_name, start=scheduled_time, end=scheduled_time)
+        if table.num_rows == 0:
+            raise FileNotFoundError("No stored rows for {} at {}".format(file_name, scheduled_time))
+        return [self._to_row(record) for record in table.to_pylist()]
+
+    def scan(
+        self,
+        file_name: str,
+        stock_nos: Iterable[str] | None = None,
+        start: str | None = None,
+        end: str | None = None,
+        columns: list[str] | None = None,
+    ) -> pd.DataFrame:
+        """Load rows for ``stock_nos`` between ``start`` and ``end`` (YYYYMMDD, inclusive)."""
+
+        return self._scan_table(file_name, stock_nos, start, end, columns).to_pandas()
+
+    def write_analysis_dataset(self, file_name: str, dataset: pd.DataFrame) -> Path:
+        return self._analysis.write_analysis_dataset(file_name, dataset)
+
+    def write_run_report(self, file_name: str, report: dict[str, object]) -> Path:
+        return self._analysis.write_run_report(file_name, report)
+
+    def _scan_table(
+        self,
+        file_name: str,
+        stock_nos: Iterable[str] | None = None,
+        start: str | None = None,
+        end: str | None = None,
+        columns: list[str] | None = None,
+    ) -> Any:
+        _, _, ds, _ = _require_pyarrow()
+
+        paths = [
+            path
+            for path in self._month_paths(file_name)
+            if (start is None or path.stem >= start[:6]) and (end is None or path.stem <= end[:6])
+        ]
+        if not paths:
+            table = self.schema.empty_table()
+            return table.select(columns) if columns is not None else table
+
+        predicate = None
+        if stock_nos is not None:
+            predicate = ds.field("stock_no").isin([clean_cell(stock_no) for stock_no in stock_nos])
+        if start is not None:
+            predicate = self._and(predicate, ds.field("date") >= self._date(start))
+        if end is not None:
+            predicate = self._and(predicate, ds.field("date") <= self._date(end))
+
+        dataset = ds.dataset([str(path) for path in paths], schema=self.schema, format="parquet")
+        table = dataset.to_table(columns=columns, filter=predicate)
+        if columns is None or {"date", "position"} <= set(columns):
+            table = table.sort_by([("date", "ascending"), ("position", "ascending")])
+        return table
+
+    def _write_month(self, file_name: str, month: str, days: dict[str, StockRows]) -> Path:
+        pa, pc, _, pq = _require_pyarrow()
+
+        output_path = self.columnar_dir / file_name / "{}.parquet".format(month)
+        new_table = pa.Table.from_pylist(
+            [
+                self._to_record(scheduled_time, position, row)
+                for scheduled_time, rows in sorted(days.items())
+                for position, row in enumerate(row for row in rows if row)
+            ],
+            schema=self.schema,
+        )
+
+        if output_path.exists():
+            existing = pq.read_table(output_path, schema=self.schema)
+            replaced = pa.array([self._date(scheduled_time) for scheduled_time in days], type=pa.date32())
+            keep = pc.invert(pc.is_in(existing.column("date"), value_set=replaced))
+            new_table = pa.concat_tables([existing.filter(keep), new_table])
+
+        new_table = new_table.sort_by([("date", "ascending"), ("position", "ascending")])
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = output_path.with_name("{}.{}.tmp".format(output_path.name, os.getpid()))
+        pq.write_table(new_table, temp_path)
+        os.replace(temp_path, output_path)
+        return output_path
+
+    def _month_paths(self, file_name: str) -> list[Path]:
+        directory = self.columnar_dir / file_name
+        if not directory.exists():
+            return []
+        return sorted(path for path in directory.glob("*.parquet") if len(path.stem) == 6 and path.stem.isdigit())
+
+    def _to_record(self, scheduled_time: str, position: int, row: list[str]) -> dict[str, object]:
+        row = list(row[:TwseColumns.REQUIRED_WIDTH]) + [""] * max(0, TwseColumns.REQUIRED_WIDTH - len(row))
+        record: dict[str, object] = {"date": self._date(scheduled_time), "position": position}
+        for (name, type_name), value in zip(DAILY_COLUMNS, row):
+            if type_name == "string":
+                record[name] = clean_cell(value)
+                continue
+            number = parse_price(value)
+            record[name] = int(number) if number is not None and type_name == "int64" else number
+        return record
+
+    def _to_row(self, record: dict[str, object]) -> list[str]:
+        return ["--" if record[name] is None else str(record[name]) for name, _ in DAILY_COLUMNS]
+
+    def _date(self, scheduled_time: str) -> datetime.date:
+        return datetime.datetime.strptime(scheduled_time, "%Y%m%d").date()
+
+    def _and(self, left: Any, right: Any) -> Any:
+        return right if left is None else left & right
+
+
+def migrate_csv_to_parquet(
+    file_name: str,
+    csv_repository: CsvRepository | None = None,
+    parquet_repository: ParquetRepository | None = None,
+) -> int:
+    """Copy every stored daily CSV for ``file_name`` into the Parquet store once.
+
+    Returns the number of days migrated; days already in Parquet are skipped.
+    """
+
+    csv_repository = csv_repository or CsvRepository()
+    parquet_repository = parquet_repository or ParquetRepository(csv_repository.output_dir)
+
+    pending = sorted(csv_repository.stored_dates(file_name) - parquet_repository.stored_dates(file_name))
+    if pending:
+        parquet_repository.write_many(
+            file_name,
+            {scheduled_time: csv_repository.read_daily_rows(file_name, scheduled_time) for scheduled_time in pending},
+        )
+    return len(pending)
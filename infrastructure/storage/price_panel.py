@@ -0,0 +1,237 @@
+"""Memory-mapped dates x stocks OHLCV panel."""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Sequence
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Field name -> (dtype, strategy history column). Prices use NaN for missing
+# values; volumes have no NaN, so the ``valid`` mask marks which cells are set.
+PANEL_FIELDS: dict[str, tuple[str, str]] = {
+    "open": ("float64", "Open"),
+    "high": ("float64", "High"),
+    "low": ("float64", "Low"),
+    "close": ("float64", "Close"),
+    "volume": ("int64", "Volume"),
+    "pe": ("float64", "PE"),
+}
+
+
+class PricePanel:
+    """One contiguous ``(len(dates), len(stock_nos))`` array per OHLCV field.
+
+    A panel created with a ``path`` lives in ``{field}.npy`` files opened as
+    NumPy memory maps, so other processes can ``PricePanel.open`` the same
+    history without loading it into RAM. Per-stock series are column views of
+    those arrays; nothing is copied unless a stock has gaps in its history.
+
+    The arrays may hold more rows than ``dates``: ``advance`` slides the panel
+    onto a later window in place, so a resident process writes only the new
+    sessions instead of allocating a fresh panel every run.
+    """
+
+    META_FILE = "panel.json"
+
+    def __init__(
+        self,
+        dates: Sequence[str],
+        stock_nos: Sequence[str],
+        arrays: dict[str, np.ndarray],
+        valid: np.ndarray,
+        path: Path | None = None,
+        start: int = 0,
+    ) -> None:
+        self.dates = list(dates)
+        self.stock_nos = list(stock_nos)
+        self.path = path
+        # Full-capacity buffers; arrays and valid are views of the current rows.
+        self._buffers = arrays
+        self._valid_buffer = valid
+        self._start = start
+        self._select_rows()
+
+    @classmethod
+    def create(
+        cls,
+        dates: Sequence[str],
+        stock_nos: Sequence[str],
+        path: str | Path | None = None,
+        capacity: int = 0,
+    ) -> PricePanel:
+        """Allocate an empty panel, memory-mapped under ``path`` when given.
+
+        ``capacity`` reserves rows for sessions added later by ``advance``.
+        """
+
+        shape = (max(len(dates), capacity), len(stock_nos))
+        directory = Path(path) if path is not None else None
+        if directory is not None:
+            directory.mkdir(parents=True, exist_ok=True)
+        arrays = {name: _allocate(directory, name, dtype, shape) for name, (dtype, _) in PANEL_FIELDS.items()}
+        panel = cls(dates, stock_nos, arrays, _allocate(directory, "valid", "bool", shape), directory)
+        panel._write_meta()
+        return panel
+
+    @classmethod
+    def open(cls, path: str | Path, mode: str = "r") -> PricePanel:
+        """Map an existing panel; ``mode="r+"`` allows in-place updates."""
+
+        directory = Path(path)
+        meta = json.loads((directory / cls.META_FILE).read_text())
+        arrays = {name: np.load(directory / "{}.npy".format(name), mmap_mode=mode) for name in PANEL_FIELDS}
+        valid = np.load(directory / "valid.npy", mmap_mode=mode)
+        return cls(meta["dates"], meta["stock_nos"], arrays, valid, directory, meta.get("start", 0))
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.valid.shape
+
+    def field(self, name: str) -> np.ndarray:
+        return self.arrays[name]
+
+    def column(self, stock: int | str) -> int:
+        return stock if isinstance(stock, int) else self.stock_nos.index(stock)
+
+    def series(self, stock: int | str, name: str) -> np.ndarray:
+        """Return the field's values for one stock across every date, as a view."""
+
+        return self.arrays[name][:, self.column(stock)]
+
+    def set_values(self, column: int, dates: Sequence[str], values: dict[str, Sequence[float | None]]) -> None:
+        rows = np.fromiter((self._date_positions[date] for date in dates), dtype=np.intp, count=len(dates))
+        for name, field_values in values.items():
+            dtype = PANEL_FIELDS[name][0]
+            fill = np.nan if dtype == "float64" else 0
+            self.arrays[name][rows, column] = np.array([fill if value is None else value for value in field_values], dtype=dtype)
+        self.valid[rows, column] = True
+
+    def kernel_prices(self, name: str = "open") -> np.ndarray:
+        """The field as a (dates x stocks) input for the ``max_profit_*_panel`` kernels.
+
+        When every cell is set this is the field itself, without a copy.
+        Otherwise a copy fills each stock's gaps with its previous price and
+        its leading gap with its first price, like ``stack_price_histories``
+        pads short lists; repeated prices add no trades. Stocks without any
+        price become zeros.
+        """
+
+        values = self.arrays[name]
+        if self.valid.all():
+            return values
+
+        positions = np.where(self.valid, np.arange(len(self.dates))[:, None], -1)
+        np.maximum.accumulate(positions, axis=0, out=positions)
+        positions = np.where(positions < 0, self.valid.argmax(axis=0), positions)
+        filled = np.take_along_axis(values, positions, axis=0)
+        filled[:, ~self.valid.any(axis=0)] = 0.0
+        return filled
+
+    def history(self, stock: int | str) -> pd.DataFrame:
+        """Build the strategy input frame for one stock from the panel.
+
+        pandas copies the strided column slices into its own block, so this
+        is a copy; the profit kernels read ``kernel_prices`` instead.
+        """
+
+        column = self.column(stock)
+        valid = self.valid[:, column]
+        rows = slice(None) if valid.all() else np.flatnonzero(valid)
+        return pd.DataFrame(
+            {label: self.arrays[name][rows, column] for name, (_, label) in PANEL_FIELDS.items()},
+            copy=False,
+        )
+
+    def advance(self, dates: Sequence[str]) -> list[str] | None:
+        """Slide the panel onto ``dates`` and return the sessions it added.
+
+        ``dates`` must continue the panel: its leading sessions are the panel's
+        trailing ones, and leading panel sessions missing from it are dropped.
+        Added rows start empty. Returns None when ``dates`` does not continue
+        the panel, in which case it is left unchanged.
+        """
+
+        position = self._date_positions.get(dates[0]) if dates else None
+        kept = len(self.dates) - position if position is not None else 0
+        if self.dates and (not kept or self.dates[position:] != list(dates[:kept])):
+            return None
+
+        start = self._start + len(self.dates) - kept
+        capacity = len(self._valid_buffer)
+        if start + len(dates) > capacity:
+            if len(dates) > capacity:
+                self._grow(max(len(dates), 2 * capacity), start, kept)
+            else:
+                # Move the kept sessions to the front of the buffers.
+                for buffer in [*self._buffers.values(), self._valid_buffer]:
+                    buffer[:kept] = buffer[start:start + kept]
+            start = 0
+
+        added = slice(start + kept, start + len(dates))
+        for name, (dtype, _) in PANEL_FIELDS.items():
+            self._buffers[name][added] = _fill(dtype)
+        self._valid_buffer[added] = False
+
+        self._start = start
+        self.dates = list(dates)
+        self._select_rows()
+        self._write_meta()
+        return self.dates[kept:]
+
+    def flush(self) -> None:
+        for array in [*self._buffers.values(), self._valid_buffer]:
+            if isinstance(array, np.memmap):
+                array.flush()
+
+    def _select_rows(self) -> None:
+        rows = slice(self._start, self._start + len(self.dates))
+        self.arrays = {name: buffer[rows] for name, buffer in self._buffers.items()}
+        self.valid = self._valid_buffer[rows]
+        self._date_positions = {date: position for position, date in enumerate(self.dates)}
+
+    def _grow(self, capacity: int, start: int, kept: int) -> None:
+        shape = (capacity, len(self.stock_nos))
+        grown_buffers = {}
+        for name, buffer in {**self._buffers, "valid": self._valid_buffer}.items():
+            if self.path is None:
+                grown = _allocate(None, name, str(buffer.dtype), shape)
+                grown[:kept] = buffer[start:start + kept]
+            else:
+                # Processes that mapped the old file keep reading it until they reopen the panel.
+                final_path = self.path / "{}.npy".format(name)
+                temp_path = final_path.with_name("{}.{}.tmp".format(final_path.name, os.getpid()))
+                grown = np.lib.format.open_memmap(temp_path, mode="w+", dtype=buffer.dtype, shape=shape)
+                grown[:kept] = buffer[start:start + kept]
+                grown.flush()
+                del grown
+                os.replace(temp_path, final_path)
+                grown = np.load(final_path, mmap_mode="r+")
+            grown_buffers[name] = grown
+        self._valid_buffer = grown_buffers.pop("valid")
+        self._buffers = grown_buffers
+
+    def _write_meta(self) -> None:
+        if self.path is None:
+            return
+        meta_path = self.path / self.META_FILE
+        temp_path = meta_path.with_name("{}.{}.tmp".format(meta_path.name, os.getpid()))
+        temp_path.write_text(json.dumps({"dates": self.dates, "stock_nos": self.stock_nos, "start": self._start}))
+        os.replace(temp_path, meta_path)
+
+
+def _fill(dtype: str) -> object:
+    if dtype == "bool":
+        return False
+    return np.nan if dtype == "float64" else 0
+
+
+def _allocate(directory: Path | None, name: str, dtype: str, shape: tuple[int, int]) -> np.ndarray:
+    if directory is None:
+        return np.full(shape, _fill(dtype), dtype=dtype)
+    array = np.lib.format.open_memmap(directory / "{}.npy".format(name), mode="w+", dtype=dtype, shape=shape)
+    array[...] = _fill(dtype)
+    return array
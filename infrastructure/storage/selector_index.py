@@ -0,0 +1,99 @@
+"""Persisted legacy row-index resolutions for stocklist files."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections.abc import Iterable
+from collections.abc import Mapping
+from pathlib import Path
+
+from config.settings import SELECTOR_INDEX_PATH
+from domain.models import StockRows
+from domain.models import TwseColumns
+from twse.parser import clean_cell
+
+
+def listing_digest(rows: StockRows) -> str:
+    """Hash the sector's stock numbers in TWSE row order.
+
+    Legacy selectors are row indexes into this listing, so their resolutions
+    stay valid exactly as long as the digest does.
+    """
+
+    stock_nos = (
+        clean_cell(stock_row[TwseColumns.STOCK_NO]) if isinstance(stock_row, list) and stock_row else ""
+        for stock_row in rows
+    )
+    return hashlib.blake2b("\n".join(stock_nos).encode(), digest_size=16).hexdigest()
+
+
+class SelectorIndex:
+    """Map one stocklist file's legacy row indexes to stock numbers per stocktype.
+
+    Entries are keyed by ``"{stocktype}:{list_name}"`` and hold the listing
+    digest they were resolved against plus ``{selector: stock_no}``.
+    """
+
+    def __init__(self, list_name: str, path: str | Path = SELECTOR_INDEX_PATH) -> None:
+        self.list_name = list_name
+        self.path = Path(path)
+        self._entries: dict[str, dict[str, object]] | None = None
+        self._lock = threading.Lock()
+
+    def get(self, stocktype: int | str) -> tuple[str, dict[str, str]] | None:
+        """Return ``(listing_digest, resolutions)`` for ``stocktype``, if stored."""
+
+        entry = self._load().get(self._key(stocktype))
+        if not entry:
+            return None
+        return str(entry["listing"]), dict(entry["stock_nos"])
+
+    def update(self, stocktype: int | str, listing: str, resolutions: Mapping[str, str]) -> bool:
+        """Store ``resolutions``; a new listing digest replaces the old entry.
+
+        Returns whether the file was rewritten.
+        """
+
+        with self._lock:
+            entries = self._load()
+            key = self._key(stocktype)
+            entry = entries.get(key)
+            stock_nos = dict(entry["stock_nos"]) if entry and entry["listing"] == listing else {}
+            stock_nos.update(resolutions)
+            if entry and entry["listing"] == listing and entry["stock_nos"] == stock_nos:
+                return False
+
+            entries[key] = {"listing": listing, "stock_nos": stock_nos}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_name("{}.{}.tmp".format(self.path.name, os.getpid()))
+            temp_path.write_text(json.dumps(entries, ensure_ascii=False, indent=2, sort_keys=True))
+            os.replace(temp_path, self.path)
+            return True
+
+    def _key(self, stocktype: int | str) -> str:
+        return "{}:{}".format(stocktype, self.list_name)
+
+    def _load(self) -> dict[str, dict[str, object]]:
+        if self._entries is None:
+            try:
+                self._entries = json.loads(self.path.read_text())
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+
+def rewrite_stocklist(path: str | Path, selectors: Iterable[str], stock_nos: Iterable[str | None]) -> Path:
+    """Rewrite a semicolon-separated stocklist with resolved stock numbers.
+
+    Selectors that were never resolved are kept as they were.
+    """
+
+    output_path = Path(path)
+    resolved = [stock_no or str(selector).strip() for selector, stock_no in zip(selectors, stock_nos)]
+    output_path.write_text(";".join(resolved) + "\n")
+    logging.info("Rewrote %s with %s stock numbers.", output_path, len(resolved))
+    return output_path
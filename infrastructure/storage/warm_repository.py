@@ -0,0 +1,76 @@
+"""In-memory layer over a daily-row repository for long-running processes."""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+
+from domain.models import StockRows
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class WarmRepository:
+    """Keep every daily rows block read or written in memory.
+
+    Incremental runs read the stored days of a window again on every run.
+    In a resident process this repository answers those reads from memory
+    after the first load, so a warm run only touches storage for the new
+    session. Writes go through to the wrapped repository first.
+
+    Rows are shared between runs, so callers must not modify them. Files
+    written by other processes after the first load are not seen.
+    """
+
+    def __init__(self, repository: Any) -> None:
+        self.repository = repository
+        self.output_dir: Path = repository.output_dir
+        self._dates: dict[str, set[str]] = {}
+        self._rows: dict[tuple[str, str], StockRows] = {}
+        self._lock = threading.Lock()
+
+    def __reduce__(self) -> tuple[type[WarmRepository], tuple[Any]]:
+        # Batch workers get an empty wrapper around the same storage.
+        return type(self), (self.repository,)
+
+    def write_daily_rows(self, file_name: str, scheduled_time: str, rows: StockRows) -> Path:
+        output_path = self.repository.write_daily_rows(file_name, scheduled_time, rows)
+        with self._lock:
+            self._rows[(file_name, scheduled_time)] = [row for row in rows if row]
+            if file_name in self._dates:
+                self._dates[file_name].add(scheduled_time)
+        return output_path
+
+    def stored_dates(self, file_name: str) -> set[str]:
+        with self._lock:
+            dates = self._dates.get(file_name)
+            if dates is None:
+                dates = self._dates[file_name] = set(self.repository.stored_dates(file_name))
+            return set(dates)
+
+    def read_daily_rows(self, file_name: str, scheduled_time: str) -> StockRows:
+        key = (file_name, scheduled_time)
+        rows = self._rows.get(key)
+        if rows is None:
+            rows = self.repository.read_daily_rows(file_name, scheduled_time)
+            with self._lock:
+                self._rows[key] = rows
+        return rows
+
+    def write_analysis_dataset(self, file_name: str, dataset: pd.DataFrame) -> Path:
+        return self.repository.write_analysis_dataset(file_name, dataset)
+
+    def write_run_report(self, file_name: str, report: dict[str, object]) -> Path:
+        return self.repository.write_run_report(file_name, report)
+
+    def forget_before(self, scheduled_time: str) -> int:
+        """Drop rows of days before ``scheduled_time`` (YYYYMMDD) from memory."""
+
+        with self._lock:
+            stale = [key for key in self._rows if key[1] < scheduled_time]
+            for key in stale:
+                del self._rows[key]
+        return len(stale)
@@ -3,10 +3,23 @@
 from __future__ import annotations
 
 import argparse
+import dataclasses
+import datetime
+import json
+import sys
+from collections.abc import Callable
 from pathlib import Path
+from typing import Any
 
 from application.stock_service import StockAnalysisRequest
 from application.stock_service import StockAnalysisService
+from config.settings import BATCH_WORKERS
+from config.settings import PROFILE_MODES
+from config.settings import PROFILE_TOP_N
+from config.settings import SERVE_RUN_AT
+from config.settings import SERVE_WORKERS
+from config.settings import STORAGE_BACKEND
+from config.settings import STORAGE_BACKENDS
 from domain.models import Stocktype
 
 
@@ -40,8 +53,7 @@ def create_parser() -> argparse.ArgumentParser:
         "--output_file_names",
         default="SHIRONG",
         type=str,
-        choices=["SHIRONG", "shirong"],
-        help="Output file name prefix.",
+        help="Output file name prefix; give each job its own so their outputs do not collide.",
     )
     parser.add_argument(
         "-e",
@@ -90,10 +102,115 @@ def create_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Send email to recipients.",
     )
+    parser.add_argument(
+        "-w",
+        "--market-wide",
+        action="store_true",
+        help="Fetch the whole market once per date and partition it into the chosen sector.",
+    )
+    parser.add_argument(
+        "-i",
+        "--incremental",
+        action="store_true",
+        help="Load dates already stored under data/ and fetch only the missing ones.",
+    )
+    parser.add_argument(
+        "--write-holidays",
+        dest="holidays_output",
+        default=None,
+        type=str,
+        help="Write the holidays plus market-wide TWSE closures confirmed by earlier runs to this file.",
+    )
+    parser.add_argument(
+        "--storage",
+        default=STORAGE_BACKEND,
+        choices=STORAGE_BACKENDS,
+        help="Daily row storage: one CSV per day, or monthly Parquet files under data/columnar.",
+    )
+    parser.add_argument(
+        "--migrate-csv",
+        dest="migrate_storage",
+        action="store_true",
+        help="Copy existing daily CSV files into the Parquet store before running.",
+    )
+    parser.add_argument(
+        "--panel",
+        action="store_true",
+        help="Keep the crawled history in a memory-mapped price panel under data/panel.",
+    )
+    parser.add_argument(
+        "--rewrite-stocklist",
+        action="store_true",
+        help="Replace the legacy row indexes in the stocklist file with the stock numbers they resolved to.",
+    )
+    add_profile_arguments(parser)
+
+    return parser
+
+
+def create_batch_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="main.py batch")
+
+    parser.add_argument(
+        "config",
+        type=str,
+        help="JSON file with shared \"defaults\" and a list of sector \"jobs\".",
+    )
+    parser.add_argument(
+        "--workers",
+        default=BATCH_WORKERS,
+        type=int,
+        help="Worker processes for the per-sector analysis stages; 1 runs everything in this process.",
+    )
+    add_profile_arguments(parser)
+
+    return parser
+
+
+def create_serve_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="main.py serve")
+
+    parser.add_argument(
+        "config",
+        type=str,
+        help="Batch config whose jobs run after every TWSE trading session.",
+    )
+    parser.add_argument(
+        "--workers",
+        default=SERVE_WORKERS,
+        type=int,
+        help="Worker processes for the analysis stages; workers start cold on every run.",
+    )
+    parser.add_argument(
+        "--run-at",
+        default=SERVE_RUN_AT,
+        type=str,
+        help="Taipei time (HH:MM) at which each session is collected.",
+    )
+    parser.add_argument(
+        "--now",
+        action="store_true",
+        help="Run the latest closed session at startup instead of waiting for the next one.",
+    )
 
     return parser
 
 
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--profile",
+        default=None,
+        choices=PROFILE_MODES,
+        help="Profile the run with cProfile (cpu), tracemalloc (mem) or both; results go to data/profiles.",
+    )
+    parser.add_argument(
+        "--profile-top",
+        default=PROFILE_TOP_N,
+        type=int,
+        help="Functions or allocation sites listed in the profile summaries.",
+    )
+
+
 def load_stocklist(values: list[str]) -> list[str]:
     if len(values) == 1 and Path(values[0]).exists():
         with open(values[0]) as output_list_file:
@@ -102,6 +219,12 @@ def load_stocklist(values: list[str]) -> list[str]:
     return [stock.strip() for stock in values if stock.strip()]
 
 
+def stocklist_file(values: list[str]) -> str | None:
+    if len(values) == 1 and Path(values[0]).exists():
+        return values[0]
+    return None
+
+
 def load_holidays(values: list[str]) -> list[str]:
     if len(values) == 1 and Path(values[0]).exists():
         with open(values[0]) as output_list_file:
@@ -111,9 +234,10 @@ def load_holidays(values: list[str]) -> list[str]:
 
 
 def build_request(argv: list[str] | None = None) -> StockAnalysisRequest:
-    parser = create_parser()
-    args = parser.parse_args(argv)
+    return request_from_args(create_parser().parse_args(argv))
+
 
+def request_from_args(args: argparse.Namespace) -> StockAnalysisRequest:
     return StockAnalysisRequest(
         stocklist=load_stocklist(args.stocklist),
         holidays=load_holidays(args.holidays),
@@ -126,9 +250,136 @@ def build_request(argv: list[str] | None = None) -> StockAnalysisRequest:
         linechart=args.linechart,
         period=args.period,
         mail=args.mail,
+        market_wide=args.market_wide,
+        incremental=args.incremental,
+        holidays_output=args.holidays_output,
+        storage=args.storage,
+        migrate_storage=args.migrate_storage,
+        panel=args.panel,
+        stocklist_file=stocklist_file(args.stocklist),
+        rewrite_stocklist=args.rewrite_stocklist,
+    )
+
+
+def build_batch_requests(config_path: str | Path) -> list[StockAnalysisRequest]:
+    """Turn a batch config into one request per job.
+
+    Each job overrides ``defaults``. Keys are ``StockAnalysisRequest`` field
+    names, plus ``type`` for the stocktype name. ``stocklist`` and ``holidays``
+    take a list or a file path; relative paths are resolved against the
+    config file's directory. Every job needs its own ``output_file_names``.
+    """
+
+    config_path = Path(config_path)
+    config = json.loads(config_path.read_text())
+    defaults = config.get("defaults", {})
+    requests = [build_job_request({**defaults, **job}, config_path.parent) for job in config["jobs"]]
+
+    # The prefix names every stored day, dataset, report and panel of a job.
+    # Compared case-insensitively because data/ may live on such a filesystem.
+    prefixes: set[str] = set()
+    for request in requests:
+        prefix = request.output_file_names.casefold()
+        if prefix in prefixes:
+            raise ValueError(
+                "Batch jobs share the output prefix '{}'; give each job its own output_file_names.".format(
+                    request.output_file_names
+                )
+            )
+        prefixes.add(prefix)
+    return requests
+
+
+def build_job_request(job: dict[str, Any], base_dir: Path) -> StockAnalysisRequest:
+    job = dict(job)
+
+    def values(key: str) -> list[str]:
+        value = job.pop(key)
+        if isinstance(value, list):
+            return [str(item) for item in value]
+        path = base_dir / value
+        return [str(path) if path.exists() else value]
+
+    stocktype = Stocktype[job.pop("type", "ELEC")]
+    stocklist = values("stocklist")
+    holidays = values("holidays")
+    fields = {field.name for field in dataclasses.fields(StockAnalysisRequest)}
+    unknown = sorted(set(job) - fields)
+    if unknown:
+        raise ValueError("Unknown batch job keys: {}".format(", ".join(unknown)))
+
+    return StockAnalysisRequest(
+        stocklist=load_stocklist(stocklist),
+        holidays=load_holidays(holidays),
+        stocktype=stocktype,
+        stocklist_file=stocklist_file(stocklist),
+        **{"output_file_names": "SHIRONG", "endbacktrack": 10, **job},
+    )
+
+
+def profile_name(request: StockAnalysisRequest, today: datetime.date | None = None) -> str:
+    """``{stocktype}_{prefix}_{first}-{last}``, the first and last sessions the run schedules."""
+
+    from twse.trading_calendar import trading_calendar
+
+    today = today or datetime.date.today()
+    start = today - datetime.timedelta(days=request.endbacktrack)
+    end = today - datetime.timedelta(days=request.beginbacktrack + 1)
+    # Same window as TwseCrawker.scheduled_dates, so weekends and holidays at its edges drop out.
+    sessions = trading_calendar(request.holidays).sessions_between(start, end)
+    first, last = (sessions[0], sessions[-1]) if sessions else (start, end)
+    stocktype = getattr(request.stocktype, "name", request.stocktype)
+    return "{}_{}_{:%Y%m%d}-{:%Y%m%d}".format(stocktype, request.output_file_names, first, last)
+
+
+def run_profiled(mode: str | None, name: str, top: int, run: Callable[[], object]) -> None:
+    if mode is None:
+        run()
+        return
+
+    from infrastructure.profiling import profile_run
+
+    with profile_run(mode, name, top=top):
+        # Keep the run's result alive so the memory snapshot still sees it.
+        result = run()
+    del result
+
+
+def serve(args: argparse.Namespace) -> None:
+    import logging
+    import signal
+    import threading
+
+    from application.daemon import MarketCloseScheduler
+    from application.daemon import StockAnalysisDaemon
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    requests = build_batch_requests(args.config)
+    scheduler = MarketCloseScheduler(
+        holidays={holiday for request in requests for holiday in request.holidays}, run_at=args.run_at
     )
+    daemon = StockAnalysisDaemon(StockAnalysisService(keep_warm=True), requests, scheduler, workers=args.workers)
+
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop.set())
+    daemon.serve(stop, run_now=args.now)
 
 
 def main(argv: list[str] | None = None) -> None:
-    request = build_request(argv)
-    StockAnalysisService().run(request)
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["serve"]:
+        serve(create_serve_parser().parse_args(argv[1:]))
+        return
+    if argv[:1] == ["batch"]:
+        args = create_batch_parser().parse_args(argv[1:])
+        requests = build_batch_requests(args.config)
+        name = "batch_{}_{:%Y%m%d}".format(Path(args.config).stem, datetime.date.today())
+        service = StockAnalysisService()
+        run_profiled(args.profile, name, args.profile_top, lambda: service.run_batch(requests, workers=args.workers))
+        return
+
+    args = create_parser().parse_args(argv)
+    request = request_from_args(args)
+    service = StockAnalysisService()
+    run_profiled(args.profile, profile_name(request), args.profile_top, lambda: service.run(request))
@@ -0,0 +1,45 @@
+# Sourced by the run scripts after they set SCRIPT_DIR: loads .env (or
+# .env.example) and sets PYTHON_BIN to an interpreter with the dependencies.
+
+VENV_PYTHON="$SCRIPT_DIR/.venv/bin/python"
+
+if [ -f "$SCRIPT_DIR/.env" ]; then
+  ENV_FILE="$SCRIPT_DIR/.env"
+elif [ -f "$SCRIPT_DIR/.env.example" ]; then
+  ENV_FILE="$SCRIPT_DIR/.env.example"
+else
+  ENV_FILE=""
+fi
+
+if [ -n "$ENV_FILE" ]; then
+  set -a
+  . "$ENV_FILE"
+  set +a
+  echo "Loaded environment variables from $ENV_FILE"
+fi
+
+# Locate the dependencies without importing them; importing pandas and
+# matplotlib here would add about a second to every run.
+DEPENDENCY_CHECK="import importlib.util, sys; sys.exit(any(importlib.util.find_spec(name) is None for name in ('requests', 'pandas', 'tabulate', 'xlsxwriter', 'matplotlib')))"
+
+if [ -n "${PYTHON:-}" ]; then
+  PYTHON_BIN="${PYTHON:-python3}"
+elif python3 -c "$DEPENDENCY_CHECK" >/dev/null 2>&1; then
+  PYTHON_BIN="python3"
+elif [ -x "$VENV_PYTHON" ]; then
+  PYTHON_BIN="$VENV_PYTHON"
+else
+  PYTHON_BIN="python3"
+fi
+
+if ! "$PYTHON_BIN" -c "$DEPENDENCY_CHECK" >/dev/null 2>&1; then
+  echo "Missing Python dependencies for $(basename -- "$0")." >&2
+  if [ -x "$VENV_PYTHON" ]; then
+    echo "Install them with: $VENV_PYTHON -m pip install -r \"$SCRIPT_DIR/requirements.txt\"" >&2
+  else
+    echo "Create a local virtualenv and install requirements:" >&2
+    echo "  python3 -m venv \"$SCRIPT_DIR/.venv\"" >&2
+    echo "  \"$SCRIPT_DIR/.venv/bin/python\" -m pip install -r \"$SCRIPT_DIR/requirements.txt\"" >&2
+  fi
+  exit 1
+fi
@@ -12,13 +12,17 @@ This script is designed to help streamline models, by taking the Taiwan Stock Ex
 
 import argparse
 import html
-import pandas as pd
+import numpy as np
 import enum
 import time
 import datetime
 import logging
-from tabulate import tabulate
+from collections.abc import Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
 
+from config.settings import MAX_TRANSACTIONS
 from domain.models import Stocktype
 from domain.models import Ohlc
 from domain.models import ProfitRow
@@ -29,20 +33,40 @@ from domain.models import StockRows
 from domain.models import TWSEStock
 from domain.models import TwseColumns
 from domain.services import compute_signal_features
-from domain.services import max_profit
-from domain.services import max_profit_k_transactions
-from domain.services import max_profit_unlimited
-from domain.services import max_profit_with_fee
+from domain.services import max_profit_k_transactions_panel
+from domain.services import max_profit_k_transactions_trades
+from domain.services import max_profit_panel
+from domain.services import max_profit_unlimited_panel
+from domain.services import max_profit_with_fee_panel
+from domain.services import stack_price_histories
 from domain.strategy import get_strategy
-from domain.strategies.low_entry_score_v3 import LOW_ENTRY_OUTPUT_COLUMNS
-from domain.strategies.low_entry_score_v3 import LOW_ENTRY_STRATEGY_NAME
-from infrastructure.report.html_renderer import RendererFactory
 from infrastructure.crawler.twse_client import TwseClient
+from infrastructure.instrumentation import count
+from infrastructure.instrumentation import span
+from infrastructure.instrumentation import timed
+from infrastructure.instrumentation import timed_iter
 from infrastructure.notification.mail import SMTPEmail
+from infrastructure.notification.mail import TextMeWhenItsDone
 from infrastructure.storage.chart_repository import save_profit_ratio_chart
 from infrastructure.storage.csv_repository import CsvRepository
+from infrastructure.storage.selector_index import SelectorIndex
+from infrastructure.storage.selector_index import listing_digest
+from twse.parser import ParsedRows
 from twse.parser import clean_cell
 from twse.parser import parse_price
+from twse.parser import parse_stock_rows
+from twse.streaming import load_states
+from twse.streaming import save_states
+from twse.trading_calendar import days_between
+from twse.trading_calendar import trading_calendar
+
+# pandas, tabulate, the strategies and the HTML renderer are imported by the
+# stages that use them, so the CLI and the crawl stage start without them.
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from infrastructure.storage.parquet_repository import ParquetRepository
+    from infrastructure.storage.price_panel import PricePanel
 
 
 class QUERY(enum.Enum):
@@ -58,11 +82,16 @@ class TwseCrawker():
         self,
         stocklistsize: int,
         twse_client: TwseClient | None = None,
-        csv_repository: CsvRepository | None = None,
+        csv_repository: CsvRepository | ParquetRepository | None = None,
+        selector_index: SelectorIndex | None = None,
     ) -> None:
         self.stocklistsize: int = stocklistsize
         self.twse_client = twse_client or TwseClient()
         self.csv_repository = csv_repository or CsvRepository()
+        self.selector_index = selector_index
+        self.indexed_slots: set[int] = set()
+        self.listing_digest: str | None = None
+        self.listing_checked: bool = False
         self.daily_stocks: list[list[float]] = [[] for _ in range(self.stocklistsize)]
         self.stocknumbers: list[str] = ['' for _ in range(self.stocklistsize)]
         self.stocknames: list[str] = ['' for _ in range(self.stocklistsize)]
@@ -73,10 +102,36 @@ class TwseCrawker():
         self.daily_closes: list[list[float]] = [[] for _ in range(self.stocklistsize)]
         self.daily_volumes: list[list[float]] = [[] for _ in range(self.stocklistsize)]
         self.daily_pe_ratios: list[list[float | None]] = [[] for _ in range(self.stocklistsize)]
+        self.daily_dates: list[list[str]] = [[] for _ in range(self.stocklistsize)]
+        self.price_panel: PricePanel | None = None
+        # Set for incremental runs: Low Entry v3 stream states resume from here.
+        self.strategy_state_path: Path | None = None
+        self.strategy_streams: dict[str, dict[str, Any]] | None = None
         self.iso_scheduled_times: list[str] = list()
         self.transactiondays: int = 0
 
 
+    def __getstate__(self) -> dict[str, object]:
+        # Batch workers only run the analysis stages, so network clients and
+        # index files stay with the parent; mapped panels are reopened by path.
+        state = self.__dict__.copy()
+        state["twse_client"] = None
+        state["selector_index"] = None
+        # Workers reload stream states from strategy_state_path.
+        state["strategy_streams"] = None
+        if self.price_panel is not None and self.price_panel.path is not None:
+            state["price_panel"] = self.price_panel.path
+        return state
+
+
+    def __setstate__(self, state: dict[str, object]) -> None:
+        self.__dict__.update(state)
+        if isinstance(self.price_panel, Path):
+            from infrastructure.storage.price_panel import PricePanel
+
+            self.price_panel = PricePanel.open(self.price_panel)
+
+
     def __del__(self) -> None:
         self.daily_stocks = [[] for _ in range(self.stocklistsize)]
         self.iso_scheduled_times = list()
@@ -88,12 +143,8 @@ class TwseCrawker():
         self.daily_closes = [[] for _ in range(self.stocklistsize)]
         self.daily_volumes = [[] for _ in range(self.stocklistsize)]
         self.daily_pe_ratios = [[] for _ in range(self.stocklistsize)]
-
-
-    def clean_data(self, row: StockRow) -> StockRow:
-        for index, content in enumerate(row):
-            row[index] = clean_cell(content)
-        return row
+        self.daily_dates = [[] for _ in range(self.stocklistsize)]
+        self.price_panel = None
 
 
     def parse_price(self, price: object) -> float | None:
@@ -153,26 +204,36 @@ class TwseCrawker():
         return stock_row
 
 
-    def build_stock_lookup(self, rows: StockRows, scheduled_time: str) -> dict[str, StockRow]:
-        stock_lookup: dict[str, StockRow] = {}
-
-        for row_index, stock_row in enumerate(rows):
-            if not self.validate_twse_row_schema(stock_row, scheduled_time, "index {}".format(row_index)):
-                continue
+    @timed("parse_rows")
+    def index_stock_rows(self, rows: StockRows, scheduled_time: str) -> tuple[ParsedRows, dict[str, int]]:
+        # One columnar pass validates and casts the whole block instead of cleaning cells
+        # row by row; stock days are then read from its column arrays by row index.
+        parsed = parse_stock_rows(rows)
+        first_indices = parsed.first_indices()
+        count("rows_parsed", len(parsed))
 
-            stock_no = clean_cell(stock_row[TwseColumns.STOCK_NO])
-            if stock_no in stock_lookup:
-                logging.warning(
-                    "Duplicate TWSE stock number %s at %s; keeping the first row and skipping duplicate index %s.",
-                    stock_no,
-                    scheduled_time,
-                    row_index,
-                )
-                continue
+        invalid = np.flatnonzero(~parsed.valid)
+        if invalid.size:
+            count("rows_rejected", int(invalid.size))
+            logging.warning(
+                "Skipping %s TWSE rows at %s that failed schema validation (not a list, fewer than %s columns, or missing stock identity); first at index %s: %s",
+                invalid.size,
+                scheduled_time,
+                TwseColumns.REQUIRED_WIDTH,
+                invalid[0],
+                rows[invalid[0]],
+            )
 
-            stock_lookup[stock_no] = stock_row
+        duplicates = int(parsed.valid.sum()) - len(first_indices)
+        if duplicates:
+            count("rows_duplicate", duplicates)
+            logging.warning(
+                "Skipping %s duplicate TWSE stock numbers at %s; keeping the first row of each.",
+                duplicates,
+                scheduled_time,
+            )
 
-        return stock_lookup
+        return parsed, first_indices
 
 
     def parse_selector_as_index(self, selector: StockSelector) -> int | None:
@@ -182,31 +243,32 @@ class TwseCrawker():
         return int(selector_text)
 
 
-    def resolve_stock_row(
+    def resolve_row_index(
         self,
-        rows: StockRows,
-        stock_lookup: dict[str, StockRow],
+        parsed: ParsedRows,
+        stock_index: dict[str, int],
         selector: StockSelector,
         item: int,
         scheduled_time: str,
-    ) -> StockRow | None:
+        allow_index: bool = True,
+    ) -> int | None:
         tracked_stock_no = self.tracked_stock_numbers[item]
         if tracked_stock_no:
-            stock_row = stock_lookup.get(tracked_stock_no)
-            if stock_row is None:
+            row_index = stock_index.get(tracked_stock_no)
+            if row_index is None:
                 logging.warning(
                     "Skipping tracked stock %s at %s because it is missing from the TWSE response.",
                     tracked_stock_no,
                     scheduled_time,
                 )
-            return stock_row
+            return row_index
 
         selector_text = str(selector).strip()
-        stock_row = stock_lookup.get(selector_text)
-        if stock_row is not None:
+        row_index = stock_index.get(selector_text)
+        if row_index is not None:
             self.tracked_stock_numbers[item] = selector_text
             logging.info("Tracking stock %s from stock-number selector at %s.", selector_text, scheduled_time)
-            return stock_row
+            return row_index
 
         if selector_text.isdigit() and selector_text != str(int(selector_text)):
             logging.warning(
@@ -216,8 +278,12 @@ class TwseCrawker():
             )
             return None
 
-        stock_index = self.parse_selector_as_index(selector)
-        if stock_index is None:
+        if not allow_index:
+            # Stored CSVs only hold the tracked rows, so row indices mean nothing there.
+            return None
+
+        row_index = self.parse_selector_as_index(selector)
+        if row_index is None:
             logging.warning(
                 "Skipping selector %s at %s because it is neither a TWSE stock number nor a legacy row index.",
                 selector,
@@ -225,59 +291,26 @@ class TwseCrawker():
             )
             return None
 
-        stock_row = self.get_stock_row(rows, stock_index, scheduled_time)
-        if stock_row is None:
+        if self.get_stock_row(parsed.rows, row_index, scheduled_time) is None:
             return None
 
-        resolved_stock_no = clean_cell(stock_row[TwseColumns.STOCK_NO])
+        resolved_stock_no = parsed.stock_no[row_index]
         self.tracked_stock_numbers[item] = resolved_stock_no
         logging.info(
             "Resolved legacy row index %s to stock %s at %s; future dates will use stock-number lookup.",
-            stock_index,
+            row_index,
             resolved_stock_no,
             scheduled_time,
         )
-        return stock_row
+        return row_index
 
 
-    def build_record_row(self, stock_row: StockRow) -> StockRow:
-        normalized_row = list(stock_row[:TwseColumns.REQUIRED_WIDTH]) + [""] * max(0, TwseColumns.REQUIRED_WIDTH - len(stock_row))
-        return self.clean_data([
-                normalized_row[TwseColumns.STOCK_NO], # Stock number
-                normalized_row[TwseColumns.NAME], # Stock name
-                normalized_row[TwseColumns.VOLUME], # Trade volume
-                normalized_row[TwseColumns.TRADE_COUNT], # Trade count
-                normalized_row[TwseColumns.TRADE_VALUE], # Trade value
-                normalized_row[TwseColumns.OPEN], # Stock opening price
-                normalized_row[TwseColumns.HIGH], # Stock price high
-                normalized_row[TwseColumns.LOW], # Stock price low
-                normalized_row[TwseColumns.CLOSE], # Stock close price
-                normalized_row[TwseColumns.CHANGE_SIGN], # Change sign
-                normalized_row[TwseColumns.PRICE_CHANGE], # Price change
-                normalized_row[TwseColumns.BID_PRICE], # Bid price
-                normalized_row[TwseColumns.BID_VOLUME], # Bid volume
-                normalized_row[TwseColumns.ASK_PRICE], # Ask price
-                normalized_row[TwseColumns.ASK_VOLUME], # Ask volume
-                normalized_row[TwseColumns.PE], # Pe ratio
-                ])
-
-
-    def parse_twse_stock(self, stock_row: StockRow, scheduled_time: str) -> TWSEStock | None:
-        if not self.validate_twse_row_schema(stock_row, scheduled_time, "stock row"):
-            return None
-
-        stock_no = clean_cell(stock_row[TwseColumns.STOCK_NO])
-        stock_name = clean_cell(stock_row[TwseColumns.NAME])
-        open_price = self.parse_price(stock_row[TwseColumns.OPEN])
-        high_price = self.parse_price(stock_row[TwseColumns.HIGH])
-        low_price = self.parse_price(stock_row[TwseColumns.LOW])
-        close_price = self.parse_price(stock_row[TwseColumns.CLOSE])
-        volume = self.parse_price(stock_row[TwseColumns.VOLUME])
-        pe_ratio = self.parse_price(stock_row[TwseColumns.PE])
-
-        if None in (open_price, high_price, low_price, close_price):
+    def build_twse_stock(self, parsed: ParsedRows, row_index: int, scheduled_time: str) -> TWSEStock | None:
+        # The block was validated and cast column by column, so the row is only indexed here.
+        if not parsed.has_ohlc[row_index]:
+            stock_row = parsed.rows[row_index]
             warning_key = (
-                stock_no,
+                parsed.stock_no[row_index],
                 scheduled_time,
                 stock_row[TwseColumns.OPEN],
                 stock_row[TwseColumns.HIGH],
@@ -287,7 +320,7 @@ class TwseCrawker():
             if warning_key not in TwseCrawker._logged_missing_price_warnings:
                 logging.warning(
                     "Skipping stock %s at %s because OHLC data is unavailable: open=%s high=%s low=%s close=%s",
-                    stock_no,
+                    parsed.stock_no[row_index],
                     scheduled_time,
                     stock_row[TwseColumns.OPEN],
                     stock_row[TwseColumns.HIGH],
@@ -297,20 +330,25 @@ class TwseCrawker():
                 TwseCrawker._logged_missing_price_warnings.add(warning_key)
             return None
 
+        volume = parsed.numeric("volume")[row_index]
+        pe_ratio = parsed.numeric("pe")[row_index]
         return TWSEStock(
-            stock_no=stock_no,
-            stock_name=stock_name,
-            open=open_price,
-            high=high_price,
-            low=low_price,
-            close=close_price,
-            volume=int(volume) if volume is not None else 0,
-            pe=pe_ratio,
+            stock_no=parsed.stock_no[row_index],
+            stock_name=parsed.stock_name[row_index],
+            open=float(parsed.numeric("open")[row_index]),
+            high=float(parsed.numeric("high")[row_index]),
+            low=float(parsed.numeric("low")[row_index]),
+            close=float(parsed.numeric("close")[row_index]),
+            volume=0 if np.isnan(volume) else int(volume),
+            pe=None if np.isnan(pe_ratio) else float(pe_ratio),
         )
 
 
     def parse_stock_row_ohlc(self, stock_row: StockRow, scheduled_time: str) -> Ohlc | None:
-        twse_stock = self.parse_twse_stock(stock_row, scheduled_time)
+        if not self.validate_twse_row_schema(stock_row, scheduled_time, "stock row"):
+            return None
+
+        twse_stock = self.build_twse_stock(parse_stock_rows([stock_row]), 0, scheduled_time)
         if twse_stock is None:
             return None
 
@@ -329,6 +367,10 @@ class TwseCrawker():
 
 
     def update_tracked_stock_identity(self, item: int, twse_stock: TWSEStock, scheduled_time: str) -> bool:
+        # Rows looked up by a tracked stock number cannot disagree with it.
+        if self.stocknumbers[item] == twse_stock.stock_no and self.stocknames[item] == twse_stock.stock_name:
+            return True
+
         expected_stock_no = self.tracked_stock_numbers[item]
         if expected_stock_no and twse_stock.stock_no != expected_stock_no:
             logging.warning(
@@ -376,101 +418,293 @@ class TwseCrawker():
         return self.parse_stock_row_ohlc(stock_row, scheduled_time)
 
 
-    def get_date_times(self, start_date: int, backtrack_days: int, holidays: list[str]) -> None:
-
-        now_date_time = datetime.datetime.now()
+    def get_date_times(
+        self,
+        start_date: int,
+        backtrack_days: int,
+        holidays: list[str],
+        stocktype: Stocktype | None = None,
+    ) -> None:
+        self.iso_scheduled_times.extend(self.scheduled_dates(start_date, backtrack_days, holidays, stocktype = stocktype))
+        self.transactiondays = self.days_between_isodates(self.iso_scheduled_times[0], self.iso_scheduled_times[-1])
 
-        for day in range(-backtrack_days, -start_date, 1):
-            # ISO 8601 format, YYYY-MM-DD
-            iso_date_time = (now_date_time + datetime.timedelta(days=day)).strftime("%Y-%m-%d")
 
-            # Bypass weekend
-            if (now_date_time + datetime.timedelta(days=day)).isoweekday() == 6 or (now_date_time + datetime.timedelta(days=day)).isoweekday() == 7:
-                continue
+    def scheduled_dates(
+        self,
+        start_date: int,
+        backtrack_days: int,
+        holidays: list[str],
+        now_date_time: datetime.datetime | None = None,
+        stocktype: Stocktype | None = None,
+    ) -> list[str]:
+        today = (now_date_time or datetime.datetime.now()).date()
+        # Closures confirmed by earlier runs are dropped like listed holidays.
+        calendar = trading_calendar(set(holidays) | self.known_closed_dates(stocktype))
+        sessions = calendar.sessions_between(
+            today - datetime.timedelta(days=backtrack_days),
+            today - datetime.timedelta(days=start_date + 1),
+        )
+        # ISO 8601 format, YYYY-MM-DD
+        return [session.isoformat() for session in sessions]
 
-            # TWSE Stock market haven't opened
-            date_time = ''.join(iso_date_time.split('-'))
-            if date_time in holidays:
-                continue
 
-            self.iso_scheduled_times.append(iso_date_time)
+    def known_closed_dates(self, stocktype: Stocktype | None = None) -> set[str]:
+        """Confirmed closures of ``stocktype`` and of the whole market; market-wide ones only without it."""
 
-        self.transactiondays = self.days_between_isodates(self.iso_scheduled_times[0], self.iso_scheduled_times[-1])
+        known_closed_dates = getattr(self.twse_client, "known_closed_dates", None)
+        if known_closed_dates is None:
+            return set()
+        return known_closed_dates() if stocktype is None else known_closed_dates(stocktype.value[0])
 
 
     def days_between_isodates(self, date1: str, date2: str) -> int:
-        def is_leap_year(year: int) -> bool:
-            return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+        return days_between(date1, date2)
+
+
+    def iter_daily_stock_rows(self, scheduled_times: list[str], stocktype: Stocktype) -> Iterator[tuple[str, StockRows]]:
+        # Clients that can schedule a whole date range fetch it concurrently.
+        iter_rows = getattr(self.twse_client, "iter_daily_stock_rows", None)
+        if iter_rows is not None:
+            return iter_rows(scheduled_times, stocktype.value[0])
+
+        return (
+            (scheduled_time, self.twse_client.get_daily_stock_rows(scheduled_time, stocktype.value[0]))
+            for scheduled_time in scheduled_times
+        )
+
+
+    def seed_selector_resolutions(self, stocktype: Stocktype, stocks: list[StockSelector]) -> None:
+        self.indexed_slots = set()
+        self.listing_digest = None
+        self.listing_checked = False
+        entry = self.selector_index.get(stocktype.value[0]) if self.selector_index is not None else None
+        if entry is None:
+            return
+
+        self.listing_digest, resolutions = entry
+        for item in range(self.stocklistsize):
+            stock_no = resolutions.get(str(stocks[item]).strip())
+            if stock_no and not self.tracked_stock_numbers[item]:
+                self.tracked_stock_numbers[item] = stock_no
+                self.indexed_slots.add(item)
+        logging.info(
+            "Loaded %s legacy selector resolutions for %s from the selector index.",
+            len(self.indexed_slots),
+            self.selector_index.list_name,
+        )
+
+
+    def check_selector_listing(self, rows: StockRows, scheduled_time: str) -> None:
+        # Only the first listing of a run is compared; later dates resolve nothing new.
+        if self.selector_index is None or self.listing_checked:
+            return
+
+        digest = listing_digest(rows)
+        stale = self.listing_digest is not None and digest != self.listing_digest
+        self.listing_digest = digest
+        self.listing_checked = True
+        indexed_slots, self.indexed_slots = self.indexed_slots, set()
+        if not stale or not indexed_slots:
+            return
+
+        # Row indexes now point elsewhere; resolve again against this listing.
+        reset = [item for item in indexed_slots if not self.daily_dates[item]]
+        for item in reset:
+            self.tracked_stock_numbers[item] = None
+        logging.info(
+            "Sector listing changed at %s; resolving %s legacy selectors for %s again.",
+            scheduled_time,
+            len(reset),
+            self.selector_index.list_name,
+        )
+
+
+    def store_selector_resolutions(self, stocktype: Stocktype, stocks: list[StockSelector]) -> None:
+        if self.selector_index is None or self.listing_digest is None:
+            return
 
-        def get_days(date: str) -> int:
-            y, m, d = map(int, date.split('-'))
+        resolutions = {
+            str(stocks[item]).strip(): stock_no
+            for item, stock_no in enumerate(self.tracked_stock_numbers)
+            if stock_no and str(stocks[item]).strip() != stock_no
+        }
+        if self.selector_index.update(stocktype.value[0], self.listing_digest, resolutions):
+            logging.info(
+                "Saved %s legacy selector resolutions for %s to the selector index.",
+                len(resolutions),
+                self.selector_index.list_name,
+            )
+
+
+    def load_stored_daily_rows(
+        self,
+        file_name: str,
+        scheduled_times: list[str],
+        stocktype: Stocktype,
+        stocks: list[StockSelector],
+    ) -> dict[str, StockRows]:
+        stored_dates = self.csv_repository.stored_dates(file_name)
+        stored_rows = {
+            scheduled_time: self.csv_repository.read_daily_rows(file_name, scheduled_time)
+            for scheduled_time in scheduled_times
+            if scheduled_time in stored_dates
+        }
+        if not stored_rows:
+            return {}
+
+        stored_stock_nos = {
+            clean_cell(stock_row[TwseColumns.STOCK_NO])
+            for rows in stored_rows.values()
+            for stock_row in rows
+            if stock_row
+        }
+        unresolved = [
+            item
+            for item in range(self.stocklistsize)
+            if not self.tracked_stock_numbers[item] and str(stocks[item]).strip() not in stored_stock_nos
+        ]
+        if unresolved:
+            # Legacy row-index selectors need one TWSE listing to map onto stock numbers.
+            missing = [scheduled_time for scheduled_time in scheduled_times if scheduled_time not in stored_rows]
+            resolve_time = missing[0] if missing else scheduled_times[-1]
+            rows = self.twse_client.get_daily_stock_rows(resolve_time, stocktype.value[0])
+            parsed, stock_index = self.index_stock_rows(rows, resolve_time)
+            self.check_selector_listing(rows, resolve_time)
+            unresolved = [
+                item
+                for item in range(self.stocklistsize)
+                if not self.tracked_stock_numbers[item] and str(stocks[item]).strip() not in stored_stock_nos
+            ]
+            for item in unresolved:
+                self.resolve_row_index(parsed, stock_index, stocks[item], item, resolve_time)
+
+        required_stock_nos = {
+            self.tracked_stock_numbers[item] or str(stocks[item]).strip()
+            for item in range(self.stocklistsize)
+            if self.tracked_stock_numbers[item] or str(stocks[item]).strip() in stored_stock_nos
+        }
+        for scheduled_time, rows in list(stored_rows.items()):
+            stock_nos = {clean_cell(stock_row[TwseColumns.STOCK_NO]) for stock_row in rows if stock_row}
+            if not required_stock_nos <= stock_nos:
+                # The stock list changed since this file was written; fetch the day again.
+                del stored_rows[scheduled_time]
 
-            days = d + int(is_leap_year(y) and m < 2)
-            days += sum(365 + int(is_leap_year(y)) for y in range(1971, y))
-            days += sum([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31][:m])
+        return stored_rows
 
-            return days
 
-        return abs(get_days(date1) - get_days(date2)) + 1
+    def iter_incremental_daily_stock_rows(
+        self,
+        file_name: str,
+        scheduled_times: list[str],
+        stocktype: Stocktype,
+        stocks: list[StockSelector],
+    ) -> Iterator[tuple[str, StockRows, bool]]:
+        stored_rows = self.load_stored_daily_rows(file_name, scheduled_times, stocktype, stocks)
+        missing = [scheduled_time for scheduled_time in scheduled_times if scheduled_time not in stored_rows]
+        logging.info(
+            "Incremental crawl for %s: %s dates loaded from storage, %s dates fetched from TWSE.",
+            file_name,
+            len(stored_rows),
+            len(missing),
+        )
 
+        fetched_rows = self.iter_daily_stock_rows(missing, stocktype)
+        try:
+            for scheduled_time in scheduled_times:
+                if scheduled_time in stored_rows:
+                    yield scheduled_time, stored_rows[scheduled_time], True
+                else:
+                    _, rows = next(fetched_rows)
+                    yield scheduled_time, rows, False
+        finally:
+            fetched_rows.close()
 
-    def get_twse_daily_stocks(self, file_name: str, stocktype: Stocktype, stocks: list[StockSelector]) -> None:
+
+    @timed("crawl")
+    def get_twse_daily_stocks(
+        self,
+        file_name: str,
+        stocktype: Stocktype,
+        stocks: list[StockSelector],
+        incremental: bool = False,
+    ) -> None:
         valid_iso_scheduled_times: list[str] = []
     
-        # Crawing daily TWSE Stock data
-        for iso_scheduled_time in self.iso_scheduled_times:
+        scheduled_times = {''.join(iso_scheduled_time.split('-')): iso_scheduled_time for iso_scheduled_time in self.iso_scheduled_times}
+        self.seed_selector_resolutions(stocktype, stocks)
+
+        if incremental:
+            daily_rows = self.iter_incremental_daily_stock_rows(file_name, list(scheduled_times), stocktype, stocks)
+        else:
+            daily_rows = (
+                (scheduled_time, row, False)
+                for scheduled_time, row in self.iter_daily_stock_rows(list(scheduled_times), stocktype)
+            )
 
-            scheduled_time = ''.join(iso_scheduled_time.split('-'))              
-            # Get TWSE information of stock price
-            row = self.twse_client.get_daily_stock_rows(scheduled_time, stocktype.value[0])
+        # Crawing daily TWSE Stock data
+        for scheduled_time, row, from_store in timed_iter(daily_rows, "fetch", key = lambda item: item[0]):
+            iso_scheduled_time = scheduled_times[scheduled_time]
             if not row:
                 logging.warning("Skipping %s because TWSE returned no stock rows.", scheduled_time)
                 continue
 
-            stock_lookup = self.build_stock_lookup(row, scheduled_time)
-            if not stock_lookup:
+            parsed, stock_index = self.index_stock_rows(row, scheduled_time)
+            if not stock_index:
                 logging.warning("Skipping %s because no TWSE rows passed schema validation.", scheduled_time)
                 continue
 
-            row_data: StockRows = [[] for _ in range(self.stocklistsize)]
-    
+            if not from_store:
+                self.check_selector_listing(row, scheduled_time)
+
+            collected_rows: dict[int, int] = {}
+
             # Store stock data structure
             for item in range(self.stocklistsize):
-                stock_row = self.resolve_stock_row(
-                    rows = row,
-                    stock_lookup = stock_lookup,
+                row_index = self.resolve_row_index(
+                    parsed = parsed,
+                    stock_index = stock_index,
                     selector = stocks[item],
                     item = item,
                     scheduled_time = scheduled_time,
+                    allow_index = not from_store,
                 )
-                if stock_row is None:
+                if row_index is None:
                     continue
-                
-                twse_stock = self.parse_twse_stock(stock_row, scheduled_time)
+
+                twse_stock = self.build_twse_stock(parsed, row_index, scheduled_time)
                 if twse_stock is None:
                     continue
 
                 if not self.update_tracked_stock_identity(item, twse_stock, scheduled_time):
                     continue
 
-                row_data[item] = self.build_record_row(stock_row)
+                collected_rows[item] = row_index
+                count("stock_days_collected")
                 self.daily_stocks[item].append(twse_stock.open * 1000)
                 self.daily_highs[item].append(twse_stock.high * 1000)
                 self.daily_lows[item].append(twse_stock.low * 1000)
                 self.daily_closes[item].append(twse_stock.close * 1000)
                 self.daily_volumes[item].append(twse_stock.volume)
                 self.daily_pe_ratios[item].append(twse_stock.pe)
+                self.daily_dates[item].append(iso_scheduled_time)
+
+            row_data: StockRows = [[] for _ in range(self.stocklistsize)]
+            for item, record_row in zip(collected_rows, parsed.text_rows(list(collected_rows.values()))):
+                row_data[item] = record_row
             
             # Record TWSE information of stock price
             if any(row_data):
                 valid_iso_scheduled_times.append(iso_scheduled_time)
-                self.record(file_name = file_name, scheduled_time = scheduled_time, row_data = row_data)
+                if not from_store:
+                    self.record(file_name = file_name, scheduled_time = scheduled_time, row_data = row_data)
             else:
                 logging.warning(
                     "Skipping CSV write for %s because none of the requested stocks had valid TWSE rows.",
                     scheduled_time,
                 )
 
+        self.store_selector_resolutions(stocktype, stocks)
+
         if not valid_iso_scheduled_times:
             raise RuntimeError("No valid TWSE daily stock rows were collected for the requested date range.")
 
@@ -478,13 +712,35 @@ class TwseCrawker():
         self.transactiondays = self.days_between_isodates(self.iso_scheduled_times[0], self.iso_scheduled_times[-1])
 
 
-    def smtp_email(self, subject: str, ccreceiver: str | None, stocktype: Stocktype, maxprofits: list[ProfitRow]) -> None:
+    def smtp_email(
+        self,
+        subject: str,
+        ccreceiver: str | None,
+        stocktype: Stocktype,
+        maxprofits: list[ProfitRow],
+        connection: TextMeWhenItsDone | None = None,
+    ) -> TextMeWhenItsDone | None:
+        stockprofittable, entryanalysis = self.build_email_content(self.build_analysis_dataset(maxprofits))
+        return self.send_email_content(subject, ccreceiver, stocktype, stockprofittable, entryanalysis, connection)
+
 
-        analysis_dataset = self.build_analysis_dataset(maxprofits)
+    def build_email_content(self, analysis_dataset: pd.DataFrame) -> tuple[str, str]:
         stockprofittable = self.record_to_html_tablefmt(analysis_dataset)
-        entryanalysis = self.build_entry_signal_analysis(analysis_dataset)
+        entryanalysis = self.build_entry_signal_analysis(analysis_dataset) + self.build_trade_analysis()
+        return stockprofittable, entryanalysis
+
 
-        smtpemail = SMTPEmail(subject, ccreceiver)
+    @timed("smtp")
+    def send_email_content(
+        self,
+        subject: str,
+        ccreceiver: str | None,
+        stocktype: Stocktype,
+        stockprofittable: str,
+        entryanalysis: str,
+        connection: TextMeWhenItsDone | None = None,
+    ) -> TextMeWhenItsDone | None:
+        smtpemail = SMTPEmail(subject, ccreceiver, connection)
         smtpemail.smtpauthentication()
 
         # Send HTML email with Python
@@ -493,16 +749,27 @@ class TwseCrawker():
                                      stocktype = stocktype,
                                      stockprofittable = stockprofittable,
                                      entryanalysis = entryanalysis)
+        return smtpemail.connection
 
 
-    def smtp_img_email(self, subject: str, ccreceiver: str | None, stocktype: Stocktype, backtrack: str) -> None:
-        smtpemail = SMTPEmail(subject, ccreceiver)
+    @timed("smtp")
+    def smtp_img_email(
+        self,
+        subject: str,
+        ccreceiver: str | None,
+        stocktype: Stocktype,
+        backtrack: str,
+        connection: TextMeWhenItsDone | None = None,
+    ) -> TextMeWhenItsDone | None:
+        smtpemail = SMTPEmail(subject, ccreceiver, connection)
         smtpemail.smtpauthentication()
 
         # Send HTML email with Python
         smtpemail.imgstockprofittable(backtrack = backtrack, stocktype = stocktype)
+        return smtpemail.connection
 
 
+    @timed("chart")
     def draw_linechart(self, duration: int, maxprofitratios: list[list[float]]) -> None:
         save_profit_ratio_chart(
             duration = duration,
@@ -512,8 +779,16 @@ class TwseCrawker():
         )
 
 
+    @timed("max_profit")
     def cal_max_profit(self) -> list[ProfitRow]:
         maxprofits: list[ProfitRow] = [[] for _ in range(self.stocklistsize)]
+
+        # All slots go through the panel kernels in one pass per variant.
+        prices = self.stack_open_prices()
+        unlimited_profits = max_profit_unlimited_panel(prices)
+        single_profits = max_profit_panel(prices)
+        k_profits = max_profit_k_transactions_panel(MAX_TRANSACTIONS, prices)
+        fee_profits = max_profit_with_fee_panel(prices, 300)
     
         # Caculate max profit and stock profit's table
         for item, daily_stock in zip(range(self.stocklistsize), self.daily_stocks):
@@ -523,10 +798,10 @@ class TwseCrawker():
                 self.stocksprice.append(None)
                 continue
 
-            profit_with_fee = max_profit_with_fee(daily_stock, 300)
-            maxprofits[item].append(round(max_profit_unlimited(daily_stock), 2))
-            maxprofits[item].append(round(max_profit(daily_stock), 2))
-            maxprofits[item].append(round(max_profit_k_transactions(5, daily_stock), 2))
+            profit_with_fee = float(fee_profits[item])
+            maxprofits[item].append(round(float(unlimited_profits[item]), 2))
+            maxprofits[item].append(round(float(single_profits[item]), 2))
+            maxprofits[item].append(round(float(k_profits[item]), 2))
             maxprofits[item].append(round(profit_with_fee, 2))
 
             # stock profit ratio
@@ -546,6 +821,7 @@ class TwseCrawker():
                 closes = self.daily_closes[item],
                 highs = self.daily_highs[item],
                 lows = self.daily_lows[item],
+                stock = self.stocknumbers[item],
             )
             signal_features[item] = [
                 features.trend_score,
@@ -558,32 +834,195 @@ class TwseCrawker():
         return signal_features
 
 
+    def stack_open_prices(self) -> np.ndarray:
+        """Opening prices of every slot as a (dates x slots) array for the profit kernels."""
+
+        # A built panel already holds them in that layout, read in place when it has no gaps.
+        if self.price_panel is not None:
+            return self.price_panel.kernel_prices("open")
+        return stack_price_histories(self.daily_stocks)
+
+
+    @timed("price_panel")
+    def build_price_panel(
+        self,
+        path: str | Path | None = None,
+        previous: PricePanel | None = None,
+        capacity: int = 0,
+    ) -> PricePanel:
+        """Copy the crawled history into a dates x stocks panel, memory-mapped under path.
+
+        A ``previous`` panel of the same stocks whose sessions this window
+        continues is advanced instead, so only the new sessions are written.
+        ``capacity`` reserves rows for later advances.
+        """
+
+        from infrastructure.storage.price_panel import PricePanel
+
+        added = None
+        directory = Path(path) if path is not None else None
+        if previous is not None and previous.stock_nos == self.stocknumbers and previous.path == directory:
+            added = previous.advance(self.iso_scheduled_times)
+        if added is None:
+            panel = PricePanel.create(self.iso_scheduled_times, self.stocknumbers, path, capacity)
+            added = self.iso_scheduled_times
+        else:
+            panel = previous
+        count("panel_sessions_written", len(added))
+
+        added_dates = set(added)
+        for item in range(self.stocklistsize):
+            # Each stock's dates are a subsequence of the window, so new sessions are at its tail.
+            dates = self.daily_dates[item]
+            first = len(dates)
+            while first and dates[first - 1] in added_dates:
+                first -= 1
+            if first == len(dates):
+                continue
+            panel.set_values(item, dates[first:], {
+                "open": self.daily_stocks[item][first:],
+                "high": self.daily_highs[item][first:],
+                "low": self.daily_lows[item][first:],
+                "close": self.daily_closes[item][first:],
+                "volume": self.daily_volumes[item][first:],
+                "pe": self.daily_pe_ratios[item][first:],
+            })
+        panel.flush()
+        self.price_panel = panel
+        return panel
+
+
     def build_strategy_history(self, item: int) -> pd.DataFrame:
-        return pd.DataFrame(
-            {
-                "Open": self.daily_stocks[item],
-                "High": self.daily_highs[item],
-                "Low": self.daily_lows[item],
-                "Close": self.daily_closes[item],
-                "Volume": self.daily_volumes[item],
-                "PE": self.daily_pe_ratios[item],
-            }
-        )
+        import pandas as pd
+
+        if self.price_panel is not None:
+            history = self.price_panel.history(item)
+        else:
+            history = pd.DataFrame(
+                {
+                    "Open": self.daily_stocks[item],
+                    "High": self.daily_highs[item],
+                    "Low": self.daily_lows[item],
+                    "Close": self.daily_closes[item],
+                    "Volume": self.daily_volumes[item],
+                    "PE": self.daily_pe_ratios[item],
+                }
+            )
 
+        # Labels the strategies' indicator-store entries with the stock number.
+        history.attrs["stock"] = self.stocknumbers[item]
+        return history
 
+
+    @timed("low_entry_strategy")
     def cal_low_entry_strategy(self) -> pd.DataFrame:
+        import pandas as pd
+
+        from domain.strategies.low_entry_score_v3 import LOW_ENTRY_OUTPUT_COLUMNS
+        from domain.strategies.low_entry_score_v3 import LOW_ENTRY_STRATEGY_NAME
+
         strategy = get_strategy(LOW_ENTRY_STRATEGY_NAME)
         strategy_rows: list[dict[str, object]] = []
+        streamed: dict[int, dict[str, object]] = {}
+        latest_rows = pd.DataFrame()
+
+        if self.strategy_state_path is not None and hasattr(strategy, "stream"):
+            with span("strategy_streams"):
+                streamed = self.stream_low_entry_rows(strategy)
+        else:
+            # Every slot with history is scored in one batched call.
+            with span("strategy_histories"):
+                histories = [self.build_strategy_history(item).assign(slot = item) for item in range(self.stocklistsize)]
+                histories = [history for history in histories if not history.empty]
+            with span("strategy_panel"):
+                if histories:
+                    latest_rows = strategy.run_panel(pd.concat(histories, ignore_index = True), key = "slot")
 
         for item in range(self.stocklistsize):
-            result = strategy.run(self.build_strategy_history(item))
-            latest = result.iloc[-1].to_dict() if not result.empty else {}
+            if item in streamed:
+                latest = streamed[item]
+            elif item in latest_rows.index:
+                latest = latest_rows.loc[item].to_dict()
+            else:
+                with span("strategy_stock", self.stocknumbers[item]):
+                    latest = strategy.evaluate_latest(self.build_strategy_history(item))
             strategy_rows.append({column: latest.get(column) for column in LOW_ENTRY_OUTPUT_COLUMNS})
 
         return pd.DataFrame(strategy_rows, columns = LOW_ENTRY_OUTPUT_COLUMNS)
 
 
+    def stream_low_entry_rows(self, strategy: Any) -> dict[int, dict[str, object]]:
+        """Score every slot by appending only the sessions its saved stream lacks.
+
+        A stock's stream resumes when the last session it saw is in the crawled
+        window; otherwise it is seeded again from the whole window. States are
+        saved back to ``strategy_state_path`` afterwards.
+        """
+
+        streams = self.load_strategy_streams()
+        latest_rows: dict[int, dict[str, object]] = {}
+        for item in range(self.stocklistsize):
+            stock_no = self.stocknumbers[item]
+            dates = self.daily_dates[item]
+            if not stock_no or not dates:
+                continue
+
+            entry = streams.get(stock_no)
+            if entry is not None and entry["date"] in dates and entry["stream"].config == strategy.config:
+                start = dates.index(entry["date"]) + 1
+            else:
+                entry = streams[stock_no] = {"date": None, "stream": strategy.stream()}
+                start = 0
+
+            stream = entry["stream"]
+            for day in range(start, len(dates)):
+                stream.push(
+                    self.daily_highs[item][day],
+                    self.daily_lows[item][day],
+                    self.daily_closes[item][day],
+                    float(self.daily_volumes[item][day]),
+                )
+            count("strategy_bars_streamed", len(dates) - start)
+            entry["date"] = dates[-1]
+            latest_rows[item] = stream.result().iloc[0].to_dict()
+
+        self.save_strategy_streams()
+        return latest_rows
+
+
+    def load_strategy_streams(self) -> dict[str, dict[str, Any]]:
+        """Stream states by stock number, ``{"date": last ISO session, "stream": ...}``."""
+
+        if self.strategy_streams is None:
+            from domain.strategies.low_entry_score_v3 import LowEntryScoreV3Stream
+
+            states = load_states(self.strategy_state_path) if self.strategy_state_path is not None else {}
+            self.strategy_streams = {}
+            for stock_no, state in states.items():
+                try:
+                    stream = LowEntryScoreV3Stream.from_dict(state["stream"])
+                except (KeyError, TypeError, ValueError):
+                    logging.warning("Discarding unreadable strategy stream state for %s.", stock_no)
+                    continue
+                self.strategy_streams[stock_no] = {"date": state.get("date"), "stream": stream}
+        return self.strategy_streams
+
+
+    def save_strategy_streams(self) -> None:
+        if self.strategy_state_path is None or self.strategy_streams is None:
+            return
+        save_states(self.strategy_state_path, {
+            stock_no: {"date": entry["date"], "stream": entry["stream"].to_dict()}
+            for stock_no, entry in self.strategy_streams.items()
+        })
+
+
+    @timed("analysis_dataset")
     def build_analysis_dataset(self, maxprofits: list[ProfitRow]) -> pd.DataFrame:
+        import pandas as pd
+
+        from domain.strategies.low_entry_score_v3 import LOW_ENTRY_OUTPUT_COLUMNS
+
         df_analysis = pd.DataFrame(maxprofits)
         df_analysis.columns = ["無限次交易", "交易一次", "至多五次交易", "無限次交易(手續費$NTD300)", "利潤比"]
         df_signal_features = pd.DataFrame(
@@ -623,12 +1062,14 @@ class TwseCrawker():
     def cal_max_profit_ratio_data(self) -> list[list[float]]:
         maxprofitratios: list[list[float]] = [[] for _ in range(self.stocklistsize)]
 
+        fee_profits = max_profit_with_fee_panel(self.stack_open_prices(), 300)
+
         # Caculate max profit and stock profit's table
         for item, daily_stock in zip(range(self.stocklistsize), self.daily_stocks):
             if not daily_stock:
                 continue
             # stock profit ratio
-            maxprofitratios[item].append(round(max_profit_with_fee(daily_stock, 300)/daily_stock[-1], 2))
+            maxprofitratios[item].append(round(float(fee_profits[item])/daily_stock[-1], 2))
              # stock opening price       
             self.stocksprice.append(round(daily_stock[-1], 2))
 
@@ -637,7 +1078,42 @@ class TwseCrawker():
         return maxprofitratios
 
 
+    @timed("profit_ratio_windows")
+    def cal_max_profit_ratio_windows(self, windows: list[list[str]]) -> list[list[list[float]]]:
+        """Compute the line-chart profit ratio of every window from collected prices.
+
+        Each window is a list of ISO dates. The result has one entry per stock
+        slot and one ratio list per window, the same shape the per-window
+        cal_max_profit_ratio_data() calls used to produce.
+        """
+
+        maxprofitratios: list[list[list[float]]] = [[] for _ in range(self.stocklistsize)]
+        window_prices: list[list[float]] = []
+
+        for window in windows:
+            window_dates = set(window)
+            window_prices = [
+                [
+                    price
+                    for price, iso_date in zip(self.daily_stocks[item], self.daily_dates[item])
+                    if iso_date in window_dates
+                ]
+                for item in range(self.stocklistsize)
+            ]
+            fee_profits = max_profit_with_fee_panel(stack_price_histories(window_prices), 300)
+            for item, prices in enumerate(window_prices):
+                maxprofitratios[item].append([round(float(fee_profits[item])/prices[-1], 2)] if prices else [])
+
+        # stock opening price of the latest window
+        self.stocksprice = [round(prices[-1], 2) for prices in window_prices if prices]
+
+        return maxprofitratios
+
+
+    @timed("html_table")
     def record_to_html_tablefmt(self, analysis_dataset: pd.DataFrame) -> str:
+        from tabulate import tabulate
+
         max_profit_columns = [
             "日期",
             "證券代號",
@@ -658,6 +1134,8 @@ class TwseCrawker():
 
 
     def format_signal_value(self, value: object, precision: int = 4) -> str:
+        import pandas as pd
+
         if pd.isna(value):
             return "N/A"
         if isinstance(value, str):
@@ -665,15 +1143,61 @@ class TwseCrawker():
         return str(round(float(value), precision))
 
 
+    @timed("html_entry_analysis")
     def build_entry_signal_analysis(self, analysis_dataset: pd.DataFrame) -> str:
+        from domain.strategies.low_entry_score_v3 import LOW_ENTRY_STRATEGY_NAME
+        from infrastructure.report.html_renderer import RendererFactory
+
         renderer = RendererFactory.get_renderer(LOW_ENTRY_STRATEGY_NAME)
         return renderer.render(analysis_dataset)
 
 
-    def record_analysis_dataset(self, file_name: str, maxprofits: list[ProfitRow]) -> None:
-        self.csv_repository.write_analysis_dataset(file_name, self.build_analysis_dataset(maxprofits))
+    @timed("html_trade_analysis")
+    def build_trade_analysis(self, k: int = MAX_TRANSACTIONS) -> str:
+        from tabulate import tabulate
+
+        trade_rows: list[list[object]] = []
+
+        for item in range(self.stocklistsize):
+            _, trades = max_profit_k_transactions_trades(k, self.daily_stocks[item])
+            for trade in trades:
+                trade_rows.append([
+                    "{} {}".format(self.stocknumbers[item], self.stocknames[item]),
+                    self.daily_dates[item][trade.buy_day],
+                    round(trade.buy_price, 2),
+                    self.daily_dates[item][trade.sell_day],
+                    round(trade.sell_price, 2),
+                    round(trade.profit, 2),
+                ])
+
+        tradetable = tabulate(
+            trade_rows,
+            headers = ["股票", "買進日", "買進價", "賣出日", "賣出價", "利潤"],
+            tablefmt = 'html',
+        )
+        return """
+        <h3>至多{}次交易明細</h3>
+        {}
+        """.format(k, tradetable)
+
+
+    @timed("write_analysis_dataset")
+    def record_analysis_dataset(
+        self,
+        file_name: str,
+        maxprofits: list[ProfitRow],
+        analysis_dataset: pd.DataFrame | None = None,
+    ) -> None:
+        if analysis_dataset is None:
+            analysis_dataset = self.build_analysis_dataset(maxprofits)
+        self.csv_repository.write_analysis_dataset(file_name, analysis_dataset)
+
+
+    def record_run_report(self, file_name: str, report: dict[str, object]) -> Path:
+        return self.csv_repository.write_run_report(file_name, report)
 
 
+    @timed("write_daily_rows")
     def record(self, file_name: str, scheduled_time: str, row_data: StockRows) -> None:
         if not any(row_data):
             logging.warning("Skipping CSV write for %s because row_data is empty.", scheduled_time)
@@ -0,0 +1,7 @@
+#!/bin/sh
+set -eu
+
+SCRIPT_DIR=$(CDPATH= cd -- "$(dirname -- "$0")" && pwd)
+. "$SCRIPT_DIR/pythonenv.sh"
+
+"$PYTHON_BIN" "$SCRIPT_DIR/main.py" batch "$SCRIPT_DIR/batch.json"
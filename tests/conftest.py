@@ -0,0 +1,65 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from urllib.parse import parse_qs
+from urllib.parse import urlparse
+
+import pytest
+
+
+class FakeTwseServer(ThreadingHTTPServer):
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), FakeTwseHandler)
+        self.requests: list[str] = []
+        self.failures_left: dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return "http://127.0.0.1:{}/exchangeReport/MI_INDEX".format(self.server_address[1])
+
+
+class FakeTwseHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: FakeTwseServer
+
+    def do_GET(self) -> None:
+        date_time = parse_qs(urlparse(self.path).query)["date"][0]
+        with self.server.lock:
+            self.server.requests.append(date_time)
+            failing = self.server.failures_left.get(date_time, 0) > 0
+            if failing:
+                self.server.failures_left[date_time] -= 1
+
+        # Later dates answer faster so ordered delivery is actually exercised.
+        time.sleep(0.05 if date_time.endswith("1") else 0.0)
+        if failing:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = json.dumps({
+            "stat": "OK",
+            "tables": [{"fields": ["證券代號", "證券名稱"], "data": [["2382", "廣達", date_time] + ["1"] * 13]}],
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def twse_server():
+    server = FakeTwseServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
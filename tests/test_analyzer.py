@@ -1,9 +1,18 @@
+import random
+
 from twse.analyzer import compute_signal_features
 from twse.analyzer import evaluate_low_entry
 from twse.analyzer import max_profit
 from twse.analyzer import max_profit_k_transactions
+from twse.analyzer import Trade
+from twse.analyzer import max_profit_k_transactions_panel
+from twse.analyzer import max_profit_k_transactions_trades
+from twse.analyzer import max_profit_panel
 from twse.analyzer import max_profit_unlimited
+from twse.analyzer import max_profit_unlimited_panel
 from twse.analyzer import max_profit_with_fee
+from twse.analyzer import max_profit_with_fee_panel
+from twse.analyzer import stack_price_histories
 
 
 def test_profit_calculations() -> None:
@@ -15,6 +24,67 @@ def test_profit_calculations() -> None:
     assert max_profit_with_fee(prices, 5) == 50
 
 
+def test_panel_profit_kernels_match_scalar_functions_exactly() -> None:
+    rng = random.Random(7)
+    histories = [[round(rng.uniform(10, 200), 2) * 1000 for _ in range(rng.randint(0, 60))] for _ in range(40)]
+    histories[0] = []
+    histories[1] = [101500.0]
+
+    prices = stack_price_histories(histories)
+    single = max_profit_panel(prices)
+    unlimited = max_profit_unlimited_panel(prices)
+    k_transactions = max_profit_k_transactions_panel(5, prices)
+    with_fee = max_profit_with_fee_panel(prices, 300)
+
+    for column, history in enumerate(histories):
+        assert single[column] == max_profit(history)
+        assert unlimited[column] == max_profit_unlimited(history)
+        assert k_transactions[column] == max_profit_k_transactions(5, history)
+        assert with_fee[column] == max_profit_with_fee(history, 300)
+
+    for k in (0, 1, 2):
+        assert max_profit_k_transactions_panel(k, prices).tolist() == [max_profit_k_transactions(k, history) for history in histories]
+
+
+def test_k_transactions_returns_the_trades_behind_the_profit() -> None:
+    prices = [3, 2, 6, 5, 0, 3, 1, 4, 2, 8]
+
+    profit, trades = max_profit_k_transactions_trades(2, prices)
+
+    assert profit == max_profit_k_transactions(2, prices) == 12
+    assert trades == [Trade(1, 2, 2, 6), Trade(4, 0, 9, 8)]
+
+
+def test_k_transactions_above_half_the_days_uses_unlimited_trades() -> None:
+    prices = [1, 5, 3, 6, 4, 8]
+
+    profit, trades = max_profit_k_transactions_trades(10, prices)
+
+    assert profit == max_profit_k_transactions(10, prices) == max_profit_unlimited(prices) == 11
+    assert [(trade.buy_day, trade.sell_day) for trade in trades] == [(0, 1), (2, 3), (4, 5)]
+
+
+def test_k_transactions_matches_full_table_on_random_prices() -> None:
+    def table(k: int, prices: list[int]) -> int:
+        dp = [[0] * len(prices) for _ in range(k + 1)]
+        for trans_k in range(1, k + 1):
+            balance = -prices[0]
+            for day in range(1, len(prices)):
+                dp[trans_k][day] = max(dp[trans_k][day - 1], balance + prices[day])
+                balance = max(balance, dp[trans_k - 1][day - 1] - prices[day])
+        return dp[k][-1]
+
+    rng = random.Random(11)
+    for _ in range(200):
+        prices = [rng.randint(1, 50) for _ in range(rng.randint(1, 40))]
+        k = rng.randint(1, 12)
+        profit, trades = max_profit_k_transactions_trades(k, prices)
+        assert profit == max_profit_k_transactions(k, prices) == table(k, prices)
+        assert len(trades) <= k
+        assert sum(trade.profit for trade in trades) == profit
+        assert all(earlier.sell_day < later.buy_day for earlier, later in zip(trades, trades[1:]))
+
+
 def test_compute_signal_features() -> None:
     features = compute_signal_features(
         closes=[100, 102, 104, 105, 108],
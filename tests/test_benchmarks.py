@@ -0,0 +1,44 @@
+import json
+
+import numpy as np
+
+from benchmarks.bench_pipeline import main
+from benchmarks.payloads import encode_payloads
+from benchmarks.payloads import synthetic_market
+from twse.parser import parse_stock_rows
+from twstockcrawler import TwStockCrawler
+
+
+def test_both_payload_layouts_decode_to_the_same_parseable_rows() -> None:
+    market = synthetic_market(stocks=200, sessions=5, seed=1, halted_ratio=0.05)
+    crawler = TwStockCrawler()
+
+    decoded = {
+        layout: {date: crawler._extract_stock_rows(json.loads(body), date) for date, body in encode_payloads(market, layout).items()}
+        for layout in ("data1", "tables")
+    }
+
+    assert decoded["data1"] == decoded["tables"]
+    assert list(decoded["tables"]) == market.dates
+    for day, rows in enumerate(decoded["tables"].values()):
+        parsed = parse_stock_rows(rows)
+        assert parsed.valid.all()
+        assert parsed.stock_no.tolist() == market.stock_nos
+        np.testing.assert_array_equal(parsed.numeric("close"), market.close[day])
+        np.testing.assert_array_equal(parsed.numeric("volume"), market.volume[day])
+    cells = [cell for rows in decoded["tables"].values() for row in rows for cell in row]
+    assert "--" in cells
+    assert any("," in cell for cell in cells)
+
+
+def test_benchmark_writes_results_and_compares_against_a_baseline(tmp_path) -> None:
+    arguments = ["--stocks", "30", "--sessions", "30", "--tracked", "3", "--repeat", "1", "--layouts", "tables"]
+
+    assert main(arguments + ["--output", str(tmp_path / "before.json")]) == 0
+    assert main(arguments + ["--output", str(tmp_path / "after.json"), "--compare", str(tmp_path / "before.json"), "--tolerance", "1000"]) == 0
+
+    results = json.loads((tmp_path / "after.json").read_text())
+    assert {"index_stock_rows", "parse_stock_days", "max_profit_with_fee_panel", "pipeline[tables]"} <= set(results["timings"])
+    assert {"strategy[low_entry_score]", "strategy[low_entry_score_v2]", "render[low_entry_score_v3]"} <= set(results["timings"])
+    report = results["pipeline_reports"]["tables"]
+    assert report["counters"]["twse_requests"] == results["parameters"]["sessions"] == 30
@@ -1,4 +1,9 @@
+import json
+
+import pytest
+
 from application.stock_service import StockAnalysisService
+from domain.models import Stocktype
 from interface.cli import build_request
 
 
@@ -11,10 +16,10 @@ class FakeCrawler:
         self.stocklistsize = stocklistsize
         self.called: list[str] = []
 
-    def get_date_times(self, start_date: int, backtrack_days: int, holidays: list[str]) -> None:
+    def get_date_times(self, start_date: int, backtrack_days: int, holidays: list[str], stocktype: DummyStockType | None = None) -> None:
         self.called.append("get_date_times")
 
-    def get_twse_daily_stocks(self, file_name: str, stocktype: DummyStockType, stocks: list[str]) -> None:
+    def get_twse_daily_stocks(self, file_name: str, stocktype: DummyStockType, stocks: list[str], incremental: bool = False) -> None:
         self.called.append("get_twse_daily_stocks")
 
     def cal_max_profit(self) -> list[list[int]]:
@@ -68,3 +73,41 @@ def test_application_service_orchestrates_injected_crawler() -> None:
         "cal_max_profit",
         "record_analysis_dataset",
     ]
+
+
+def test_cli_accepts_any_output_prefix() -> None:
+    request = build_request(["-o", "elec_chart", "-t", "ELEC", "0", "20260101"])
+
+    assert request.output_file_names == "elec_chart"
+
+
+def test_batch_config_builds_one_request_per_job(tmp_path) -> None:
+    from interface.cli import build_batch_requests
+
+    (tmp_path / "stocklist_semi").write_text("0;1\n")
+    (tmp_path / "holidays").write_text("20260101")
+    config = tmp_path / "batch.json"
+    config.write_text(json.dumps({
+        "defaults": {"holidays": "holidays", "endbacktrack": 30, "mail": True},
+        "jobs": [
+            {"type": "ELEC", "stocklist": ["2330", "2382"], "subject": "I", "output_file_names": "elec"},
+            {"type": "SEMI", "stocklist": "stocklist_semi", "mail": False, "output_file_names": "semi"},
+        ],
+    }))
+
+    elec, semi = build_batch_requests(config)
+
+    assert (elec.stocktype, elec.stocklist, elec.subject, elec.mail) == (Stocktype.ELEC, ["2330", "2382"], "I", True)
+    assert (semi.stocklist, semi.stocklist_file, semi.mail) == (["0", "1"], str(tmp_path / "stocklist_semi"), False)
+    assert semi.holidays == ["20260101"] and semi.endbacktrack == 30
+
+    # Jobs sharing a prefix would overwrite each other's stored days and reports.
+    config.write_text(json.dumps({
+        "defaults": {"holidays": "holidays"},
+        "jobs": [
+            {"type": "ELEC", "stocklist": ["2330"], "output_file_names": "shirong"},
+            {"type": "SEMI", "stocklist": ["2303"], "output_file_names": "SHIRONG"},
+        ],
+    }))
+    with pytest.raises(ValueError, match="output prefix"):
+        build_batch_requests(config)
@@ -0,0 +1,185 @@
+import datetime
+import pickle
+import threading
+from types import SimpleNamespace
+from zoneinfo import ZoneInfo
+
+import stockanalysis
+from application import stock_service
+from application.daemon import MarketCloseScheduler
+from application.daemon import StockAnalysisDaemon
+from application.stock_service import StockAnalysisRequest
+from application.stock_service import StockAnalysisService
+from infrastructure.storage.csv_repository import CsvRepository
+from infrastructure.storage.warm_repository import WarmRepository
+
+TAIPEI = ZoneInfo("Asia/Taipei")
+
+
+def taipei(*args: int) -> datetime.datetime:
+    return datetime.datetime(*args, tzinfo=TAIPEI)
+
+
+def test_scheduler_runs_after_the_close_of_each_session() -> None:
+    scheduler = MarketCloseScheduler(holidays=["20261019"], run_at="14:30")
+
+    assert scheduler.next_run(taipei(2026, 10, 15, 10, 0)) == taipei(2026, 10, 15, 14, 30)
+    # Friday after the run goes past the weekend and the Monday holiday.
+    assert scheduler.next_run(taipei(2026, 10, 16, 14, 30)) == taipei(2026, 10, 20, 14, 30)
+    assert scheduler.next_run(datetime.datetime(2026, 10, 15, 5, 0, tzinfo=datetime.timezone.utc)) == taipei(2026, 10, 15, 14, 30)
+    assert scheduler.last_closed_session(taipei(2026, 10, 20, 9, 0)) == datetime.date(2026, 10, 16)
+    assert scheduler.last_closed_session(taipei(2026, 10, 20, 15, 0)) == datetime.date(2026, 10, 20)
+
+
+class CountingCsvRepository(CsvRepository):
+    def __init__(self, output_dir) -> None:
+        super().__init__(output_dir)
+        self.reads: list[str] = []
+
+    def read_daily_rows(self, file_name: str, scheduled_time: str) -> stockanalysis.StockRows:
+        self.reads.append(scheduled_time)
+        return super().read_daily_rows(file_name, scheduled_time)
+
+
+class CountingClient:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def get_daily_stock_rows(self, date_time: str, stocktype: int) -> stockanalysis.StockRows:
+        self.calls.append(date_time)
+        close = str(100 + int(date_time) % 13)
+        return [["2382", "廣達", "1,000", "10", "58,000", close, close, close, close, "+", "0.5", close, "1", close, "1", "12"]]
+
+
+class DummyStockType:
+    value = (13,)
+
+
+def test_warm_repository_serves_stored_days_from_memory(tmp_path) -> None:
+    inner = CountingCsvRepository(tmp_path)
+    repository = WarmRepository(inner)
+    client = CountingClient()
+
+    def crawl(dates: list[str]) -> stockanalysis.TwseCrawker:
+        crawler = stockanalysis.TwseCrawker(1, twse_client=client, csv_repository=repository)
+        crawler.iso_scheduled_times = dates
+        crawler.get_twse_daily_stocks("shirong", DummyStockType, ["2382"], incremental=True)
+        return crawler
+
+    crawl(["2026-10-15", "2026-10-16"])
+    inner.reads.clear()
+    crawler = crawl(["2026-10-15", "2026-10-16", "2026-10-19"])
+
+    assert client.calls == ["20261015", "20261016", "20261019"]
+    assert inner.reads == []
+    assert crawler.daily_dates[0] == ["2026-10-15", "2026-10-16", "2026-10-19"]
+    assert (tmp_path / "shirong_20261019.csv").exists()
+    assert repository.forget_before("20261016") == 1
+    assert pickle.loads(pickle.dumps(repository)).stored_dates("shirong") == {"20261015", "20261016", "20261019"}
+
+
+def test_keep_warm_service_reuses_one_repository_per_backend() -> None:
+    service = StockAnalysisService(keep_warm=True)
+    request = StockAnalysisRequest(stocklist=["2382"], holidays=[], stocktype=DummyStockType, output_file_names="a", endbacktrack=5)
+
+    assert isinstance(service._get_repository(request), WarmRepository)
+    assert service._get_repository(request) is service._get_repository(request)
+    assert StockAnalysisService()._get_repository(request) is None
+
+
+def test_keep_warm_service_feeds_the_same_streams_and_panel(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(stock_service, "STRATEGY_STATE_DIR", tmp_path / "streams")
+    monkeypatch.setattr(stock_service, "PANEL_DIR", tmp_path / "panels")
+    windows = iter([["2026-10-14", "2026-10-15"], ["2026-10-15", "2026-10-16"]])
+    monkeypatch.setattr(stockanalysis.TwseCrawker, "scheduled_dates", lambda self, *args, **kwargs: next(windows))
+    service = StockAnalysisService(twse_client=CountingClient(), keep_warm=True)
+    service._warm_repositories["csv"] = WarmRepository(CsvRepository(tmp_path))
+    request = StockAnalysisRequest(
+        stocklist=["2382"], holidays=[], stocktype=DummyStockType, output_file_names="a", endbacktrack=5,
+        incremental=True, storage="csv", panel=True,
+    )
+
+    first = service._crawl(request)
+    first.cal_low_entry_strategy()
+    stream = first.strategy_streams["2382"]["stream"]
+    second = service._crawl(request)
+    second.cal_low_entry_strategy()
+
+    assert second.strategy_streams is first.strategy_streams
+    assert second.strategy_streams["2382"] == {"date": "2026-10-16", "stream": stream}
+    assert second.price_panel is first.price_panel
+    assert second.price_panel.dates == ["2026-10-15", "2026-10-16"]
+    assert second.price_panel.series(0, "close").tolist() == [
+        float(CountingClient().get_daily_stock_rows(date, 13)[0][8]) * 1000 for date in ("20261015", "20261016")
+    ]
+
+
+class FakeService:
+    def __init__(self, outcomes: list[dict[str, str]], stop: threading.Event | None = None) -> None:
+        # Per run: output prefix -> "collected", "missing", "closed", or absent when the job fails.
+        self.outcomes = outcomes
+        self.stop = stop
+        self.batches: list[list[StockAnalysisRequest]] = []
+        self.mailed: list[str] = []
+        self.forgotten: list[str] = []
+
+    def run_jobs(self, requests, workers, mail_if):
+        self.batches.append(list(requests))
+        outcome = self.outcomes[len(self.batches) - 1]
+        crawlers = []
+        for request in requests:
+            state = outcome.get(request.output_file_names)
+            if state is None:
+                crawlers.append(None)
+                continue
+            crawler = SimpleNamespace(
+                iso_scheduled_times=["2026-10-15", "2026-10-16"] if state == "collected" else ["2026-10-15"],
+                known_closed_dates=lambda stocktype, state=state: {"20261016"} if state == "closed" else set(),
+            )
+            if mail_if(crawler):
+                self.mailed.append(request.output_file_names)
+            crawlers.append(crawler)
+        if self.stop is not None and len(self.batches) == len(self.outcomes):
+            self.stop.set()
+        return crawlers
+
+    def forget_rows_before(self, scheduled_time: str) -> None:
+        self.forgotten.append(scheduled_time)
+
+
+def test_daemon_retries_only_the_jobs_missing_the_session() -> None:
+    stop = threading.Event()
+    service = FakeService([
+        {"a": "collected", "b": "missing"},
+        {"b": "collected", "c": "closed"},
+    ], stop)
+    scheduler = MarketCloseScheduler(clock=lambda: taipei(2026, 10, 16, 15, 0))
+    requests = [
+        StockAnalysisRequest(
+            stocklist=["2382"], holidays=[], stocktype=DummyStockType, output_file_names=name, endbacktrack=30, migrate_storage=True
+        )
+        for name in ("a", "b", "c")
+    ]
+    daemon = StockAnalysisDaemon(service, requests, scheduler, retry_minutes=0)
+
+    daemon.serve(stop, run_now=True)
+
+    first, second = service.batches
+    assert [request.output_file_names for request in first] == ["a", "b", "c"]
+    assert [request.output_file_names for request in second] == ["b", "c"]
+    assert (first[0].incremental, first[0].beginbacktrack, first[0].migrate_storage) == (True, -1, True)
+    assert not any(request.migrate_storage for request in second)
+    assert service.mailed == ["a", "b"]
+    assert service.forgotten == ["20260915", "20260915"]
+
+
+def test_daemon_gives_up_after_the_retries() -> None:
+    stop = threading.Event()
+    service = FakeService([{"a": "missing"}] * 2)
+    scheduler = MarketCloseScheduler(clock=lambda: taipei(2026, 10, 16, 15, 0))
+    request = StockAnalysisRequest(stocklist=["2382"], holidays=[], stocktype=DummyStockType, output_file_names="a", endbacktrack=30)
+    daemon = StockAnalysisDaemon(service, [request], scheduler, retry_minutes=0, max_retries=1)
+
+    assert not daemon.run_session(datetime.date(2026, 10, 16), stop)
+    assert len(service.batches) == 2
+    assert service.mailed == []
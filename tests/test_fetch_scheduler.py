@@ -0,0 +1,75 @@
+from infrastructure.crawler.fetch_scheduler import FetchScheduler
+from infrastructure.crawler.fetch_scheduler import TokenBucket
+from infrastructure.crawler.response_cache import ResponseCache
+from infrastructure.crawler.twse_client import TwseClient
+from twstockcrawler import TwStockCrawler
+
+
+def make_client(server, tmp_path, scheduler: FetchScheduler) -> TwseClient:
+    crawler = TwStockCrawler()
+    crawler.url = server.url
+    return TwseClient(crawler=crawler, cache=ResponseCache(tmp_path), scheduler=scheduler)
+
+
+def test_concurrent_fetches_are_delivered_in_date_order(twse_server, tmp_path) -> None:
+    dates = ["20260601", "20260602", "20260603", "20260604", "20260605"]
+    client = make_client(twse_server, tmp_path, FetchScheduler(rate_per_second=100, burst=5, max_workers=3))
+
+    results = list(client.iter_daily_stock_rows(dates, 13))
+
+    assert [date_time for date_time, _ in results] == dates
+    assert [rows[0][2] for _, rows in results] == dates
+    assert sorted(twse_server.requests) == dates
+    assert client.throughput_report.requests == 5
+    assert client.throughput_report.requests_per_second > 0
+
+
+def test_cached_dates_skip_the_scheduler(twse_server, tmp_path) -> None:
+    dates = ["20260601", "20260602"]
+    client = make_client(twse_server, tmp_path, FetchScheduler(rate_per_second=100, burst=5, max_workers=2))
+    list(client.iter_daily_stock_rows(dates, 13))
+
+    results = list(client.iter_daily_stock_rows(dates + ["20260603"], 13))
+
+    assert [date_time for date_time, _ in results] == dates + ["20260603"]
+    assert len(twse_server.requests) == 3
+    assert client.throughput_report.requests == 1
+
+
+def test_failed_requests_are_retried_and_reported(twse_server, tmp_path) -> None:
+    twse_server.failures_left["20260602"] = 1
+    scheduler = FetchScheduler(rate_per_second=100, burst=5, max_workers=2, max_retries=2, retry_backoff_seconds=0)
+    client = make_client(twse_server, tmp_path, scheduler)
+
+    results = list(client.iter_daily_stock_rows(["20260601", "20260602"], 13))
+
+    assert [rows[0][2] for _, rows in results] == ["20260601", "20260602"]
+    assert client.throughput_report.retries == 1
+    assert client.throughput_report.requests == 3
+    assert client.throughput_report.failures == 0
+
+
+def test_rate_limit_spaces_out_requests(twse_server, tmp_path) -> None:
+    scheduler = FetchScheduler(rate_per_second=20, burst=1, max_workers=4)
+    client = make_client(twse_server, tmp_path, scheduler)
+
+    list(client.iter_daily_stock_rows(["20260602", "20260603", "20260604", "20260605", "20260608"], 13))
+
+    assert client.throughput_report.elapsed_seconds >= 0.19
+    assert client.throughput_report.queue_wait_seconds > 0
+
+
+def test_token_bucket_waits_for_refill() -> None:
+    now = [0.0]
+    sleeps: list[float] = []
+
+    def sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    bucket = TokenBucket(rate_per_second=2, capacity=2, clock=lambda: now[0], sleep=sleep)
+
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0.5
+    assert sleeps == [0.5]
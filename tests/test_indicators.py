@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+from domain.strategies.low_entry_score import LowEntryScoreStrategy
+from domain.strategies.low_entry_score_v3 import LowEntryScoreV3Strategy
+from twse.indicators import IndicatorStore
+
+
+def make_history(days: int = 80) -> pd.DataFrame:
+    close = 100 + np.sin(np.arange(days) / 5) * 10
+    return pd.DataFrame(
+        {
+            "Open": close + 0.5,
+            "High": close + 1,
+            "Low": close - 1,
+            "Close": close,
+            "Volume": np.arange(days) * 10.0,
+            "PE": 12.0,
+        }
+    )
+
+
+def test_strategies_share_indicators_through_one_store() -> None:
+    store = IndicatorStore()
+    history = make_history()
+
+    LowEntryScoreStrategy(indicators=store).run(history)
+    misses = store.stats.misses
+    result = LowEntryScoreV3Strategy(indicators=store).run(history)
+    rerun = LowEntryScoreV3Strategy(indicators=store).run(history)
+
+    # v3 reuses RSI, MACD, MA20, STD20, ATR14 and the volume MA; only its
+    # three EMAs and OBV are new, and the rerun is served entirely from cache.
+    assert store.stats.misses - misses == 4
+    assert store.stats.hits == 6 + 10
+    pd.testing.assert_frame_equal(result, rerun)
+    assert 0 < store.stats.hit_rate < 1
+
+
+def test_changed_data_gets_a_new_version() -> None:
+    store = IndicatorStore()
+    close = pd.Series([1.0, 2.0, 3.0])
+
+    first = store.bind("2330", close=close).sma("close", 2)
+    revised = store.bind("2330", close=pd.Series([1.0, 2.0, 5.0])).sma("close", 2)
+
+    assert first.tolist() == [1.0, 1.5, 2.5]
+    assert revised.tolist() == [1.0, 1.5, 3.5]
+    assert store.stats.hits == 0
+
+
+def test_least_recently_used_entries_are_evicted_by_size() -> None:
+    close = pd.Series(np.arange(100, dtype="float64"))
+    entry_bytes = IndicatorStore().bind(close=close).sma("close", 5).memory_usage(index=True)
+    store = IndicatorStore(max_bytes=int(entry_bytes * 2))
+    features = store.bind("2330", close=close)
+
+    features.sma("close", 5)
+    features.sma("close", 10)
+    features.sma("close", 5)
+    features.sma("close", 20)
+
+    assert store.entries == 2
+    assert store.total_bytes <= store.max_bytes
+    assert store.stats.evictions == 1
+    features.sma("close", 5)
+    assert store.stats.hits == 2
+
+    store.invalidate("2330")
+    assert store.entries == 0
+    assert store.total_bytes == 0
@@ -0,0 +1,80 @@
+import json
+import threading
+
+from application.stock_service import StockAnalysisRequest
+from application.stock_service import StockAnalysisService
+from infrastructure.crawler.fetch_scheduler import FetchScheduler
+from infrastructure.crawler.negative_cache import NegativeCache
+from infrastructure.crawler.response_cache import ResponseCache
+from infrastructure.crawler.twse_client import TwseClient
+from infrastructure.instrumentation import count
+from infrastructure.instrumentation import current_recorder
+from infrastructure.instrumentation import record_run
+from infrastructure.instrumentation import span
+from infrastructure.storage.csv_repository import CsvRepository
+from stockanalysis import TwseCrawker
+
+
+class DummyStockType:
+    value = (13,)
+
+
+class RowsCrawler:
+    def get_stocktype_data(self, date_time: str, stocktype: int) -> list[list[str]]:
+        close = str(100 + int(date_time[-2:]))
+        return [
+            ["2382", "廣達", "1,000", "10", "58,000", close, close, close, close, "+", "0.5", close, "1", close, "1", "12.3"],
+            ["2382", "廣達", "1,000", "10", "58,000", "1", "1", "1", "1", "+", "0.5", "1", "1", "1", "1", "12.3"],
+            ["bad row"],
+        ]
+
+
+def test_spans_merge_per_name_and_key_and_are_no_ops_outside_a_run() -> None:
+    with span("outside"):
+        count("outside")
+    assert current_recorder() is None
+
+    with record_run("run") as recorder:
+        for stock in ["2330", "2330", "2382"]:
+            with span("strategy"), span("stock", stock):
+                count("stocks")
+        thread = threading.Thread(target=lambda: span("thread").__enter__())
+        thread.start()
+        thread.join()
+
+    report = recorder.to_dict()
+    strategy, thread_span = report["spans"]
+    assert (strategy["name"], strategy["calls"]) == ("strategy", 3)
+    assert [(child["key"], child["calls"]) for child in strategy["children"]] == [("2330", 2), ("2382", 1)]
+    assert thread_span["name"] == "thread"
+    assert report["counters"] == {"stocks": 3}
+    assert current_recorder() is None
+
+
+def test_run_writes_a_json_report_next_to_the_analysis_dataset(tmp_path) -> None:
+    client = TwseClient(
+        crawler=RowsCrawler(),
+        cache=ResponseCache(tmp_path / "mi_index"),
+        scheduler=FetchScheduler(rate_per_second=100, burst=5),
+        negative_cache=NegativeCache(tmp_path / "closed_days.json"),
+    )
+    service = StockAnalysisService(
+        crawler_factory=lambda size: TwseCrawker(size, twse_client=client, csv_repository=CsvRepository(tmp_path))
+    )
+    request = StockAnalysisRequest(
+        stocklist=["2382"], holidays=[], stocktype=DummyStockType, output_file_names="shirong", endbacktrack=8
+    )
+
+    service.run(request)
+
+    report = json.loads((tmp_path / "shirong_run_report.json").read_text())
+    stages = {stage["name"]: stage for stage in report["spans"]}
+    fetches = [child for child in stages["crawl"]["children"] if child["name"] == "fetch"]
+    sessions = report["counters"]["twse_requests"]
+    assert len(fetches) == sessions == report["counters"]["response_cache_misses"]
+    assert {"twse_request", "max_profit", "write_analysis_dataset"} <= set(stages)
+    assert stages["write_analysis_dataset"]["children"][0]["name"] == "analysis_dataset"
+    assert report["counters"]["rows_parsed"] == 3 * sessions
+    assert report["counters"]["rows_rejected"] == report["counters"]["rows_duplicate"] == sessions
+    assert report["memory"]["peak_rss_bytes"] > 0
+    assert report["attributes"]["mode"] == "analysis"
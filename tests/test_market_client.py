@@ -0,0 +1,71 @@
+import datetime
+
+from infrastructure.crawler.fetch_scheduler import FetchScheduler
+from infrastructure.crawler.market_client import MarketWideTwseClient
+from infrastructure.crawler.market_client import SectorMembership
+from infrastructure.crawler.response_cache import ResponseCache
+from infrastructure.crawler.twse_client import TwseClient
+
+
+def row(stock_no: str, close: str) -> list[str]:
+    return [stock_no, "name", "1,000", "10", "58,000", close, close, close, close, "+", "0.5", close, "1", close, "1", "12.3"]
+
+
+class MarketCrawler:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, int | str]] = []
+
+    def get_stocktype_data(self, date_time: str, stocktype: int | str) -> list[list[str]]:
+        self.calls.append((date_time, stocktype))
+        if stocktype == "ALLBUT0999":
+            return [row("1101", date_time), row("2330", date_time), row("2382", date_time), row("2303", date_time)]
+        if stocktype == 13:
+            return [row("2382", date_time), row("2330", date_time)]
+        if stocktype == 24:
+            return [row("2303", date_time), row("2330", date_time)]
+        return []
+
+
+def make_client(tmp_path, crawler: MarketCrawler, today: datetime.date = datetime.date(2026, 6, 20)) -> MarketWideTwseClient:
+    twse_client = TwseClient(
+        crawler=crawler,
+        cache=ResponseCache(tmp_path / "cache"),
+        scheduler=FetchScheduler(rate_per_second=100, burst=5, max_workers=2),
+    )
+    membership = SectorMembership(tmp_path / "membership.json", max_age_days=7, today=lambda: today)
+    return MarketWideTwseClient(twse_client, membership)
+
+
+def test_one_market_fetch_per_date_serves_every_sector(tmp_path) -> None:
+    crawler = MarketCrawler()
+    client = make_client(tmp_path, crawler)
+
+    elec = list(client.iter_daily_stock_rows(["20260615", "20260616"], 13))
+    semi = list(client.iter_daily_stock_rows(["20260615", "20260616"], 24))
+
+    assert [[stock[0] for stock in rows] for _, rows in elec] == [["2382", "2330"], ["2382", "2330"]]
+    assert [[stock[0] for stock in rows] for _, rows in semi] == [["2303", "2330"], ["2303", "2330"]]
+    assert elec[1][1][0][5] == "20260616"
+    assert sorted(call for call in crawler.calls if call[1] == "ALLBUT0999") == [
+        ("20260615", "ALLBUT0999"),
+        ("20260616", "ALLBUT0999"),
+    ]
+
+
+def test_sector_membership_is_persisted_between_runs(tmp_path) -> None:
+    make_client(tmp_path, MarketCrawler()).get_daily_stock_rows("20260615", 13)
+
+    crawler = MarketCrawler()
+    rows = make_client(tmp_path, crawler).get_daily_stock_rows("20260616", 13)
+
+    assert [stock[0] for stock in rows] == ["2382", "2330"]
+    assert crawler.calls == [("20260616", "ALLBUT0999")]
+
+
+def test_stale_membership_is_refreshed(tmp_path) -> None:
+    make_client(tmp_path, MarketCrawler()).get_daily_stock_rows("20260615", 13)
+
+    crawler = MarketCrawler()
+    make_client(tmp_path, crawler, today=datetime.date(2026, 7, 20)).get_daily_stock_rows("20260616", 13)
+
+    assert ("20260616", 13) in crawler.calls
@@ -0,0 +1,91 @@
+import datetime
+
+from infrastructure.crawler.negative_cache import NegativeCache
+from infrastructure.crawler.negative_cache import write_holidays
+from infrastructure.crawler.response_cache import ResponseCache
+from infrastructure.crawler.twse_client import TwseClient
+from stockanalysis import TwseCrawker
+
+
+class ClosedDayCrawler:
+    def __init__(self, closed: set[str]) -> None:
+        self.closed = closed
+        self.calls: list[str] = []
+
+    def get_stocktype_data(self, date_time: str, stocktype: int) -> list[list[str]]:
+        self.calls.append(date_time)
+        if date_time in self.closed:
+            return []
+        return [["2382", "廣達", "1,000", "10", "58,000", "100", "105", "99", "104", "+", "0.5", "104", "1", "105", "1", "12.3"]]
+
+
+def make_client(tmp_path, crawler: ClosedDayCrawler, today: datetime.date) -> TwseClient:
+    negative_cache = NegativeCache(tmp_path / "closed_days.json", confirm_after=2, today=lambda: today)
+    return TwseClient(crawler=crawler, cache=ResponseCache(tmp_path / "mi_index"), negative_cache=negative_cache)
+
+
+def test_closure_is_confirmed_after_empty_replies_on_different_days(tmp_path) -> None:
+    crawler = ClosedDayCrawler({"20260612"})
+
+    make_client(tmp_path, crawler, datetime.date(2026, 6, 13)).get_daily_stock_rows("20260612", 13)
+    make_client(tmp_path, crawler, datetime.date(2026, 6, 13)).get_daily_stock_rows("20260612", 13)
+    assert crawler.calls == ["20260612", "20260612"]
+
+    make_client(tmp_path, crawler, datetime.date(2026, 6, 15)).get_daily_stock_rows("20260612", 13)
+    client = make_client(tmp_path, crawler, datetime.date(2026, 6, 16))
+
+    assert client.get_daily_stock_rows("20260612", 13) == []
+    assert len(crawler.calls) == 3
+    assert client.known_closed_dates(13) == {"20260612"}
+    assert client.known_closed_dates() == set()
+
+
+def test_empty_reply_on_the_session_day_is_not_recorded(tmp_path) -> None:
+    crawler = ClosedDayCrawler({"20260612"})
+    cache = NegativeCache(tmp_path / "closed_days.json", confirm_after=1, today=lambda: datetime.date(2026, 6, 12))
+
+    TwseClient(crawler=crawler, cache=ResponseCache(tmp_path / "mi_index"), negative_cache=cache).get_daily_stock_rows("20260612", 13)
+
+    assert not cache.is_confirmed("20260612", 13)
+
+
+def test_rows_clear_a_pending_closure(tmp_path) -> None:
+    crawler = ClosedDayCrawler({"20260612"})
+    make_client(tmp_path, crawler, datetime.date(2026, 6, 13)).get_daily_stock_rows("20260612", 13)
+
+    crawler.closed.clear()
+    make_client(tmp_path, crawler, datetime.date(2026, 6, 14)).get_daily_stock_rows("20260612", 13)
+    crawler.closed.add("20260612")
+    ResponseCache(tmp_path / "mi_index").clear()
+    make_client(tmp_path, crawler, datetime.date(2026, 6, 15)).get_daily_stock_rows("20260612", 13)
+
+    assert make_client(tmp_path, crawler, datetime.date(2026, 6, 16)).known_closed_dates(13) == set()
+
+
+def test_confirmed_closures_are_dropped_from_scheduled_dates_and_written_as_holidays(tmp_path) -> None:
+    cache = NegativeCache(tmp_path / "closed_days.json", confirm_after=1, today=lambda: datetime.date(2026, 6, 20))
+    cache.record_empty("20260617", "ALLBUT0999")
+    crawler = TwseCrawker(1, twse_client=TwseClient(crawler=ClosedDayCrawler(set()), cache=ResponseCache(tmp_path / "mi_index"), negative_cache=cache))
+
+    dates = crawler.scheduled_dates(0, 5, ["20260619"], now_date_time=datetime.datetime(2026, 6, 20))
+
+    assert dates == ["2026-06-15", "2026-06-16", "2026-06-18"]
+
+    output_path = write_holidays(tmp_path / "holidays_2026", {"20260619", "20251225"} | cache.closed_dates(), 2026)
+    assert output_path.read_text() == "20260617,20260619\n"
+
+
+class SectorType:
+    def __init__(self, code: int) -> None:
+        self.value = (code,)
+
+
+def test_a_sector_closure_only_drops_the_date_for_that_sector(tmp_path) -> None:
+    cache = NegativeCache(tmp_path / "closed_days.json", confirm_after=1, today=lambda: datetime.date(2026, 6, 20))
+    cache.record_empty("20260617", 13)
+    crawler = TwseCrawker(1, twse_client=TwseClient(crawler=ClosedDayCrawler(set()), cache=ResponseCache(tmp_path / "mi_index"), negative_cache=cache))
+    now = datetime.datetime(2026, 6, 20)
+
+    assert "2026-06-17" not in crawler.scheduled_dates(0, 5, [], now_date_time=now, stocktype=SectorType(13))
+    assert "2026-06-17" in crawler.scheduled_dates(0, 5, [], now_date_time=now, stocktype=SectorType(24))
+    assert crawler.known_closed_dates() == cache.closed_dates() == set()
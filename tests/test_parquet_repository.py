@@ -0,0 +1,56 @@
+import pytest
+
+from infrastructure.storage.csv_repository import CsvRepository
+
+pytest.importorskip("pyarrow")
+
+from infrastructure.storage.parquet_repository import ParquetRepository  # noqa: E402
+from infrastructure.storage.parquet_repository import migrate_csv_to_parquet  # noqa: E402
+
+
+def row(stock_no: str, close: str, pe: str = "12.3") -> list[str]:
+    return [stock_no, "name", "1000", "10", "58000", close, close, close, close, "+", "0.5", close, "1", close, "1", pe]
+
+
+def test_daily_rows_round_trip_with_typed_columns(tmp_path) -> None:
+    repository = ParquetRepository(tmp_path)
+    repository.write_daily_rows("shirong", "20260615", [row("2382", "104.5"), [], row("2330", "1,005", pe="--")])
+
+    frame = repository.scan("shirong")
+
+    assert repository.stored_dates("shirong") == {"20260615"}
+    assert frame["stock_no"].tolist() == ["2382", "2330"]
+    assert frame["close"].tolist() == [104.5, 1005.0]
+    assert str(frame["volume"].dtype) == "int64"
+    assert frame["pe"].isna().tolist() == [False, True]
+
+    stored = repository.read_daily_rows("shirong", "20260615")
+    assert stored[0][0] == "2382"
+    assert stored[1][15] == "--"
+    assert float(stored[1][8]) == 1005.0
+
+
+def test_scan_filters_by_stock_and_date_range(tmp_path) -> None:
+    repository = ParquetRepository(tmp_path)
+    repository.write_many("shirong", {
+        "20260529": [row("2382", "100"), row("2330", "900")],
+        "20260601": [row("2382", "101"), row("2330", "901")],
+        "20260602": [row("2382", "102"), row("2330", "902")],
+    })
+    repository.write_daily_rows("shirong", "20260601", [row("2382", "111")])
+
+    frame = repository.scan("shirong", stock_nos=["2382"], start="20260601", end="20260630")
+
+    assert frame["close"].tolist() == [111.0, 102.0]
+    assert sorted(path.name for path in (tmp_path / "columnar" / "shirong").iterdir()) == ["202605.parquet", "202606.parquet"]
+
+
+def test_csv_store_is_migrated_once(tmp_path) -> None:
+    csv_repository = CsvRepository(tmp_path)
+    csv_repository.write_daily_rows("shirong", "20260615", [row("2382", "104")])
+    csv_repository.write_daily_rows("shirong", "20260616", [row("2382", "105")])
+    parquet_repository = ParquetRepository(tmp_path)
+
+    assert migrate_csv_to_parquet("shirong", csv_repository, parquet_repository) == 2
+    assert migrate_csv_to_parquet("shirong", csv_repository, parquet_repository) == 0
+    assert parquet_repository.read_daily_rows("shirong", "20260616") == [row("2382", "105.0")]
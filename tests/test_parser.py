@@ -0,0 +1,51 @@
+import numpy as np
+
+from twse.parser import NUMERIC_COLUMNS
+from twse.parser import clean_cell
+from twse.parser import parse_price
+from twse.parser import parse_stock_rows
+
+
+def row(stock_no: str, close: str, name: str = "name") -> list[str]:
+    return [stock_no, name, "1,000", "10", "58,000", close, close, close, close, "+", "0.5", close, "1", close, "1", "--"]
+
+
+def test_bulk_parse_matches_per_cell_parsing() -> None:
+    rows = [
+        row("2330", "1,005.5"),
+        row(" 2382 ", "--"),
+        row("2303", ""),
+        row("2317", "n/a"),
+        ["2308", "short"],
+        "not a row",
+        row("1101", " 42 ") + ["extra"],
+    ]
+
+    parsed = parse_stock_rows(rows)
+
+    assert parsed.valid.tolist() == [True, True, True, True, False, False, True]
+    assert parsed.stock_no.tolist() == ["2330", "2382", "2303", "2317", "", "", "1101"]
+    for name, column in NUMERIC_COLUMNS.items():
+        expected = [
+            parse_price(stock_row[column]) if valid else None
+            for stock_row, valid in zip(rows, parsed.valid)
+        ]
+        np.testing.assert_array_equal(parsed.numeric(name), np.array(expected, dtype="float64"))
+    assert parsed.has_ohlc.tolist() == [True, False, False, False, False, False, True]
+    assert parsed.stock_name[0] == clean_cell(rows[0][1])
+
+
+def test_first_indices_keep_the_first_duplicate() -> None:
+    parsed = parse_stock_rows([row("2330", "1"), row("2382", "2"), row("2330", "3"), row("", "4")])
+
+    assert parsed.first_indices() == {"2330": 0, "2382": 1}
+    assert len(parse_stock_rows([])) == 0
+
+
+def test_text_rows_clean_only_the_selected_rows() -> None:
+    rows = [row("2330", "1,005.5"), row(" 2382 ", "--", name=" 廣達 "), ["2308", "short"]]
+
+    parsed = parse_stock_rows(rows)
+
+    assert parsed.text_rows([1, 0]) == [[clean_cell(cell) for cell in rows[1]], [clean_cell(cell) for cell in rows[0]]]
+    assert parsed.text_rows([]) == []
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+
+from infrastructure.storage.price_panel import PricePanel
+from twse.analyzer import max_profit_k_transactions_panel
+from twse.analyzer import max_profit_panel
+from twse.analyzer import max_profit_unlimited_panel
+from twse.analyzer import max_profit_with_fee_panel
+from tests.test_stockanalysis import CapturingTwseCrawler
+from tests.test_stockanalysis import DummyStockType
+from tests.test_stockanalysis import twse_row
+
+
+def crawled(rows_by_date: dict[str, list[list[str]]], stocks: list[str]) -> CapturingTwseCrawler:
+    crawler = CapturingTwseCrawler(len(stocks), {date.replace("-", ""): rows for date, rows in rows_by_date.items()})
+    crawler.iso_scheduled_times = list(rows_by_date)
+    crawler.get_twse_daily_stocks("test", DummyStockType, stocks)
+    return crawler
+
+
+def test_memory_mapped_panel_is_shared_without_loading(tmp_path) -> None:
+    crawler = crawled({
+        "2026-06-15": [twse_row("10", "11", "9", "10.5", stock_no="2382"), twse_row("20", "21", "19", "20", stock_no="2330")],
+        "2026-06-16": [twse_row("11", "12", "10", "11.5", stock_no="2382"), twse_row("21", "22", "20", "21", stock_no="2330")],
+    }, ["2382", "2330"])
+    crawler.build_price_panel(tmp_path / "panel")
+
+    panel = PricePanel.open(tmp_path / "panel")
+
+    assert isinstance(panel.field("close"), np.memmap)
+    assert panel.shape == (2, 2)
+    assert panel.series("2330", "close").tolist() == [20000.0, 21000.0]
+    assert np.shares_memory(panel.series("2382", "open"), panel.field("open"))
+    assert np.shares_memory(panel.kernel_prices(), panel.field("open"))
+    assert panel.field("volume").dtype == np.int64
+
+
+def test_panel_history_matches_list_history_for_ragged_stocks() -> None:
+    crawler = crawled({
+        "2026-06-15": [twse_row("10", "11", "9", "10.5", stock_no="2382"), twse_row("--", "--", "--", "--", stock_no="2330")],
+        "2026-06-16": [twse_row("11", "12", "10", "11.5", stock_no="2382", pe_ratio="--"), twse_row("21", "22", "20", "21", stock_no="2330")],
+    }, ["2382", "2330"])
+    expected = [crawler.build_strategy_history(item) for item in range(2)]
+
+    crawler.build_price_panel()
+
+    for item in range(2):
+        pd.testing.assert_frame_equal(crawler.build_strategy_history(item), expected[item])
+
+
+def test_advance_slides_the_window_and_writes_only_new_sessions(tmp_path) -> None:
+    dates = ["2026-06-{:02d}".format(day) for day in range(15, 20)]
+    rows_by_date = {date: [twse_row(str(10 + day), "30", "5", str(10 + day), stock_no="2382")] for day, date in enumerate(dates)}
+    panel = crawled(dict(list(rows_by_date.items())[:3]), ["2382"]).build_price_panel(tmp_path / "panel", capacity=4)
+
+    for end in (4, 5):
+        window = dict(list(rows_by_date.items())[end - 3:end])
+        crawler = crawled(window, ["2382"])
+        assert crawler.build_price_panel(tmp_path / "panel", previous=panel, capacity=4) is panel
+        assert panel.dates == list(window)
+        assert panel.series("2382", "open").tolist() == [float(value[0][5]) * 1000 for value in window.values()]
+
+    reopened = PricePanel.open(tmp_path / "panel")
+    pd.testing.assert_frame_equal(reopened.history("2382"), panel.history("2382"))
+
+    assert panel.advance(dates[:2]) is None
+    assert panel.advance(dates[2:] + ["2026-06-22", "2026-06-23", "2026-06-24"]) == ["2026-06-22", "2026-06-23", "2026-06-24"]
+    assert panel.shape == (6, 1)
+    assert panel.series("2382", "close").tolist()[:3] == [12000.0, 13000.0, 14000.0]
+    assert not panel.valid[3:].any()
+    assert PricePanel.open(tmp_path / "panel").dates == panel.dates
+
+
+def test_profit_kernels_read_the_panel_with_gaps_filled() -> None:
+    crawler = crawled({
+        "2026-06-15": [twse_row("10", "11", "9", "10", stock_no="2382"), twse_row("--", "--", "--", "--", stock_no="2330")],
+        "2026-06-16": [twse_row("14", "15", "13", "14", stock_no="2382"), twse_row("21", "22", "20", "21", stock_no="2330")],
+        "2026-06-17": [twse_row("--", "--", "--", "--", stock_no="2382"), twse_row("18", "22", "17", "18", stock_no="2330")],
+        "2026-06-18": [twse_row("9", "10", "8", "9", stock_no="2382"), twse_row("25", "26", "24", "25", stock_no="2330")],
+        "2026-06-19": [twse_row("16", "17", "15", "16", stock_no="2382"), twse_row("--", "--", "--", "--", stock_no="2330")],
+    }, ["2382", "2330", "9999"])
+    kernels = [
+        max_profit_panel,
+        max_profit_unlimited_panel,
+        lambda prices: max_profit_k_transactions_panel(1, prices),
+        lambda prices: max_profit_with_fee_panel(prices, 300),
+    ]
+    expected = [kernel(crawler.stack_open_prices()) for kernel in kernels]
+
+    crawler.build_price_panel()
+
+    for kernel, profits in zip(kernels, expected):
+        np.testing.assert_array_equal(kernel(crawler.stack_open_prices()), profits)
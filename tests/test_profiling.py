@@ -0,0 +1,48 @@
+import datetime
+import pstats
+import tracemalloc
+
+import pytest
+
+from infrastructure.profiling import profile_run
+from interface.cli import build_request
+from interface.cli import profile_name
+
+
+def allocate_prices(days: int) -> list[list[float]]:
+    return [[float(day * stock) for stock in range(100)] for day in range(days)]
+
+
+def test_profile_run_writes_cpu_and_memory_profiles(tmp_path) -> None:
+    with profile_run("both", "ELEC_shirong_20260101-20260131", output_dir=tmp_path, top=5) as paths:
+        prices = allocate_prices(200)
+
+    assert [path.name for path in paths] == [
+        "ELEC_shirong_20260101-20260131_cpu.pstats",
+        "ELEC_shirong_20260101-20260131_cpu.txt",
+        "ELEC_shirong_20260101-20260131_mem.txt",
+    ]
+    assert any(function[2] == "allocate_prices" for function in pstats.Stats(str(paths[0])).stats)
+    assert "allocate_prices" in paths[1].read_text()
+    memory = paths[2].read_text()
+    assert memory.startswith("Traced peak: ")
+    assert "test_profiling.py" in memory
+    assert not tracemalloc.is_tracing()
+    assert len(prices) == 200
+
+    with pytest.raises(ValueError):
+        with profile_run("disk", "name", output_dir=tmp_path):
+            pass
+
+
+def test_profile_files_are_named_after_stocktype_and_date_range() -> None:
+    request = build_request(["-o", "shirong", "-e", "30", "-b", "1", "-t", "SEMI", "--profile", "cpu", "0", "20260101"])
+
+    assert profile_name(request, today=datetime.date(2026, 10, 18)) == "SEMI_shirong_20260918-20261016"
+
+
+def test_profile_names_use_the_first_and_last_scheduled_sessions() -> None:
+    request = build_request(["-o", "shirong", "-e", "30", "-b", "1", "-t", "SEMI", "--profile", "cpu", "0", "20260101"])
+
+    # The window runs from Saturday 2026-09-19 to Saturday 2026-10-17.
+    assert profile_name(request, today=datetime.date(2026, 10, 19)) == "SEMI_shirong_20260921-20261016"
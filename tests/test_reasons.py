@@ -0,0 +1,13 @@
+from benchmarks.bench_reasons import REASON_CASES
+from benchmarks.bench_reasons import make_scores
+from benchmarks.bench_reasons import reason_arguments
+from benchmarks.bench_reasons import row_apply_reasons
+
+
+def test_vectorized_reasons_match_row_apply() -> None:
+    for _, strategy_cls, template, labels in REASON_CASES:
+        scores = make_scores(list(labels), rows=2_000)
+
+        actual = strategy_cls()._reasons(**reason_arguments(labels, scores))
+
+        assert actual.tolist() == row_apply_reasons(template, labels, scores).tolist()
@@ -0,0 +1,125 @@
+import datetime
+import os
+
+from infrastructure.crawler.response_cache import ResponseCache
+from infrastructure.crawler.twse_client import TwseClient
+
+
+ROWS = [["2382", "廣達", "1,000", "10", "58,000", "100", "105", "99", "104", "+", "0.5", "104", "1", "105", "1", "12.3"]]
+
+
+class CountingCrawler:
+    def __init__(self, rows: list[list[str]]) -> None:
+        self.rows = rows
+        self.calls: list[tuple[str, int]] = []
+
+    def get_stocktype_data(self, date_time: str, stocktype: int) -> list[list[str]]:
+        self.calls.append((date_time, stocktype))
+        return self.rows
+
+
+class FrozenClock:
+    def __init__(self, now: datetime.datetime) -> None:
+        self.now = now
+
+    def __call__(self) -> datetime.datetime:
+        return self.now
+
+
+def test_closed_session_is_served_without_network(tmp_path) -> None:
+    cache = ResponseCache(tmp_path, clock=FrozenClock(datetime.datetime(2026, 6, 18, 9)))
+    crawler = CountingCrawler(ROWS)
+    client = TwseClient(crawler=crawler, cache=cache)
+
+    assert client.get_daily_stock_rows("20260617", 13) == ROWS
+    assert client.get_daily_stock_rows("20260617", 13) == ROWS
+    assert TwseClient(crawler=crawler, cache=ResponseCache(tmp_path)).get_daily_stock_rows("20260617", 13) == ROWS
+
+    assert crawler.calls == [("20260617", 13)]
+    assert client.cache_stats.hits == 1
+    assert client.cache_stats.misses == 1
+
+
+def test_today_session_expires_after_ttl(tmp_path) -> None:
+    clock = FrozenClock(datetime.datetime.now())
+    today = clock.now.strftime("%Y%m%d")
+    cache = ResponseCache(tmp_path, today_ttl_seconds=60, clock=clock)
+    cache.put(today, 13, ROWS)
+
+    assert cache.get(today, 13) == ROWS
+
+    clock.now = clock.now + datetime.timedelta(seconds=120)
+
+    assert cache.get(today, 13) is None
+    assert cache.stats.expired == 1
+
+
+def test_empty_rows_and_future_dates_are_not_cached(tmp_path) -> None:
+    cache = ResponseCache(tmp_path, clock=FrozenClock(datetime.datetime(2026, 6, 18, 9)))
+    cache.put("20260617", 13, [])
+    cache.put("20260619", 13, ROWS)
+
+    assert cache.get("20260617", 13) is None
+    assert cache.get("20260619", 13) is None
+    assert cache.stats.stores == 0
+
+
+def test_size_limit_evicts_least_recently_used_entries(tmp_path) -> None:
+    cache = ResponseCache(tmp_path, clock=FrozenClock(datetime.datetime(2026, 6, 30, 9)))
+    cache.put("20260615", 13, [["2382", "a"]])
+    entry_size = cache.size_bytes()
+    cache.max_bytes = entry_size * 2
+
+    cache.put("20260616", 13, [["2382", "b"]])
+    assert cache.get("20260615", 13) == [["2382", "a"]]
+    cache.put("20260617", 13, [["2382", "c"]])
+
+    assert cache.get("20260616", 13) is None
+    assert cache.get("20260615", 13) == [["2382", "a"]]
+    assert cache.get("20260617", 13) == [["2382", "c"]]
+    assert cache.size_bytes() <= cache.max_bytes
+    assert cache.stats.evictions == 1
+
+
+def test_replaced_entries_release_their_old_payload(tmp_path) -> None:
+    clock = FrozenClock(datetime.datetime(2026, 6, 17, 10))
+    cache = ResponseCache(tmp_path, clock=clock)
+    cache.put("20260617", 13, [["2382", "a"]])
+    cache.put("20260616", 13, [["2382", "shared"]])
+    cache.put("20260615", 13, [["2382", "shared"]])
+    clock.now = clock.now + datetime.timedelta(hours=1)
+    cache.put("20260617", 13, [["2382", "revised"]])
+    cache.put("20260615", 13, [["2382", "b"]])
+
+    objects = sorted(path.stat().st_size for path in cache.objects_dir.rglob("*.json"))
+    assert len(objects) == 3
+    assert cache.size_bytes() == sum(objects)
+    assert cache.get("20260616", 13) == [["2382", "shared"]]
+
+
+def test_index_is_rebuilt_in_recency_order_and_drops_orphans(tmp_path) -> None:
+    cache = ResponseCache(tmp_path, clock=FrozenClock(datetime.datetime(2026, 6, 30, 9)))
+    cache.put("20260615", 13, [["2382", "a"]])
+    cache.put("20260616", 13, [["2382", "b"]])
+    os.utime(cache.refs_dir / "20260616_13.json", (1, 1))
+    (cache.refs_dir / "20260615_13.json").unlink()
+
+    reopened = ResponseCache(tmp_path, clock=FrozenClock(datetime.datetime(2026, 6, 30, 9)))
+    entry_size = reopened.size_bytes()
+    reopened.max_bytes = entry_size * 2
+    reopened.put("20260617", 13, [["2382", "c"]])
+    reopened.put("20260618", 13, [["2382", "d"]])
+
+    assert len(list(reopened.objects_dir.rglob("*.json"))) == 2
+    assert reopened.get("20260616", 13) is None
+    assert reopened.stats.evictions == 1
+
+
+def test_corrupted_payload_is_treated_as_miss(tmp_path) -> None:
+    cache = ResponseCache(tmp_path, clock=FrozenClock(datetime.datetime(2026, 6, 18, 9)))
+    cache.put("20260617", 13, ROWS)
+    for path in cache.objects_dir.rglob("*.json"):
+        path.write_text("[]")
+
+    assert cache.get("20260617", 13) is None
+    assert cache.stats.misses == 1
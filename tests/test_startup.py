@@ -0,0 +1,80 @@
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Cumulative `-X importtime` of interface.cli for `main.py --help`. A cold
+# start takes about 50 ms; pandas alone would add about 400 ms.
+CLI_IMPORT_BUDGET_SECONDS = 0.25
+
+ANALYSIS_MODULES = {
+    "pandas",
+    "matplotlib",
+    "tabulate",
+    "domain.strategies.low_entry_score_v3",
+    "infrastructure.report.html_renderer",
+}
+
+CRAWL_SCRIPT = """
+import sys
+
+from infrastructure.storage.csv_repository import CsvRepository
+from stockanalysis import TwseCrawker
+
+class CachedClient:
+    def iter_daily_stock_rows(self, date_times, stocktype):
+        row = ["2330", "台積電", "1,000", "10", "58,000", "10", "11", "9", "10", "+", "0.5", "10", "1", "10", "1", "12"]
+        for date_time in date_times:
+            yield date_time, [row]
+
+class StockType:
+    value = (24,)
+
+crawler = TwseCrawker(1, twse_client=CachedClient(), csv_repository=CsvRepository(sys.argv[1]))
+crawler.iso_scheduled_times = ["2026-06-16", "2026-06-17"]
+crawler.get_twse_daily_stocks("bench", StockType, ["2330"])
+assert crawler.daily_closes == [[10000.0, 10000.0]]
+print("\\n".join(sys.modules))
+"""
+
+
+def import_times(*args: str) -> dict[str, float]:
+    """Cumulative import seconds per module, from ``python -X importtime``."""
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) == 3 and fields[1].strip().isdigit():
+            times[fields[2].strip()] = int(fields[1]) / 1_000_000
+    return times
+
+
+def test_cli_help_stays_within_its_import_budget() -> None:
+    times = import_times("main.py", "--help")
+
+    assert not {"pandas", "numpy", "matplotlib", "tabulate", "requests", "stockanalysis"} & set(times)
+    assert times["interface.cli"] < CLI_IMPORT_BUDGET_SECONDS, "CLI cold start took {:.3f}s".format(times["interface.cli"])
+
+
+def test_storage_backends_import_without_pandas() -> None:
+    script = (
+        "import sys\n"
+        "import infrastructure.storage.csv_repository, infrastructure.storage.parquet_repository\n"
+        "print('pandas' in sys.modules)"
+    )
+    result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == "False"
+
+
+def test_crawl_stage_does_not_import_analysis_dependencies(tmp_path) -> None:
+    result = subprocess.run(
+        [sys.executable, "-c", CRAWL_SCRIPT, str(tmp_path)], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+
+    assert not ANALYSIS_MODULES & set(result.stdout.split())
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["bench_20260616.csv", "bench_20260617.csv"]
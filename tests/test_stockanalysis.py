@@ -21,6 +21,10 @@ class CapturingTwseCrawler(stockanalysis.TwseCrawker):
     def record(self, file_name: str, scheduled_time: str, row_data: stockanalysis.StockRows) -> None:
         self.records.append((scheduled_time, row_data))
 
+    def record_run_report(self, file_name: str, report: dict[str, object]) -> str:
+        self.run_report = report
+        return file_name
+
 
 def twse_row(
     open_price: str,
@@ -78,6 +82,18 @@ def test_invalid_twse_row_shape_is_skipped_gracefully() -> None:
     assert crawler.parse_ohlc([], 0, "20260526") is None
 
 
+def test_stock_days_are_built_from_the_parsed_columns() -> None:
+    crawler = stockanalysis.TwseCrawker(1)
+    rows = [twse_row("58.60", "58.70", "56.30", "57.10", volume="--", pe_ratio="--"), twse_row("--", "1", "1", "1", stock_no="2382")]
+
+    parsed, stock_index = crawler.index_stock_rows(rows, "20260526")
+    twse_stock = crawler.build_twse_stock(parsed, stock_index["3701"], "20260526")
+
+    assert (twse_stock.stock_no, twse_stock.open, twse_stock.close) == ("3701", 58.6, 57.1)
+    assert (twse_stock.volume, twse_stock.pe) == (0, None)
+    assert crawler.build_twse_stock(parsed, stock_index["2382"], "20260526") is None
+
+
 def test_empty_twse_date_is_skipped_without_recording() -> None:
     rows_by_date = {
         "20260515": [],
@@ -186,3 +202,174 @@ def test_analysis_dataset_includes_low_entry_score_v3_columns() -> None:
     assert "Volume Above MA20" in dataset.columns
     assert "OBV Rising" in dataset.columns
     assert dataset.loc[0, "EMA Alignment"] == 1
+
+
+class GeneratedTwseClient:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def get_daily_stock_rows(self, date_time: str, stocktype: int) -> stockanalysis.StockRows:
+        self.calls.append(date_time)
+        first = 100 + int(date_time) % 97
+        second = 50 + (int(date_time) * 7) % 89
+        return [
+            twse_row(str(first), str(first + 5), str(first - 3), str(first + 1), stock_no="2382", stock_name="廣達"),
+            twse_row(str(second), str(second + 2), str(second - 2), str(second), stock_no="2383", stock_name="台光電"),
+        ]
+
+
+class LineChartCrawler(CapturingTwseCrawler):
+    def __init__(self, stocklistsize: int, twse_client: GeneratedTwseClient) -> None:
+        super().__init__(stocklistsize)
+        self.twse_client = twse_client
+        self.charts: list[tuple[int, list[list[list[float]]]]] = []
+
+    def draw_linechart(self, duration: int, maxprofitratios: list[list[list[float]]]) -> None:
+        self.charts.append((duration, maxprofitratios))
+
+
+def test_linechart_fetches_each_date_once_and_matches_per_window_ratios() -> None:
+    from application.stock_service import StockAnalysisService
+    from interface.cli import build_request
+
+    client = GeneratedTwseClient()
+    crawlers: list[LineChartCrawler] = []
+
+    def crawler_factory(stocklistsize: int) -> LineChartCrawler:
+        crawler = LineChartCrawler(stocklistsize, client)
+        crawlers.append(crawler)
+        return crawler
+
+    request = build_request(["-l", "-e", "12", "-p", "5", "0", "2383", "20260101"])
+    StockAnalysisService(crawler_factory=crawler_factory).run(request)
+
+    legacy_client = GeneratedTwseClient()
+    expected: list[list[list[float]]] = [[], []]
+    for back in range(7):
+        legacy = LineChartCrawler(2, legacy_client)
+        legacy.get_date_times(start_date=7 - back, backtrack_days=12 - back, holidays=["20260101"])
+        legacy.get_twse_daily_stocks("shirong", DummyStockType, ["0", "2383"])
+        for item, ratios in enumerate(legacy.cal_max_profit_ratio_data()):
+            expected[item].append(ratios)
+
+    assert len(crawlers) == 1
+    assert crawlers[0].charts == [(7, expected)]
+    assert sorted(client.calls) == sorted(set(legacy_client.calls))
+    assert len(client.calls) < len(legacy_client.calls)
+
+
+def make_incremental_crawler(
+    tmp_path,
+    client: GeneratedTwseClient,
+    dates: list[str],
+    stocklistsize: int = 2,
+) -> stockanalysis.TwseCrawker:
+    from infrastructure.storage.csv_repository import CsvRepository
+
+    crawler = stockanalysis.TwseCrawker(stocklistsize, twse_client=client, csv_repository=CsvRepository(tmp_path))
+    crawler.iso_scheduled_times = list(dates)
+    return crawler
+
+
+def test_incremental_crawl_fetches_only_dates_missing_from_storage(tmp_path) -> None:
+    dates = ["2026-06-15", "2026-06-16", "2026-06-17"]
+    full = make_incremental_crawler(tmp_path, GeneratedTwseClient(), dates)
+    full.get_twse_daily_stocks("shirong", DummyStockType, ["2382", "2383"])
+
+    client = GeneratedTwseClient()
+    incremental = make_incremental_crawler(tmp_path, client, dates + ["2026-06-18"])
+    incremental.get_twse_daily_stocks("shirong", DummyStockType, ["2382", "2383"], incremental=True)
+
+    assert client.calls == ["20260618"]
+    assert incremental.daily_closes[0][:3] == full.daily_closes[0]
+    assert incremental.daily_highs[1][:3] == full.daily_highs[1]
+    assert incremental.daily_dates[0] == dates + ["2026-06-18"]
+    assert (tmp_path / "shirong_20260618.csv").exists()
+
+
+def test_incremental_crawl_refetches_days_missing_a_tracked_stock(tmp_path) -> None:
+    dates = ["2026-06-15", "2026-06-16"]
+    make_incremental_crawler(tmp_path, GeneratedTwseClient(), dates, 1).get_twse_daily_stocks("shirong", DummyStockType, ["2382"])
+
+    client = GeneratedTwseClient()
+    crawler = make_incremental_crawler(tmp_path, client, dates)
+    crawler.get_twse_daily_stocks("shirong", DummyStockType, ["2382", "2383"], incremental=True)
+
+    assert sorted(set(client.calls)) == ["20260615", "20260616"]
+    assert len(crawler.daily_closes[1]) == 2
+
+
+def test_incremental_crawl_resolves_legacy_index_selectors_once(tmp_path) -> None:
+    dates = ["2026-06-15", "2026-06-16"]
+    make_incremental_crawler(tmp_path, GeneratedTwseClient(), dates).get_twse_daily_stocks("shirong", DummyStockType, ["1", "0"])
+
+    client = GeneratedTwseClient()
+    crawler = make_incremental_crawler(tmp_path, client, dates)
+    crawler.get_twse_daily_stocks("shirong", DummyStockType, ["1", "0"], incremental=True)
+
+    assert client.calls == ["20260616"]
+    assert crawler.stocknumbers == ["2383", "2382"]
+    assert len(crawler.daily_closes[0]) == 2
+
+
+def test_selector_index_reuses_resolutions_until_the_listing_changes(tmp_path, caplog) -> None:
+    from infrastructure.storage.selector_index import SelectorIndex
+
+    listing = [
+        twse_row("100", "105", "99", "104", stock_no="2382", stock_name="廣達"),
+        twse_row("200", "205", "198", "204", stock_no="2383", stock_name="台光電"),
+    ]
+
+    def crawl(rows: stockanalysis.StockRows) -> CapturingTwseCrawler:
+        crawler = CapturingTwseCrawler(2, {"20260616": rows})
+        crawler.selector_index = SelectorIndex("stocklist_elec", tmp_path / "selector_index.json")
+        crawler.iso_scheduled_times = ["2026-06-16"]
+        crawler.get_twse_daily_stocks("shirong", DummyStockType, ["1", "0"])
+        return crawler
+
+    crawl(listing)
+    assert SelectorIndex("stocklist_elec", tmp_path / "selector_index.json").get(13)[1] == {"0": "2382", "1": "2383"}
+
+    caplog.set_level("INFO")
+    assert crawl(listing).stocknumbers == ["2383", "2382"]
+    assert "Resolved legacy row index" not in caplog.text
+
+    # A new listing shifts the row indexes, so they are resolved again.
+    shifted = [twse_row("50", "55", "49", "54", stock_no="2376", stock_name="技嘉")] + listing
+    assert crawl(shifted).stocknumbers == ["2382", "2376"]
+    assert SelectorIndex("stocklist_elec", tmp_path / "selector_index.json").get(13)[1] == {"0": "2376", "1": "2382"}
+
+
+def test_rewrite_stocklist_replaces_resolved_row_indexes(tmp_path) -> None:
+    from infrastructure.storage.selector_index import rewrite_stocklist
+
+    stocklist = tmp_path / "stocklist_elec"
+    stocklist.write_text("0;1;2\n")
+
+    rewrite_stocklist(stocklist, ["0", "1", "2"], ["2382", None, "2330"])
+
+    assert stocklist.read_text() == "2382;1;2330\n"
+
+
+def test_batch_runs_sector_analysis_in_workers_like_single_runs(tmp_path) -> None:
+    from application.stock_service import StockAnalysisRequest
+    from application.stock_service import StockAnalysisService
+    from infrastructure.storage.csv_repository import CsvRepository
+
+    def service(output_dir) -> StockAnalysisService:
+        client = GeneratedTwseClient()
+        return StockAnalysisService(
+            crawler_factory=lambda size: stockanalysis.TwseCrawker(size, twse_client=client, csv_repository=CsvRepository(output_dir))
+        )
+
+    requests = [
+        StockAnalysisRequest(stocklist=stocks, holidays=[], stocktype=DummyStockType, output_file_names=prefix, endbacktrack=20)
+        for prefix, stocks in [("shirong", ["2382", "2383"]), ("SHIRONG", ["1"])]
+    ]
+    for request in requests:
+        service(tmp_path / "single").run(request)
+    service(tmp_path / "batch").run_batch(requests, workers=2)
+
+    for prefix in ["shirong", "SHIRONG"]:
+        name = "{}_analysis_dataset.csv".format(prefix)
+        assert (tmp_path / "batch" / name).read_text() == (tmp_path / "single" / name).read_text()
@@ -1,7 +1,9 @@
+import numpy as np
 import pandas as pd
 
 from domain.strategies.low_entry_score import LowEntryScoreStrategy
 from domain.strategies.low_entry_score_v2 import LowEntryScoreV2Strategy
+from domain.strategies.low_entry_score_v3 import LOW_ENTRY_OUTPUT_COLUMNS
 from domain.strategies.low_entry_score_v3 import LowEntryScoreV3Strategy
 from domain.strategy import Strategy
 from domain.strategy import StrategyRegistry
@@ -230,3 +232,66 @@ def test_low_entry_score_v3_atr_contraction_and_near_lower_band() -> None:
 
     assert latest["Near Lower Band"] == 1
     assert latest["ATR Contraction"] == 1
+
+
+def test_default_run_panel_returns_latest_row_per_stock() -> None:
+    data = pd.DataFrame({"stock": ["b", "a", "b"], "Close": [1, 2, 3]})
+
+    result = EchoStrategy().run_panel(data)
+
+    assert result.index.tolist() == ["b", "a"]
+    assert result["Close"].tolist() == [3, 2]
+    assert result["ran"].tolist() == [True, True]
+
+
+def test_low_entry_score_v3_run_panel_matches_per_stock_runs() -> None:
+    rng = np.random.default_rng(5)
+    histories = []
+    for length in (1, 2, 15, 60, 230):
+        closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, length)))
+        histories.append(
+            pd.DataFrame(
+                {
+                    "Open": closes * 0.995,
+                    "High": closes * 1.01,
+                    "Low": closes * 0.99,
+                    "Close": closes,
+                    "Volume": rng.integers(0, 5000, length),
+                }
+            )
+        )
+
+    strategy = LowEntryScoreV3Strategy()
+    panel = strategy.run_panel(
+        pd.concat([history.assign(stock=stock) for stock, history in enumerate(histories)], ignore_index=True)
+    )
+
+    for stock, history in enumerate(histories):
+        expected = strategy.run(history).iloc[-1][LOW_ENTRY_OUTPUT_COLUMNS]
+        pd.testing.assert_series_equal(
+            panel.loc[stock, LOW_ENTRY_OUTPUT_COLUMNS],
+            expected,
+            check_names=False,
+            check_dtype=False,
+        )
+
+
+def test_evaluate_latest_matches_last_run_row() -> None:
+    rng = np.random.default_rng(11)
+    for length in (1, 3, 61, 300):
+        closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, length)))
+        history = pd.DataFrame(
+            {
+                "Open": closes * 1.002,
+                "High": closes * 1.01,
+                "Low": closes * rng.uniform(0.97, 0.99, length),
+                "Close": closes,
+                "Volume": rng.integers(0, 5000, length).astype(float),
+                "PE": rng.uniform(8, 16, length),
+            }
+        )
+
+        for strategy in (LowEntryScoreStrategy(), LowEntryScoreV2Strategy(), LowEntryScoreV3Strategy()):
+            expected = strategy.run(history).iloc[-1]
+            latest = pd.Series(strategy.evaluate_latest(history))
+            pd.testing.assert_series_equal(latest[expected.index], expected, check_names=False, check_dtype=False)
@@ -0,0 +1,116 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from domain.strategies.low_entry_score_v3 import LOW_ENTRY_OUTPUT_COLUMNS
+from domain.strategies.low_entry_score_v3 import LowEntryScoreV3Strategy
+from domain.strategies.low_entry_score_v3 import LowEntryScoreV3Stream
+from infrastructure.storage.csv_repository import CsvRepository
+from stockanalysis import TwseCrawker
+from twse.streaming import RollingWindow
+from twse.streaming import StreamingEma
+from twse.streaming import indicator_from_dict
+from twse.streaming import load_states
+from twse.streaming import save_states
+
+
+def make_history(days: int = 260) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    close = 100 + rng.normal(0, 1, days).cumsum()
+    history = pd.DataFrame(
+        {
+            "High": close + rng.uniform(0, 2, days),
+            "Low": close - rng.uniform(0, 2, days),
+            "Close": close,
+            "Volume": rng.integers(0, 1000, days).astype(float),
+        }
+    )
+    history.loc[5, "Close"] = np.nan
+    history.loc[9, "Volume"] = np.nan
+    return history
+
+
+def test_streaming_indicators_match_full_history() -> None:
+    close = make_history()["Close"]
+    ema = StreamingEma(20)
+    window = RollingWindow(20)
+    emas, means, stds, lows = [], [], [], []
+
+    for value in close:
+        emas.append(ema.update(value))
+        window.push(value)
+        means.append(window.mean())
+        stds.append(window.std())
+        lows.append(window.min())
+
+    np.testing.assert_allclose(emas, close.ewm(span=20, adjust=False, min_periods=1).mean(), rtol=1e-12)
+    np.testing.assert_allclose(means, close.rolling(20, min_periods=1).mean(), rtol=1e-9)
+    np.testing.assert_allclose(stds, close.rolling(20, min_periods=2).std(ddof=0), rtol=1e-9, equal_nan=True)
+    np.testing.assert_array_equal(lows, close.rolling(20, min_periods=1).min())
+
+
+def test_indicator_state_round_trips_through_json() -> None:
+    window = RollingWindow(3)
+    for value in [3.0, 1.0, 2.0, 5.0]:
+        window.push(value)
+
+    restored = indicator_from_dict(json.loads(json.dumps(window.to_dict())))
+    restored.push(0.0)
+
+    assert (restored.min(), restored.max()) == (0.0, 5.0)
+    assert restored.mean() == pytest.approx(7.0 / 3)
+
+
+def test_v3_stream_resumes_from_saved_state(tmp_path) -> None:
+    history = make_history()
+    strategy = LowEntryScoreV3Strategy()
+    expected = strategy.run(history)
+
+    save_states(tmp_path / "v3.json", {"2330": strategy.stream(history.iloc[:250]).to_dict()})
+    stream = LowEntryScoreV3Stream.from_dict(load_states(tmp_path / "v3.json")["2330"])
+    for bar in history.iloc[250:].itertuples():
+        stream.push(bar.High, bar.Low, bar.Close, bar.Volume)
+
+    pd.testing.assert_frame_equal(
+        stream.result()[LOW_ENTRY_OUTPUT_COLUMNS],
+        expected[LOW_ENTRY_OUTPUT_COLUMNS].iloc[[-1]].reset_index(drop=True),
+        check_dtype=False,
+    )
+
+
+class WalkClient:
+    def get_daily_stock_rows(self, date_time: str, stocktype: int) -> list[list[str]]:
+        close = 100 + (int(date_time) * 37) % 23
+        prices = [str(close - 1), str(close + 2), str(close - 2), str(close)]
+        return [["2382", "廣達", str(1000 + int(date_time) % 7 * 100), "10", "58,000"] + prices + ["+", "0.5", str(close), "1", str(close), "1", "12"]]
+
+
+class DummyStockType:
+    value = (13,)
+
+
+def crawl(tmp_path, dates: list[str], state_path=None) -> TwseCrawker:
+    crawler = TwseCrawker(1, twse_client=WalkClient(), csv_repository=CsvRepository(tmp_path / "data"))
+    crawler.strategy_state_path = state_path
+    crawler.iso_scheduled_times = dates
+    crawler.get_twse_daily_stocks("shirong", DummyStockType, ["2382"], incremental=state_path is not None)
+    return crawler
+
+
+def test_incremental_runs_resume_strategy_streams(tmp_path) -> None:
+    dates = [day.isoformat() for day in pd.bdate_range("2026-06-01", periods=31).date]
+    state_path = tmp_path / "streams" / "shirong.json"
+
+    crawl(tmp_path, dates[:30], state_path).cal_low_entry_strategy()
+    resumed = crawl(tmp_path, dates[1:], state_path).cal_low_entry_strategy()
+
+    full = crawl(tmp_path, dates)
+    expected = LowEntryScoreV3Strategy().run(full.build_strategy_history(0))
+    pd.testing.assert_frame_equal(
+        resumed[LOW_ENTRY_OUTPUT_COLUMNS],
+        expected[LOW_ENTRY_OUTPUT_COLUMNS].iloc[[-1]].reset_index(drop=True),
+        check_dtype=False,
+    )
+    assert load_states(state_path)["2382"]["date"] == dates[-1]
@@ -0,0 +1,52 @@
+import datetime
+
+from config.settings import TRADING_CALENDAR_CACHE_SIZE
+from twse.trading_calendar import TradingCalendar
+from twse.trading_calendar import _calendar_for
+from twse.trading_calendar import days_between
+from twse.trading_calendar import trading_calendar
+
+
+def test_sessions_skip_weekends_and_holidays() -> None:
+    calendar = TradingCalendar(["20260216", "20260217", ""], today=datetime.date(2026, 2, 20))
+
+    assert calendar.sessions_between("2026-02-13", "20260220") == [
+        datetime.date(2026, 2, 13),
+        datetime.date(2026, 2, 18),
+        datetime.date(2026, 2, 19),
+        datetime.date(2026, 2, 20),
+    ]
+    assert calendar.session_count("2026-02-14", "2026-02-17") == 0
+    assert not calendar.is_session("2026-02-16")
+    assert calendar.sessions_back("2026-02-18", 2) == datetime.date(2026, 2, 12)
+    assert calendar.last_sessions("2026-02-15", 1) == [datetime.date(2026, 2, 13)]
+
+
+def test_queries_outside_the_precomputed_range_extend_it() -> None:
+    calendar = TradingCalendar(today=datetime.date(2026, 6, 1))
+
+    assert calendar.sessions_between("1999-12-30", "2000-01-04") == [
+        datetime.date(1999, 12, 30),
+        datetime.date(1999, 12, 31),
+        datetime.date(2000, 1, 3),
+        datetime.date(2000, 1, 4),
+    ]
+    assert calendar.is_session("2040-01-02")
+    assert len(calendar.last_sessions("1990-01-05", 600)) == 600
+
+
+def test_calendars_are_shared_per_holiday_set() -> None:
+    assert trading_calendar(["20260101"]) is trading_calendar({"20260101", "not a date"})
+    assert trading_calendar(["20260101"]) is not trading_calendar([])
+
+
+def test_calendar_cache_is_bounded() -> None:
+    for day in range(1, TRADING_CALENDAR_CACHE_SIZE + 3):
+        trading_calendar(["202601{:02d}".format(day)])
+
+    assert _calendar_for.cache_info().currsize == TRADING_CALENDAR_CACHE_SIZE
+
+
+def test_days_between_counts_both_ends_across_leap_days() -> None:
+    assert days_between("2024-01-15", "2024-03-15") == 61
+    assert days_between("2026-06-17", "2026-06-15") == 3
@@ -1,3 +1,5 @@
+from requests import exceptions as requests_exceptions
+
 from twstockcrawler import TwStockCrawler
 
 
@@ -20,3 +22,40 @@ def test_get_stocktype_data_returns_empty_list_when_twse_tables_have_no_rows(mon
     monkeypatch.setattr(crawler, "_request_stocktype_data", lambda query_params, date_time: EmptyPayloadResponse())
 
     assert crawler.get_stocktype_data("20260515", 13) == []
+
+
+def test_session_reuses_keep_alive_connection(twse_server) -> None:
+    crawler = TwStockCrawler(pool_size=2)
+    crawler.url = twse_server.url
+
+    first_page, first_timing = crawler._send(crawler.session, {"date": "20260601", "type": 13}, "20260601")
+    second_page, second_timing = crawler._send(crawler.session, {"date": "20260602", "type": 13}, "20260602")
+
+    assert first_page.ok and second_page.ok
+    assert crawler.get_stocktype_data("20260603", 13)[0][0] == "2382"
+
+    assert first_timing.reused_connection is False
+    assert first_timing.connect_seconds > 0
+    assert second_timing.reused_connection is True
+    assert second_timing.connect_seconds == 0
+
+
+def test_insecure_fallback_is_pinned_to_its_own_session(monkeypatch) -> None:
+    crawler = TwStockCrawler()
+    sessions = []
+
+    def send(session, query_params, date_time):
+        sessions.append(session)
+        if session is crawler.session:
+            raise requests_exceptions.SSLError("certificate verify failed: Missing Subject Key Identifier")
+        return EmptyPayloadResponse(), None
+
+    monkeypatch.setattr(crawler, "_send", send)
+
+    crawler._request_stocktype_data({}, "20260601")
+    crawler._request_stocktype_data({}, "20260602")
+
+    insecure_session = crawler._insecure_session
+    assert insecure_session is not None
+    assert insecure_session.verify is False
+    assert sessions == [crawler.session, insecure_session, insecure_session]
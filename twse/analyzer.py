@@ -3,9 +3,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 from typing import Iterable
+from typing import Sequence
+from typing import TypeAlias
 
-import pandas as pd
+import numpy as np
+
+if TYPE_CHECKING:
+    from twse.indicators import IndicatorStore
 
 
 @dataclass(frozen=True)
@@ -38,18 +44,101 @@ def max_profit_unlimited(prices: Iterable[float]) -> float:
     return sum(max(prices[index] - prices[index - 1], 0) for index in range(1, len(prices)))
 
 
+@dataclass(frozen=True)
+class Trade:
+    buy_day: int
+    buy_price: float
+    sell_day: int
+    sell_price: float
+
+    @property
+    def profit(self) -> float:
+        return self.sell_price - self.buy_price
+
+
+# Persistent singly linked list of trades, newest first.
+TradeChain: TypeAlias = "tuple[Trade, TradeChain] | None"
+
+
 def max_profit_k_transactions(k: int, prices: Iterable[float]) -> float:
+    """Best profit with at most k buy/sell pairs, using O(k) state.
+
+    When k >= len(prices) // 2 the limit can never bind, so the unlimited
+    answer is returned directly.
+    """
+
     prices = list(prices)
     if not prices:
         return 0
+    if k >= len(prices) // 2:
+        return max_profit_unlimited(prices)
 
-    dp = [[0 for _ in range(len(prices))] for _ in range(k + 1)]
-    for trans_k in range(1, k + 1):
-        balance_after_buy = -prices[0]
-        for day in range(1, len(prices)):
-            dp[trans_k][day] = max(dp[trans_k][day - 1], balance_after_buy + prices[day])
-            balance_after_buy = max(balance_after_buy, dp[trans_k - 1][day - 1] - prices[day])
-    return dp[k][-1]
+    # balance_after_buy[j] / profit[j]: best balance holding / not holding
+    # after the j-th trade. Walking j downwards keeps profit[j - 1] at the
+    # previous day's value, exactly like the former (k + 1) x n table.
+    balance_after_buy = [-prices[0]] * (k + 1)
+    profit = [0] * (k + 1)
+    for price in prices[1:]:
+        for trans_k in range(k, 0, -1):
+            profit[trans_k] = max(profit[trans_k], balance_after_buy[trans_k] + price)
+            balance_after_buy[trans_k] = max(balance_after_buy[trans_k], profit[trans_k - 1] - price)
+    return profit[k]
+
+
+def max_profit_k_transactions_trades(k: int, prices: Iterable[float]) -> tuple[float, list[Trade]]:
+    """Return the k-transaction max profit together with the trades achieving it.
+
+    Each state keeps a persistent linked list ``(trade, previous)`` of the
+    trades behind it, so memory stays O(k) plus the live trade chains.
+    """
+
+    prices = list(prices)
+    if not prices or k <= 0:
+        return 0, []
+    if k >= len(prices) // 2:
+        return max_profit_unlimited(prices), unlimited_trades(prices)
+
+    balance_after_buy = [-prices[0]] * (k + 1)
+    buy_day = [0] * (k + 1)
+    buy_chain: list[TradeChain] = [None] * (k + 1)
+    profit = [0] * (k + 1)
+    sell_chain: list[TradeChain] = [None] * (k + 1)
+
+    for day in range(1, len(prices)):
+        price = prices[day]
+        for trans_k in range(k, 0, -1):
+            if balance_after_buy[trans_k] + price > profit[trans_k]:
+                profit[trans_k] = balance_after_buy[trans_k] + price
+                trade = Trade(buy_day[trans_k], prices[buy_day[trans_k]], day, price)
+                sell_chain[trans_k] = (trade, buy_chain[trans_k])
+            if profit[trans_k - 1] - price > balance_after_buy[trans_k]:
+                balance_after_buy[trans_k] = profit[trans_k - 1] - price
+                buy_day[trans_k] = day
+                buy_chain[trans_k] = sell_chain[trans_k - 1]
+
+    trades: list[Trade] = []
+    chain = sell_chain[k]
+    while chain is not None:
+        trade, chain = chain
+        trades.append(trade)
+    return profit[k], trades[::-1]
+
+
+def unlimited_trades(prices: Iterable[float]) -> list[Trade]:
+    """Split prices into valley-to-peak trades, the unlimited-transaction optimum."""
+
+    prices = list(prices)
+    trades: list[Trade] = []
+    day = 0
+    while day < len(prices) - 1:
+        while day < len(prices) - 1 and prices[day + 1] <= prices[day]:
+            day += 1
+        valley = day
+        while day < len(prices) - 1 and prices[day + 1] > prices[day]:
+            day += 1
+        if day > valley:
+            trades.append(Trade(valley, prices[valley], day, prices[day]))
+    return trades
 
 
 def max_profit_with_fee(prices: Iterable[float], fee: float) -> float:
@@ -60,13 +149,97 @@ def max_profit_with_fee(prices: Iterable[float], fee: float) -> float:
     return not_hold
 
 
+def stack_price_histories(histories: Sequence[Sequence[float]]) -> np.ndarray:
+    """Right-align per-stock price lists into one (days x stocks) float64 array.
+
+    Shorter histories are left-padded with their first price. A flat prefix
+    adds no trade opportunities, so every panel kernel returns the same value
+    as the scalar function on the unpadded list. Empty histories become zeros.
+    """
+
+    days = max((len(history) for history in histories), default=0)
+    panel = np.zeros((days, len(histories)), dtype=np.float64)
+    for column, history in enumerate(histories):
+        if not history:
+            continue
+        panel[days - len(history):, column] = history
+        panel[:days - len(history), column] = history[0]
+    return panel
+
+
+def max_profit_panel(prices: np.ndarray) -> np.ndarray:
+    """Vectorized max_profit for every column of a (days x stocks) array."""
+
+    prices = np.asarray(prices, dtype=np.float64)
+    if prices.shape[0] < 2:
+        return np.zeros(prices.shape[1:], dtype=np.float64)
+
+    # Same operands as the scalar recurrence: price + (-lowest earlier price).
+    lowest = np.minimum.accumulate(prices[:-1], axis=0)
+    return np.maximum(np.max(prices[1:] + -lowest, axis=0), 0.0)
+
+
+def max_profit_unlimited_panel(prices: np.ndarray) -> np.ndarray:
+    """Vectorized max_profit_unlimited for every column of a (days x stocks) array."""
+
+    prices = np.asarray(prices, dtype=np.float64)
+    if prices.shape[0] < 2:
+        return np.zeros(prices.shape[1:], dtype=np.float64)
+
+    # cumsum adds left to right like the scalar sum(); np.sum would pair terms.
+    return np.cumsum(np.maximum(np.diff(prices, axis=0), 0.0), axis=0)[-1]
+
+
+def max_profit_k_transactions_panel(k: int, prices: np.ndarray) -> np.ndarray:
+    """Vectorized max_profit_k_transactions for every column of a (days x stocks) array.
+
+    Walks the days once with O(k x stocks) state, like the scalar kernel.
+    """
+
+    prices = np.asarray(prices, dtype=np.float64)
+    days = prices.shape[0]
+    if days == 0:
+        return np.zeros(prices.shape[1:], dtype=np.float64)
+    if k >= days // 2:
+        return max_profit_unlimited_panel(prices)
+
+    # Row j of each (k + 1, stocks) array is the scalar kernel's state j for
+    # every stock, updated with the same downward-j rolling recurrence.
+    balance_after_buy = np.repeat(-prices[:1], k + 1, axis=0)
+    profit = np.zeros((k + 1,) + prices.shape[1:], dtype=np.float64)
+    for price in prices[1:]:
+        for trans_k in range(k, 0, -1):
+            np.maximum(profit[trans_k], balance_after_buy[trans_k] + price, out=profit[trans_k])
+            np.maximum(balance_after_buy[trans_k], profit[trans_k - 1] - price, out=balance_after_buy[trans_k])
+    return profit[k].copy()
+
+
+def max_profit_with_fee_panel(prices: np.ndarray, fee: float) -> np.ndarray:
+    """Vectorized max_profit_with_fee for every column of a (days x stocks) array."""
+
+    prices = np.asarray(prices, dtype=np.float64)
+    hold = np.full(prices.shape[1:], -np.inf)
+    not_hold = np.zeros(prices.shape[1:], dtype=np.float64)
+    for price in prices:
+        not_hold = np.maximum(not_hold, hold + price)
+        hold = np.maximum(hold, not_hold - price - fee)
+    return not_hold
+
+
 def compute_signal_features(
     closes: Iterable[float],
     highs: Iterable[float],
     lows: Iterable[float],
     ma_window: int = 5,
     mom_lag: int = 3,
+    stock: str = "",
+    indicators: IndicatorStore | None = None,
 ) -> SignalFeatures:
+    # pandas is only needed here; the profit kernels stay importable without it.
+    import pandas as pd
+
+    from twse.indicators import default_indicator_store
+
     close_series = pd.Series(list(closes), dtype="float64")
     high_series = pd.Series(list(highs), dtype="float64")
     low_series = pd.Series(list(lows), dtype="float64")
@@ -75,7 +248,8 @@ def compute_signal_features(
         return SignalFeatures(None, None, None, None, None)
 
     # Use the last ma_window prices when calculating a moving average.
-    ma = close_series.rolling(window=ma_window, min_periods=ma_window).mean().iloc[-1]
+    indicators = indicators if indicators is not None else default_indicator_store()
+    ma = indicators.bind(stock, close=close_series).sma("close", ma_window, ma_window).iloc[-1]
     current_close = close_series.iloc[-1]
     trend_score = int(pd.notna(ma) and current_close > ma)
 
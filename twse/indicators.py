@@ -0,0 +1,242 @@
+"""Memoized technical indicators shared by every strategy plugin."""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from collections.abc import Hashable
+from dataclasses import dataclass
+from typing import Any
+from typing import TypeAlias
+
+import numpy as np
+import pandas as pd
+
+from config.settings import INDICATOR_CACHE_MAX_BYTES
+
+# Indicators run on one stock's Series or on a (days x stocks) DataFrame.
+PriceFrame: TypeAlias = "pd.Series | pd.DataFrame"
+
+# (stock, indicator, params, versions of the inputs it was computed from)
+IndicatorKey: TypeAlias = "tuple[str, str, tuple[Hashable, ...], tuple[str, ...]]"
+
+
+def rolling_mean(values: PriceFrame, window: int, min_periods: int = 1) -> PriceFrame:
+    return values.rolling(window, min_periods=min_periods).mean()
+
+
+def rolling_std(values: PriceFrame, window: int, min_periods: int = 2) -> PriceFrame:
+    return values.rolling(window, min_periods=min_periods).std(ddof=0)
+
+
+def rolling_max(values: PriceFrame, window: int, min_periods: int = 1) -> PriceFrame:
+    return values.rolling(window, min_periods=min_periods).max()
+
+
+def rolling_min(values: PriceFrame, window: int, min_periods: int = 1) -> PriceFrame:
+    return values.rolling(window, min_periods=min_periods).min()
+
+
+def ema(values: PriceFrame, span: int) -> PriceFrame:
+    return values.ewm(span=span, adjust=False, min_periods=1).mean()
+
+
+def rsi(close: PriceFrame, window: int) -> PriceFrame:
+    delta = close.diff()
+    gain = delta.clip(lower=0)
+    loss = (-delta).clip(lower=0)
+    avg_gain = gain.rolling(window, min_periods=1).mean()
+    avg_loss = loss.rolling(window, min_periods=1).mean()
+    rs = avg_gain / avg_loss.replace(0, np.nan)
+    rsi_values = 100 - (100 / (1 + rs))
+    return rsi_values.where(avg_loss != 0, np.where(avg_gain > 0, 100, 50)).fillna(50)
+
+
+def macd(close: PriceFrame, fast: int = 12, slow: int = 26, signal: int = 9) -> tuple[PriceFrame, PriceFrame]:
+    """Return the MACD line and its signal line."""
+
+    macd_line = ema(close, fast) - ema(close, slow)
+    return macd_line, ema(macd_line, signal)
+
+
+def atr(high: PriceFrame, low: PriceFrame, close: PriceFrame, window: int) -> PriceFrame:
+    previous_close = close.shift(1)
+    # fmax skips NaN like a row-wise max over the three ranges.
+    true_range = np.fmax(np.fmax(high - low, (high - previous_close).abs()), (low - previous_close).abs())
+    return true_range.rolling(window, min_periods=1).mean()
+
+
+def obv(close: PriceFrame, volume: PriceFrame) -> PriceFrame:
+    previous_close = close.shift(1)
+    direction = (close > previous_close).astype(int) - (close < previous_close).astype(int)
+    return (direction * volume).cumsum()
+
+
+INDICATORS: dict[str, Callable[..., Any]] = {
+    "sma": rolling_mean,
+    "std": rolling_std,
+    "max": rolling_max,
+    "min": rolling_min,
+    "ema": ema,
+    "rsi": rsi,
+    "macd": macd,
+    "atr": atr,
+    "obv": obv,
+}
+
+
+def data_version(values: PriceFrame) -> str:
+    """Digest of the values, index and labels an indicator is computed from."""
+
+    digest = hashlib.blake2b(digest_size=16)
+    labels = values.columns.tolist() if isinstance(values, pd.DataFrame) else values.name
+    digest.update(repr((type(values).__name__, str(getattr(values, "dtypes", "")), labels)).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(values, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _nbytes(value: Any) -> int:
+    if isinstance(value, tuple):
+        return sum(_nbytes(item) for item in value)
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True))
+    return int(getattr(value, "nbytes", 0))
+
+
+@dataclass
+class IndicatorStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class IndicatorStore:
+    """In-memory LRU of indicator results shared between strategies.
+
+    Entries are keyed by ``(stock, indicator, params, data versions)`` where
+    a data version is a digest of the input series, so appending a day or
+    revising a price produces a new key instead of a stale hit. Once the
+    cached results outgrow ``max_bytes`` the least recently used ones are
+    evicted. Cached results are shared; callers must not modify them in place.
+    """
+
+    def __init__(self, max_bytes: int = INDICATOR_CACHE_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.stats = IndicatorStats()
+        self._entries: OrderedDict[IndicatorKey, tuple[Any, int]] = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    @property
+    def entries(self) -> int:
+        return len(self._entries)
+
+    def bind(self, stock: str = "", **inputs: PriceFrame) -> IndicatorInputs:
+        """Return a view that requests indicators of ``inputs`` from this store."""
+
+        return IndicatorInputs(self, stock, inputs)
+
+    def get_or_compute(self, key: IndicatorKey, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return entry[0]
+            self.stats.misses += 1
+
+        value = compute()
+        size = _nbytes(value)
+        if size > self.max_bytes:
+            return value
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self._total_bytes += size
+            while self._total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+                self.stats.evictions += 1
+        return value
+
+    def invalidate(self, stock: str | None = None) -> None:
+        """Drop every entry, or only the entries computed for ``stock``."""
+
+        with self._lock:
+            for key in [key for key in self._entries if stock is None or key[0] == stock]:
+                self._total_bytes -= self._entries.pop(key)[1]
+
+
+class IndicatorInputs:
+    """Named input series bound to a store, each digested once."""
+
+    def __init__(self, store: IndicatorStore, stock: str, inputs: dict[str, PriceFrame]) -> None:
+        self.store = store
+        self.stock = stock
+        self._inputs = inputs
+        self._versions: dict[str, str] = {}
+
+    def compute(self, indicator: str, fields: tuple[str, ...], *params: Hashable) -> Any:
+        key = (self.stock, indicator, params, tuple(self._version(field) for field in fields))
+        return self.store.get_or_compute(
+            key,
+            lambda: INDICATORS[indicator](*(self._inputs[field] for field in fields), *params),
+        )
+
+    def sma(self, field: str, window: int, min_periods: int = 1) -> PriceFrame:
+        return self.compute("sma", (field,), window, min_periods)
+
+    def std(self, field: str, window: int, min_periods: int = 2) -> PriceFrame:
+        return self.compute("std", (field,), window, min_periods)
+
+    def rolling_max(self, field: str, window: int, min_periods: int = 1) -> PriceFrame:
+        return self.compute("max", (field,), window, min_periods)
+
+    def rolling_min(self, field: str, window: int, min_periods: int = 1) -> PriceFrame:
+        return self.compute("min", (field,), window, min_periods)
+
+    def ema(self, field: str, span: int) -> PriceFrame:
+        return self.compute("ema", (field,), span)
+
+    def rsi(self, window: int) -> PriceFrame:
+        return self.compute("rsi", ("close",), window)
+
+    def macd(self, fast: int = 12, slow: int = 26, signal: int = 9) -> tuple[PriceFrame, PriceFrame]:
+        return self.compute("macd", ("close",), fast, slow, signal)
+
+    def atr(self, window: int) -> PriceFrame:
+        return self.compute("atr", ("high", "low", "close"), window)
+
+    def obv(self) -> PriceFrame:
+        return self.compute("obv", ("close", "volume"))
+
+    def _version(self, field: str) -> str:
+        version = self._versions.get(field)
+        if version is None:
+            version = self._versions[field] = data_version(self._inputs[field])
+        return version
+
+
+_default_store = IndicatorStore()
+
+
+def default_indicator_store() -> IndicatorStore:
+    """Return the process-wide store shared by the built-in strategies."""
+
+    return _default_store
@@ -1,5 +1,31 @@
 """Parsing helpers for TWSE row values."""
 
+from __future__ import annotations
+
+from collections.abc import Sequence
+from functools import cached_property
+
+import numpy as np
+
+from domain.models import TwseColumns
+
+# Numeric MI_INDEX columns cast by parse_stock_rows, by field name.
+NUMERIC_COLUMNS = {
+    "volume": TwseColumns.VOLUME,
+    "trade_count": TwseColumns.TRADE_COUNT,
+    "trade_value": TwseColumns.TRADE_VALUE,
+    "open": TwseColumns.OPEN,
+    "high": TwseColumns.HIGH,
+    "low": TwseColumns.LOW,
+    "close": TwseColumns.CLOSE,
+    "price_change": TwseColumns.PRICE_CHANGE,
+    "bid_price": TwseColumns.BID_PRICE,
+    "bid_volume": TwseColumns.BID_VOLUME,
+    "ask_price": TwseColumns.ASK_PRICE,
+    "ask_volume": TwseColumns.ASK_VOLUME,
+    "pe": TwseColumns.PE,
+}
+
 
 def parse_price(price: object) -> float | None:
     normalized_price = str(price).replace(",", "").strip()
@@ -14,3 +40,98 @@ def parse_price(price: object) -> float | None:
 
 def clean_cell(value: str) -> str:
     return str(value).replace(",", "").strip()
+
+
+class ParsedRows:
+    """Columnar view of one MI_INDEX rows block, aligned with the input rows.
+
+    ``valid`` marks rows that are lists of at least ``TwseColumns.REQUIRED_WIDTH``
+    cells with a stock number and name. Identity columns are cleaned up
+    front; numeric columns are cast on first use with ``numeric(name)``,
+    where ``"--"``, blanks, unparseable text and invalid rows become NaN.
+    Callers index these arrays by row instead of re-parsing the row cells.
+    """
+
+    def __init__(self, rows: Sequence[object]) -> None:
+        width = TwseColumns.REQUIRED_WIDTH
+        self.rows = rows
+        shaped = [isinstance(row, list) and len(row) >= width for row in rows]
+        # zip(*rows) stops at the shortest row, so short rows are padded first.
+        blank = [""] * width
+        table = rows if all(shaped) else [row if ok else blank for row, ok in zip(rows, shaped)]
+        self._columns = list(zip(*table))[:width] if table else [()] * width
+
+        self.stock_no = np.array(_clean_column(self._columns[TwseColumns.STOCK_NO]), dtype=object)
+        self.stock_name = np.array(_clean_column(self._columns[TwseColumns.NAME]), dtype=object)
+        self.valid = np.array(shaped, dtype=bool) & (self.stock_no != "") & (self.stock_name != "")
+        self._numeric: dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.valid)
+
+    def numeric(self, name: str) -> np.ndarray:
+        values = self._numeric.get(name)
+        if values is None:
+            values = _parse_numeric_column(self._columns[NUMERIC_COLUMNS[name]])
+            values[~self.valid] = np.nan
+            self._numeric[name] = values
+        return values
+
+    @cached_property
+    def has_ohlc(self) -> np.ndarray:
+        """Valid rows whose open, high, low and close all parsed."""
+
+        ohlc = np.column_stack([self.numeric(name) for name in ("open", "high", "low", "close")])
+        return self.valid & ~np.isnan(ohlc).any(axis=1)
+
+    def text_rows(self, row_indices: Sequence[int]) -> list[list[str]]:
+        """Cleaned cells of the selected rows, as written back to the daily CSV."""
+
+        columns = [_clean_column([column[row_index] for row_index in row_indices]) for column in self._columns]
+        return [list(cells) for cells in zip(*columns)]
+
+    def first_indices(self) -> dict[str, int]:
+        """Map each valid stock number to the index of its first row."""
+
+        first_indices: dict[str, int] = {}
+        for row_index in np.flatnonzero(self.valid).tolist():
+            first_indices.setdefault(self.stock_no[row_index], row_index)
+        return first_indices
+
+
+def parse_stock_rows(rows: Sequence[object]) -> ParsedRows:
+    """Parse a whole MI_INDEX ``data`` block column by column."""
+
+    return ParsedRows(rows)
+
+
+_SEPARATOR = "\x1f"
+
+
+def _join(cells: Sequence[object]) -> str:
+    try:
+        return _SEPARATOR.join(cells)  # type: ignore[arg-type]
+    except TypeError:
+        return _SEPARATOR.join(map(str, cells))
+
+
+def _clean_column(cells: Sequence[object]) -> list[str]:
+    # One join/replace/split per column instead of clean_cell() per cell.
+    joined = _join(cells).replace(",", "")
+    return [cell.strip() for cell in joined.split(_SEPARATOR)] if cells else []
+
+
+def _parse_numeric_column(cells: Sequence[object]) -> np.ndarray:
+    if not cells:
+        return np.array([], dtype="float64")
+
+    joined = _SEPARATOR + _join(cells).replace(",", "") + _SEPARATOR
+    for missing in (_SEPARATOR + "--" + _SEPARATOR, _SEPARATOR + _SEPARATOR):
+        # Adjacent missing cells share a separator, so one pass only catches every other one.
+        for _ in range(2):
+            joined = joined.replace(missing, _SEPARATOR + "nan" + _SEPARATOR)
+    text = joined[1:-1].split(_SEPARATOR)
+    try:
+        return np.fromiter(map(float, text), dtype="float64", count=len(text))
+    except ValueError:
+        return np.array([parse_price(cell) for cell in text], dtype="float64")
@@ -0,0 +1,356 @@
+"""Incremental indicators that take one daily bar at a time.
+
+Each indicator keeps only the state its window needs, so appending a session
+is O(1) instead of recomputing the whole history. States round-trip through
+``to_dict()``/``indicator_from_dict()`` as plain JSON-compatible dicts, which
+lets a daily job persist them and resume the next day. Outputs follow the
+same pandas semantics (``adjust=False`` EWM, ``min_periods`` rolling windows,
+NaN skipping) as the full-history calculations in ``twse.indicators``.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+from typing import ClassVar
+
+NAN = float("nan")
+
+
+def _is_number(value: float) -> bool:
+    return not math.isnan(value)
+
+
+class StreamingIndicator(ABC):
+    """Base class registering each indicator kind for deserialization."""
+
+    kind: ClassVar[str] = ""
+    _kinds: ClassVar[dict[str, type[StreamingIndicator]]] = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if cls.kind:
+            StreamingIndicator._kinds[cls.kind] = cls
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"kind": self.kind, **self._state()}
+
+    @classmethod
+    @abstractmethod
+    def from_dict(cls, state: Mapping[str, Any]) -> StreamingIndicator:
+        """Rebuild an indicator from its ``to_dict()`` state."""
+
+    @abstractmethod
+    def _state(self) -> dict[str, Any]:
+        """Return the JSON-compatible state ``to_dict()`` persists."""
+
+
+def indicator_from_dict(state: Mapping[str, Any]) -> StreamingIndicator:
+    try:
+        indicator_cls = StreamingIndicator._kinds[state["kind"]]
+    except KeyError as error:
+        raise ValueError("Unknown streaming indicator state: {}".format(state.get("kind"))) from error
+    return indicator_cls.from_dict(state)
+
+
+class StreamingEma(StreamingIndicator):
+    """Recursive EMA matching ``ewm(span, adjust=False, min_periods=1)``."""
+
+    kind = "ema"
+
+    def __init__(self, span: int, value: float = NAN, old_weight: float = 1.0) -> None:
+        self.span = span
+        self.alpha = 2 / (span + 1)
+        self.value = value
+        self.old_weight = old_weight
+
+    def update(self, value: float) -> float:
+        if _is_number(self.value):
+            # Missing bars still decay the old weight, as with ignore_na=False.
+            self.old_weight *= 1 - self.alpha
+            if _is_number(value):
+                if self.value != value:
+                    self.value = (self.old_weight * self.value + self.alpha * value) / (self.old_weight + self.alpha)
+                self.old_weight = 1.0
+        elif _is_number(value):
+            self.value = value
+        return self.value
+
+    @classmethod
+    def from_dict(cls, state: Mapping[str, Any]) -> StreamingEma:
+        return cls(state["span"], state["value"], state["old_weight"])
+
+    def _state(self) -> dict[str, Any]:
+        return {"span": self.span, "value": self.value, "old_weight": self.old_weight}
+
+
+class RollingWindow(StreamingIndicator):
+    """Fixed-size window with O(1) mean/std and amortized O(1) max/min.
+
+    Mean and population variance are maintained with Welford add/remove
+    updates; max and min use monotonic queues of ``(position, value)``.
+    NaN bars occupy a slot but are excluded from every statistic.
+    """
+
+    kind = "rolling"
+
+    def __init__(
+        self,
+        window: int,
+        values: list[float] | None = None,
+        position: int = 0,
+        maxima: list[list[float]] | None = None,
+        minima: list[list[float]] | None = None,
+    ) -> None:
+        self.window = window
+        self.values: deque[float] = deque(values or [], maxlen=window)
+        self.position = position
+        self._maxima: deque[tuple[int, float]] = deque((int(index), value) for index, value in maxima or [])
+        self._minima: deque[tuple[int, float]] = deque((int(index), value) for index, value in minima or [])
+        self.count = 0
+        self._mean = 0.0
+        self._ssqdm = 0.0
+        for value in self.values:
+            self._add(value)
+
+    def push(self, value: float) -> None:
+        if len(self.values) == self.window:
+            self._remove(self.values[0])
+        self.values.append(value)
+        self._add(value)
+
+        if _is_number(value):
+            while self._maxima and self._maxima[-1][1] <= value:
+                self._maxima.pop()
+            self._maxima.append((self.position, value))
+            while self._minima and self._minima[-1][1] >= value:
+                self._minima.pop()
+            self._minima.append((self.position, value))
+        self.position += 1
+
+        oldest = self.position - self.window
+        while self._maxima and self._maxima[0][0] < oldest:
+            self._maxima.popleft()
+        while self._minima and self._minima[0][0] < oldest:
+            self._minima.popleft()
+
+    def mean(self, min_periods: int = 1) -> float:
+        return self._mean if self.count >= max(min_periods, 1) else NAN
+
+    def std(self, min_periods: int = 2) -> float:
+        if self.count < max(min_periods, 1):
+            return NAN
+        return math.sqrt(max(self._ssqdm / self.count, 0.0)) if self.count > 1 else 0.0
+
+    def max(self, min_periods: int = 1) -> float:
+        return self._maxima[0][1] if self._maxima and self.count >= max(min_periods, 1) else NAN
+
+    def min(self, min_periods: int = 1) -> float:
+        return self._minima[0][1] if self._minima and self.count >= max(min_periods, 1) else NAN
+
+    def _add(self, value: float) -> None:
+        if not _is_number(value):
+            return
+        self.count += 1
+        delta = value - self._mean
+        self._mean += delta / self.count
+        self._ssqdm += (self.count - 1) * delta * delta / self.count
+
+    def _remove(self, value: float) -> None:
+        if not _is_number(value):
+            return
+        self.count -= 1
+        if self.count == 0:
+            self._mean = 0.0
+            self._ssqdm = 0.0
+            return
+        delta = value - self._mean
+        self._mean -= delta / self.count
+        self._ssqdm -= (self.count + 1) * delta * delta / self.count
+
+    @classmethod
+    def from_dict(cls, state: Mapping[str, Any]) -> RollingWindow:
+        return cls(state["window"], state["values"], state["position"], state["maxima"], state["minima"])
+
+    def _state(self) -> dict[str, Any]:
+        return {
+            "window": self.window,
+            "values": list(self.values),
+            "position": self.position,
+            "maxima": [list(item) for item in self._maxima],
+            "minima": [list(item) for item in self._minima],
+        }
+
+
+class StreamingLag(StreamingIndicator):
+    """Return the value pushed ``periods`` bars ago, like ``shift(periods)``."""
+
+    kind = "lag"
+
+    def __init__(self, periods: int, values: list[float] | None = None) -> None:
+        self.periods = periods
+        self.values: deque[float] = deque(values or [], maxlen=periods + 1)
+
+    def update(self, value: float) -> float:
+        self.values.append(value)
+        return self.values[0] if len(self.values) > self.periods else NAN
+
+    @classmethod
+    def from_dict(cls, state: Mapping[str, Any]) -> StreamingLag:
+        return cls(state["periods"], state["values"])
+
+    def _state(self) -> dict[str, Any]:
+        return {"periods": self.periods, "values": list(self.values)}
+
+
+class StreamingRsi(StreamingIndicator):
+    """RSI over simple rolling means of gains and losses."""
+
+    kind = "rsi"
+
+    def __init__(
+        self,
+        window: int,
+        previous_close: float = NAN,
+        gains: RollingWindow | None = None,
+        losses: RollingWindow | None = None,
+    ) -> None:
+        self.window = window
+        self.previous_close = previous_close
+        self.gains = gains or RollingWindow(window)
+        self.losses = losses or RollingWindow(window)
+
+    def update(self, close: float) -> float:
+        delta = close - self.previous_close
+        self.previous_close = close
+        self.gains.push(max(delta, 0.0) if _is_number(delta) else NAN)
+        self.losses.push(max(-delta, 0.0) if _is_number(delta) else NAN)
+
+        avg_gain = self.gains.mean()
+        avg_loss = self.losses.mean()
+        if avg_loss == 0:
+            return 100.0 if avg_gain > 0 else 50.0
+        rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+        return rsi if _is_number(rsi) else 50.0
+
+    @classmethod
+    def from_dict(cls, state: Mapping[str, Any]) -> StreamingRsi:
+        return cls(
+            state["window"],
+            state["previous_close"],
+            RollingWindow.from_dict(state["gains"]),
+            RollingWindow.from_dict(state["losses"]),
+        )
+
+    def _state(self) -> dict[str, Any]:
+        return {
+            "window": self.window,
+            "previous_close": self.previous_close,
+            "gains": self.gains.to_dict(),
+            "losses": self.losses.to_dict(),
+        }
+
+
+class StreamingMacd(StreamingIndicator):
+    """MACD line and signal line from three recursive EMAs."""
+
+    kind = "macd"
+
+    def __init__(
+        self,
+        fast: StreamingEma | None = None,
+        slow: StreamingEma | None = None,
+        signal: StreamingEma | None = None,
+    ) -> None:
+        self.fast = fast or StreamingEma(12)
+        self.slow = slow or StreamingEma(26)
+        self.signal = signal or StreamingEma(9)
+
+    def update(self, close: float) -> tuple[float, float]:
+        macd = self.fast.update(close) - self.slow.update(close)
+        return macd, self.signal.update(macd)
+
+    @classmethod
+    def from_dict(cls, state: Mapping[str, Any]) -> StreamingMacd:
+        return cls(
+            StreamingEma.from_dict(state["fast"]),
+            StreamingEma.from_dict(state["slow"]),
+            StreamingEma.from_dict(state["signal"]),
+        )
+
+    def _state(self) -> dict[str, Any]:
+        return {"fast": self.fast.to_dict(), "slow": self.slow.to_dict(), "signal": self.signal.to_dict()}
+
+
+class StreamingAtr(StreamingIndicator):
+    """Rolling-mean ATR of the true range."""
+
+    kind = "atr"
+
+    def __init__(self, window: int, previous_close: float = NAN, ranges: RollingWindow | None = None) -> None:
+        self.window = window
+        self.previous_close = previous_close
+        self.ranges = ranges or RollingWindow(window)
+
+    def update(self, high: float, low: float, close: float) -> float:
+        candidates = [high - low, abs(high - self.previous_close), abs(low - self.previous_close)]
+        candidates = [value for value in candidates if _is_number(value)]
+        self.ranges.push(max(candidates) if candidates else NAN)
+        self.previous_close = close
+        return self.ranges.mean()
+
+    @classmethod
+    def from_dict(cls, state: Mapping[str, Any]) -> StreamingAtr:
+        return cls(state["window"], state["previous_close"], RollingWindow.from_dict(state["ranges"]))
+
+    def _state(self) -> dict[str, Any]:
+        return {"window": self.window, "previous_close": self.previous_close, "ranges": self.ranges.to_dict()}
+
+
+class StreamingObv(StreamingIndicator):
+    """Running on-balance volume."""
+
+    kind = "obv"
+
+    def __init__(self, previous_close: float = NAN, total: float = 0.0) -> None:
+        self.previous_close = previous_close
+        self.total = total
+
+    def update(self, close: float, volume: float) -> float:
+        direction = int(close > self.previous_close) - int(close < self.previous_close)
+        self.previous_close = close
+        flow = direction * volume
+        if not _is_number(flow):
+            return NAN
+        self.total += flow
+        return self.total
+
+    @classmethod
+    def from_dict(cls, state: Mapping[str, Any]) -> StreamingObv:
+        return cls(state["previous_close"], state["total"])
+
+    def _state(self) -> dict[str, Any]:
+        return {"previous_close": self.previous_close, "total": self.total}
+
+
+def save_states(path: str | Path, states: Mapping[str, Any]) -> None:
+    """Atomically write JSON-compatible indicator states, e.g. keyed by stock."""
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name("{}.{}.tmp".format(path.name, os.getpid()))
+    temp_path.write_text(json.dumps(states, ensure_ascii=False))
+    os.replace(temp_path, path)
+
+
+def load_states(path: str | Path) -> dict[str, Any]:
+    try:
+        return json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        return {}
@@ -0,0 +1,151 @@
+"""TWSE trading sessions with O(log n) date arithmetic.
+
+Sessions are every weekday that is not a listed holiday. They are kept as a
+sorted list of ``date.toordinal()`` values, so "N sessions back" and range
+queries are bisects instead of day-by-day walks.
+"""
+
+from __future__ import annotations
+
+import datetime
+import functools
+import threading
+from bisect import bisect_left
+from bisect import bisect_right
+from collections.abc import Iterable
+
+from config.settings import TRADING_CALENDAR_CACHE_SIZE
+from config.settings import TRADING_CALENDAR_YEARS_BACK
+
+
+def to_date(value: datetime.date | str) -> datetime.date:
+    """Accept a date, ``YYYY-MM-DD`` or ``YYYYMMDD``."""
+
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    text = value.strip().replace("-", "")
+    return datetime.date(int(text[:4]), int(text[4:6]), int(text[6:8]))
+
+
+def days_between(start: datetime.date | str, end: datetime.date | str) -> int:
+    """Calendar days from ``start`` to ``end``, counting both ends."""
+
+    return abs(to_date(end).toordinal() - to_date(start).toordinal()) + 1
+
+
+def _holiday_ordinals(holidays: Iterable[datetime.date | str]) -> frozenset[int]:
+    ordinals = set()
+    for holiday in holidays:
+        try:
+            ordinals.add(to_date(holiday).toordinal())
+        except (ValueError, AttributeError):
+            continue
+    return frozenset(ordinals)
+
+
+class TradingCalendar:
+    """Sorted sessions for the years around the holidays it was built from.
+
+    The covered range starts ``TRADING_CALENDAR_YEARS_BACK`` years before the
+    current year (or the earliest holiday) and grows on demand when a query
+    falls outside it.
+    """
+
+    def __init__(self, holidays: Iterable[datetime.date | str] = (), today: datetime.date | None = None) -> None:
+        self.holidays = _holiday_ordinals(holidays)
+        today = today or datetime.date.today()
+        first_year = today.year - TRADING_CALENDAR_YEARS_BACK
+        last_year = today.year + 1
+        if self.holidays:
+            first_year = min(first_year, datetime.date.fromordinal(min(self.holidays)).year)
+            last_year = max(last_year, datetime.date.fromordinal(max(self.holidays)).year)
+        self._first = datetime.date(first_year, 1, 1).toordinal()
+        self._last = datetime.date(last_year, 12, 31).toordinal()
+        self._sessions = self._build(self._first, self._last)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def is_session(self, day: datetime.date | str) -> bool:
+        ordinal = to_date(day).toordinal()
+        self._cover(ordinal, ordinal)
+        index = bisect_left(self._sessions, ordinal)
+        return index < len(self._sessions) and self._sessions[index] == ordinal
+
+    def sessions_between(self, start: datetime.date | str, end: datetime.date | str) -> list[datetime.date]:
+        """Sessions from ``start`` to ``end``, both inclusive."""
+
+        first, last = to_date(start).toordinal(), to_date(end).toordinal()
+        if first > last:
+            return []
+        self._cover(first, last)
+        sessions = self._sessions
+        return [
+            datetime.date.fromordinal(ordinal)
+            for ordinal in sessions[bisect_left(sessions, first):bisect_right(sessions, last)]
+        ]
+
+    def session_count(self, start: datetime.date | str, end: datetime.date | str) -> int:
+        first, last = to_date(start).toordinal(), to_date(end).toordinal()
+        if first > last:
+            return 0
+        self._cover(first, last)
+        return bisect_right(self._sessions, last) - bisect_left(self._sessions, first)
+
+    def last_sessions(self, day: datetime.date | str, count: int) -> list[datetime.date]:
+        """The ``count`` most recent sessions on or before ``day``, oldest first."""
+
+        ordinal = to_date(day).toordinal()
+        first = ordinal - 2 * count - 14
+        while True:
+            self._cover(max(first, 1), ordinal)
+            end = bisect_right(self._sessions, ordinal)
+            if end >= count or first <= 1:
+                break
+            # Not enough history yet; extend a year further back.
+            first -= 366
+        return [datetime.date.fromordinal(value) for value in self._sessions[max(end - count, 0):end]]
+
+    def sessions_back(self, day: datetime.date | str, count: int) -> datetime.date:
+        """The session ``count`` sessions before ``day`` (``day`` itself not counted)."""
+
+        sessions = self.last_sessions(to_date(day) - datetime.timedelta(days=1), count)
+        if len(sessions) < count:
+            raise ValueError("Fewer than {} sessions before {}.".format(count, day))
+        return sessions[0]
+
+    def _build(self, first: int, last: int) -> list[int]:
+        # date.fromordinal(1) is a Monday, so ordinal % 7 is 6 on Saturdays and 0 on Sundays.
+        holidays = self.holidays
+        return [ordinal for ordinal in range(first, last + 1) if ordinal % 7 not in (0, 6) and ordinal not in holidays]
+
+    def _cover(self, first: int, last: int) -> None:
+        if self._first <= first and last <= self._last:
+            return
+
+        with self._lock:
+            if first < self._first:
+                self._sessions = self._build(first, self._first - 1) + self._sessions
+                self._first = first
+            if last > self._last:
+                self._sessions = self._sessions + self._build(self._last + 1, last)
+                self._last = last
+
+
+def trading_calendar(holidays: Iterable[str] = ()) -> TradingCalendar:
+    """Return the shared calendar for ``holidays``, building it on first use.
+
+    Repeated runs, line-chart windows and backfills with the same holidays
+    reuse one session index. Holiday sets grow as closures are confirmed, so
+    only the ``TRADING_CALENDAR_CACHE_SIZE`` most recently used are kept.
+    """
+
+    return _calendar_for(_holiday_ordinals(holidays))
+
+
+@functools.lru_cache(maxsize=TRADING_CALENDAR_CACHE_SIZE)
+def _calendar_for(holidays: frozenset[int]) -> TradingCalendar:
+    return TradingCalendar(datetime.date.fromordinal(ordinal) for ordinal in holidays)
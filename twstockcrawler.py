@@ -8,9 +8,15 @@ import datetime
 import json
 import time
 import logging
+import threading
 from typing import Any, NamedTuple, TypeAlias
 from requests import Response
 from requests import exceptions as requests_exceptions
+from config.settings import HTTP_POOL_SIZE
+from infrastructure.crawler.http_session import RequestTiming
+from infrastructure.crawler.http_session import build_session
+from infrastructure.crawler.http_session import timed_get
+from twse.analyzer import max_profit_k_transactions
 from textmewhenitsdone import TextMeWhenItsDone
 
 StockRow: TypeAlias = list[str]
@@ -28,8 +34,15 @@ class AuthenticationServer(NamedTuple):
 
 class SMTPEmail(object):
 
-    def __init__(self, subject: str | None = None, ccreceiver: str | None = None) -> None:
+    def __init__(
+        self,
+        subject: str | None = None,
+        ccreceiver: str | None = None,
+        connection: TextMeWhenItsDone | None = None,
+    ) -> None:
         self.authentication: AuthenticationServer | None = None
+        # A logged-in connection handed over by an earlier email in the same batch.
+        self.connection = connection
         self.subject = subject
         self.email = os.getenv("TWSE_SMTP_EMAIL", "your-email-account@gmail")
         self.password = os.getenv("TWSE_SMTP_PASSWORD", "your-password")
@@ -74,14 +87,19 @@ class SMTPEmail(object):
                                                        ccreceiver = self.ccreceiver)
 
 
+    def connect(self) -> TextMeWhenItsDone:
+        if self.connection is None:
+            self.connection = TextMeWhenItsDone(self.authentication.email)
+            self.connection.login(self.authentication.email, self.authentication.password)
+        return self.connection
+
+
     def imgstockprofittable(self, backtrack: str, stocktype: object) -> None:
         if not self.is_configured():
             logging.warning("Skipping email send because SMTP credentials are not configured.")
             return
 
-        textmewhenitsdone = TextMeWhenItsDone(self.authentication.email)
-
-        textmewhenitsdone.login(self.authentication.email, self.authentication.password)
+        textmewhenitsdone = self.connect()
 
         textmewhenitsdone.imgstockprofittableme( subject  = self.authentication.subject,
                                                  email    = self.authentication.email,
@@ -106,9 +124,7 @@ class SMTPEmail(object):
             logging.warning("Skipping email send because SMTP credentials are not configured.")
             return
 
-        textmewhenitsdone = TextMeWhenItsDone(self.authentication.email)
-
-        textmewhenitsdone.login(self.authentication.email, self.authentication.password)
+        textmewhenitsdone = self.connect()
 
         textmewhenitsdone.textstockprofittableme(subject  = self.authentication.subject,
                                                  email    = self.authentication.email,
@@ -127,20 +143,54 @@ class SMTPEmail(object):
 class TwStockCrawler(object):
     _logged_insecure_ssl_fallback = False
 
-    def __init__(self) -> None:
+    def __init__(self, pool_size: int = HTTP_POOL_SIZE) -> None:
         self.url: str = 'https://www.twse.com.tw/exchangeReport/MI_INDEX'
         self.timeout: int = 30
         self.max_attempts: int = 2
         self.allow_insecure_twse_fallback: bool = os.getenv("TWSE_ALLOW_INSECURE_SSL_FALLBACK", "1") != "0"
+        self.pool_size: int = pool_size
+        self.session: requests.Session = build_session(pool_size)
+        self._insecure_session: requests.Session | None = None
+        self._session_lock = threading.Lock()
 
 
     def _should_retry_without_ssl_verification(self, error: requests_exceptions.SSLError) -> bool:
         return self.allow_insecure_twse_fallback and "Missing Subject Key Identifier" in str(error)
 
 
+    def _get_insecure_session(self) -> requests.Session:
+        # Once certificate verification has failed, every later request goes
+        # straight to this pinned session instead of retrying the secure one.
+        with self._session_lock:
+            if self._insecure_session is None:
+                requests.packages.urllib3.disable_warnings()  # type: ignore[attr-defined]
+                self._insecure_session = build_session(self.pool_size, verify = False)
+            return self._insecure_session
+
+
+    def _send(
+        self, session: requests.Session, query_params: dict[str, str | int], date_time: str
+    ) -> tuple[Response, RequestTiming]:
+        # The timing goes back to the caller: scheduler threads share this crawler.
+        page, timing = timed_get(session, self.url, params = query_params, timeout = self.timeout)
+        logging.info(
+            "TWSE request %s: connect=%.3fs ttfb=%.3fs transfer=%.3fs reused=%s",
+            date_time,
+            timing.connect_seconds,
+            timing.ttfb_seconds,
+            timing.transfer_seconds,
+            timing.reused_connection,
+        )
+        return page, timing
+
+
     def _request_stocktype_data(self, query_params: dict[str, str | int], date_time: str) -> Response:
         try:
-            return requests.get(self.url, params = query_params, timeout = self.timeout)
+            if self._insecure_session is not None:
+                page, _timing = self._send(self._insecure_session, query_params, date_time)
+            else:
+                page, _timing = self._send(self.session, query_params, date_time)
+            return page
         except requests_exceptions.SSLError as error:
             if not self._should_retry_without_ssl_verification(error):
                 raise RuntimeError(
@@ -150,12 +200,15 @@ class TwStockCrawler(object):
 
             if not TwStockCrawler._logged_insecure_ssl_fallback:
                 logging.warning(
-                    "TWSE SSL certificate verification failed at %s; retrying once without certificate verification.",
+                    "TWSE SSL certificate verification failed at %s; using an unverified session from now on.",
                     date_time,
                 )
                 TwStockCrawler._logged_insecure_ssl_fallback = True
-            requests.packages.urllib3.disable_warnings()  # type: ignore[attr-defined]
-            return requests.get(self.url, params = query_params, timeout = self.timeout, verify = False)
+            try:
+                page, _timing = self._send(self._get_insecure_session(), query_params, date_time)
+                return page
+            except requests_exceptions.RequestException as insecure_error:
+                raise RuntimeError("Unable to fetch TWSE stock data at {}: {}".format(date_time, insecure_error)) from insecure_error
         except requests_exceptions.RequestException as error:
             raise RuntimeError("Unable to fetch TWSE stock data at {}: {}".format(date_time, error)) from error
 
@@ -180,7 +233,7 @@ class TwStockCrawler(object):
         return sorted(content.keys()) if isinstance(content, dict) else []
 
 
-    def get_stocktype_data(self, date_time: str, stocktype: int) -> StockRows:
+    def get_stocktype_data(self, date_time: str, stocktype: int | str) -> StockRows:
         row: StockRows = list()
 
         query_params = {
@@ -196,7 +249,6 @@ class TwStockCrawler(object):
             # Get json data
             page = self._request_stocktype_data(query_params = query_params, date_time = date_time)
 
-            print(date_time)
             if not page.ok:
                 raise RuntimeError("TWSE returned HTTP {} at {}".format(page.status_code, date_time))
 
@@ -260,20 +312,7 @@ class TwStockCrawler(object):
 
 
     def maxProfitIV(self, k: int, prices: list[int]) -> int:
-        n = len(prices)
-
-        if n == 0:
-            return 0
-
-        dp = [[0 for _ in range(n)] for _ in range(k+1)]
-
-        for trans_k in range(1, k + 1):
-            cur_balance_with_buy = 0 - prices[0]
-            for day_d in range(1, n):
-                dp[trans_k][day_d] = max(dp[trans_k][day_d - 1], cur_balance_with_buy + prices[day_d])
-                cur_balance_with_buy = max(cur_balance_with_buy, dp[trans_k - 1][day_d - 1] - prices[day_d])
-
-        return dp[k][n-1]
+        return max_profit_k_transactions(k, prices)
 
 
     def maxProfitwithfee(self, prices: list[int], fee: int) -> int: